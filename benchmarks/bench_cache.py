@@ -0,0 +1,127 @@
+"""
+benchmark: model map cache load time vs. number of models, per cache format.
+
+For a synthetic catalog of n models, times
+- legacy gzip pickle: every ModelFileData pickled into one gzip file (the old write_to_cache())
+- shards <codec>: one catalog-entry shard per model, read back and turned into a ModelMap
+- arrow catalog: the memory-mapped Arrow catalog turned into a ModelMap
+- arrow query: a substring search on the Arrow catalog, without building any models
+- hydrate all: building every ModelFileData, the cost lazy hydration keeps off startup
+
+usage:
+    uv run python -m benchmarks.bench_cache [n_models,...] [repeats]
+"""
+
+import os
+import sys
+import gzip
+import time
+import pickle
+import tempfile
+
+from src.cache import ShardedCache
+from src.model_data import ModelMap, get_model_map, model_from_catalog_entry, search_cached_catalog
+
+
+CODECS = ['gzip', 'pickle', 'lz4', 'zstd']
+
+
+def build_entries(root: str, n_models: int) -> dict:
+    grouped = {}
+    for i in range(n_models):
+        directory = os.path.join(root, f'batch_{i // 100:03d}', f'run_{i:05d}')
+        grouped[f'batch_{i // 100:03d}/run_{i:05d}/eplusout'] = {
+            'directory': directory,
+            'stem': 'eplusout',
+            'html': os.path.join(directory, 'eplusout.table.htm'),
+            'sql': os.path.join(directory, 'eplusout.sql'),
+            'epjson': os.path.join(directory, 'eplusout.epJSON')
+        }
+    return grouped
+
+
+def load_shards(cache: ShardedCache, keys: dict) -> int:
+    model_map = ModelMap()
+    for key in keys.values():
+        model_map._add_entry(cache.read_model(key))
+    return len(model_map.get_all_model_ids())
+
+
+def load_catalog(cache: ShardedCache, directory: str) -> int:
+    model_map = ModelMap()
+    for row in cache.read_catalog(directory).to_pylist():
+        model_map._add_entry(row)
+    return len(model_map.get_all_model_ids())
+
+
+def hydrate_all(model_map: ModelMap) -> int:
+    return len([model_from_catalog_entry(x) for x in model_map.get_catalog_entries()])
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def tree_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(dirpath, name))
+        for dirpath, _, names in os.walk(path) for name in names
+    )
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1000, 5000, 20000]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as root:
+        for n_models in sizes:
+            directory = os.path.join(root, f'runs_{n_models}')
+            grouped = build_entries(directory, n_models)
+            model_map = get_model_map(grouped)
+            entries = model_map.get_catalog_entries()
+            print(f'\n{n_models} models')
+
+            legacy_file = os.path.join(root, f'legacy_{n_models}.pickle.gz')
+            with gzip.open(legacy_file, 'wb') as f:
+                pickle.dump([model_from_catalog_entry(x) for x in entries], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            def load_legacy():
+                with gzip.open(legacy_file, 'rb') as f:
+                    return pickle.load(f)
+
+            seconds = best_of(load_legacy, repeats)
+            print(f'{"legacy gzip pickle":<22} {seconds * 1000:9.1f} ms  {os.path.getsize(legacy_file) / 1024:9.0f} KiB')
+
+            for codec in CODECS:
+                cache_root = os.path.join(root, f'cache_{n_models}_{codec}')
+                cache = ShardedCache(cache_root, codec=codec)
+                keys = {entry['model_id']: f'{i:08d}' for i, entry in enumerate(entries)}
+                for entry in entries:
+                    cache.write_model(keys[entry['model_id']], entry)
+                seconds = best_of(lambda: load_shards(cache, keys), repeats)
+                size = tree_size(os.path.join(cache_root, 'models'))
+                print(f'{"shards " + codec:<22} {seconds * 1000:9.1f} ms  {size / 1024:9.0f} KiB')
+
+            cache_root = os.path.join(root, f'cache_{n_models}_catalog')
+            cache = ShardedCache(cache_root)
+            cache.write_catalog(directory, entries, keys)
+            cache.write_index(directory, {'directory': directory, 'snapshot': None, 'models': keys})
+
+            seconds = best_of(lambda: load_catalog(cache, directory), repeats)
+            size = tree_size(os.path.join(cache_root, 'catalog'))
+            print(f'{"arrow catalog":<22} {seconds * 1000:9.1f} ms  {size / 1024:9.0f} KiB')
+
+            seconds = best_of(lambda: search_cached_catalog(directory, 'run_00042', cache_root), repeats)
+            print(f'{"arrow query":<22} {seconds * 1000:9.1f} ms')
+
+            seconds = best_of(lambda: hydrate_all(model_map), repeats)
+            print(f'{"hydrate all":<22} {seconds * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+benchmark: SqlTimeseries time index construction, string parsing vs. integer arithmetic.
+
+Builds a synthetic Time table (a year of hourly rows, plus timestep rows for the
+sub-hourly case) and times
+- legacy: zero-padding Month/Day/Hour per row, joining strings and pd.to_datetime()
+- vectorized: build_time_index() on the integer columns
+- cached: get_time_index() for a file whose time index was already built
+
+usage:
+    uv run python -m benchmarks.bench_maketime [timesteps_per_hour,...] [repeats]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import warnings
+
+import pandas as pd
+
+from src.tools.func_sql import build_time_index, get_time_index
+
+
+def build_time_table(timesteps_per_hour: int) -> pd.DataFrame:
+    interval = 60 // timesteps_per_hour
+    days = pd.date_range('1900-01-01', '1900-12-31', freq='D')
+    rows = []
+    for day in days:
+        for hour in range(1, 25):
+            for step in range(1, timesteps_per_hour + 1):
+                minute = 0 if timesteps_per_hour == 1 else step * interval
+                rows.append((day.month, day.day, hour, minute, interval))
+    timedf = pd.DataFrame(rows, columns=['Month', 'Day', 'Hour', 'Minute', 'Interval'])
+    timedf.insert(0, 'TimeIndex', range(1, len(timedf) + 1))
+    return timedf
+
+
+def legacy_maketime(timedf: pd.DataFrame) -> pd.DataFrame:
+    """the hourly _maketime() implementation build_time_index() replaced"""
+    timedf = timedf.copy()
+
+    def zeropad(val):
+        if len(str(val)) == 1:
+            val = '0' + str(val)
+            return val
+        else:
+            return val
+
+    timedf['Hour'] = timedf['Hour'] - 1
+    timedf['Month'] = timedf['Month'].apply(lambda x: zeropad(x))
+    timedf['Day'] = timedf['Day'].apply(lambda x: zeropad(x))
+    timedf['Hour'] = timedf['Hour'].apply(lambda x: zeropad(x))
+    timedf['dt'] = timedf['Month'].astype(str) + "-" + timedf['Day'].astype(str) + "-" + timedf['Hour'].astype(str)
+    timedf['dt'] = pd.to_datetime(timedf['dt'], format="%m-%d-%H")
+    return timedf
+
+
+def vectorized_maketime(timedf: pd.DataFrame) -> pd.DataFrame:
+    timedf = timedf.copy()
+    timedf['dt'] = build_time_index(timedf)
+    return timedf
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    steps = [int(x) for x in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1, 4, 60]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    warnings.simplefilter('ignore', DeprecationWarning)
+
+    with tempfile.TemporaryDirectory() as root:
+        for timesteps_per_hour in steps:
+            timedf = build_time_table(timesteps_per_hour)
+            print(f'\n{len(timedf)} rows ({timesteps_per_hour} per hour)')
+
+            if timesteps_per_hour == 1:
+                # the legacy implementation only handled hourly rows
+                seconds = best_of(lambda: legacy_maketime(timedf), repeats)
+                print(f'{"legacy":<12} {seconds * 1000:9.2f} ms')
+
+            seconds = best_of(lambda: vectorized_maketime(timedf), repeats)
+            print(f'{"vectorized":<12} {seconds * 1000:9.2f} ms')
+
+            sql_file = os.path.join(root, f'time_{timesteps_per_hour}.sql')
+            with sqlite3.connect(sql_file) as conn:
+                timedf.to_sql('Time', conn, index=False)
+            get_time_index(sql_file, lambda: timedf.copy())
+            seconds = best_of(lambda: get_time_index(sql_file, lambda: timedf.copy()), repeats)
+            print(f'{"cached":<12} {seconds * 1000:9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
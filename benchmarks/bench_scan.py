@@ -0,0 +1,87 @@
+"""
+benchmark: model discovery with per-extension recursive globs vs. the single-pass scanner.
+
+Builds a synthetic run archive (empty files named like EnergyPlus outputs) and times
+- legacy: four recursive get_files_by_type() globs plus get_file_info() per file
+- scan: scan_directory() serial
+- scan xN: scan_directory() with a thread pool
+
+usage:
+    uv run python -m benchmarks.bench_scan [n_runs] [repeats]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from src.model_data import get_files_by_type, get_file_info, get_model_key, group_scanned_files
+from src.scanner import scan_directory
+
+
+RUN_ARTIFACTS = [
+    '{stem}.epJSON', '{stem}.sql', '{stem}.table.htm', '{stem}.err', '{stem}.rdd.gz',
+    '{stem}.eio.gz', '{stem}.csv.gz', '{stem}.meter.csv.gz', '{stem}.audit.gz',
+    '{stem}.dd.sql', '{stem}.dd.table.htm', '{stem}.dd.err', '{stem}.log',
+]
+
+
+def build_tree(root: str, n_runs: int) -> None:
+    for i in range(n_runs):
+        run_dir = os.path.join(root, f'batch_{i // 100:03d}', f'run_{i:05d}')
+        os.makedirs(run_dir, exist_ok=True)
+        stem = f'model_{i:05d}'
+        for pattern in RUN_ARTIFACTS:
+            open(os.path.join(run_dir, pattern.format(stem=stem)), 'w').close()
+
+
+def legacy_catalog(path: str) -> int:
+    """the catalog_path() implementation this scanner replaced"""
+    files = get_files_by_type(path, '.htm')
+    files += get_files_by_type(path, '.html')
+    files += get_files_by_type(path, '.sql')
+    files += get_files_by_type(path, '.epJSON')
+
+    grouped = {}
+    for file_path in files:
+        info = get_file_info(file_path)
+        key = get_model_key(info['directory'], info['stem'], path)
+        grouped.setdefault(key, {})[info['extension'].lower()] = info['file_path']
+    return len(grouped)
+
+
+def scanner_catalog(path: str, max_workers=None) -> int:
+    scan = scan_directory(path, max_workers=max_workers, with_stats=False)
+    return len(group_scanned_files(scan['files'], path))
+
+
+def best_of(fn, repeats: int) -> tuple[float, int]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, n_runs)
+        print(f'{n_runs} runs, {n_runs * len(RUN_ARTIFACTS)} files')
+
+        cases = [
+            ('legacy glob x4', lambda: legacy_catalog(root)),
+            ('scan', lambda: scanner_catalog(root)),
+            ('scan x4 threads', lambda: scanner_catalog(root, max_workers=4)),
+            ('scan x16 threads', lambda: scanner_catalog(root, max_workers=16)),
+        ]
+        for label, fn in cases:
+            seconds, n_files = best_of(fn, repeats)
+            print(f'{label:<18} {seconds * 1000:9.1f} ms  ({n_files} models)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+benchmark: timeseries reads from SQLite vs. the sidecar row index and the columnar (Arrow) ReportData store.
+
+Builds a synthetic eplusout.sql with n variables of one year of data at the given
+timesteps per hour (with no index on ReportDataDictionaryIndex, like the files EnergyPlus
+writes), and times getseries_wide() for a few variables
+- sqlite scan: one IN (...) query on ReportData
+- row index build: the one-time scan that writes the sidecar row index
+- row index: primary key lookups of the rowids in the row index
+- columnar build: the one-time conversion of ReportData to the columnar store
+- columnar: memory-mapped slices of the store
+
+usage:
+    uv run python -m benchmarks.bench_series [n_variables] [timesteps_per_hour] [n_read] [repeats]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+import numpy as np
+
+from src.cache import ShardedCache
+from src.connections import get_connection_pool
+from src.tools import func_sql
+from src.tools.func_sql import SqlTimeseries
+
+
+def build_sql(sql_file: str, n_variables: int, timesteps_per_hour: int) -> None:
+    interval = 60 // timesteps_per_hour
+    n_times = 8760 * timesteps_per_hour
+    steps = np.arange(n_times)
+    day = steps // (24 * timesteps_per_hour)
+    months = np.datetime64('1900-01-01') + day
+    month = months.astype('datetime64[M]').astype(int) % 12 + 1
+    day_of_month = (months - months.astype('datetime64[M]')).astype(int) + 1
+    hour = (steps // timesteps_per_hour) % 24 + 1
+    minute = 0 if timesteps_per_hour == 1 else (steps % timesteps_per_hour + 1) * interval
+
+    with sqlite3.connect(sql_file) as conn:
+        conn.execute(
+            "CREATE TABLE Time (TimeIndex INTEGER PRIMARY KEY, Year INTEGER, Month INTEGER, Day INTEGER, "
+            "Hour INTEGER, Minute INTEGER, Interval INTEGER)"
+        )
+        conn.execute(
+            "CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER PRIMARY KEY, IsMeter INTEGER, "
+            "Type TEXT, IndexGroup TEXT, TimestepType TEXT, KeyValue TEXT, Name TEXT, ReportingFrequency TEXT, "
+            "ScheduleName TEXT, Units TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE ReportData (ReportDataIndex INTEGER PRIMARY KEY, TimeIndex INTEGER, "
+            "ReportDataDictionaryIndex INTEGER, Value REAL)"
+        )
+        conn.executemany(
+            "INSERT INTO Time VALUES (?, 0, ?, ?, ?, ?, ?)",
+            zip((steps + 1).tolist(), month.tolist(), day_of_month.tolist(), hour.tolist(),
+                np.broadcast_to(minute, n_times).tolist(), [interval] * n_times)
+        )
+        for rdd in range(1, n_variables + 1):
+            conn.execute(
+                "INSERT INTO ReportDataDictionary VALUES (?, 0, 'Avg', 'Zone', 'Zone', ?, 'Zone Mean Air Temperature', "
+                "'Hourly', '', 'C')", (rdd, f'ZONE {rdd}')
+            )
+        values = np.random.default_rng(0).random(n_times)
+        for time_index in range(1, n_times + 1):
+            conn.executemany(
+                "INSERT INTO ReportData (TimeIndex, ReportDataDictionaryIndex, Value) VALUES (?, ?, ?)",
+                ((time_index, rdd, float(values[time_index - 1])) for rdd in range(1, n_variables + 1))
+            )
+    conn.close()
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n_variables = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    timesteps_per_hour = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    n_read = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    repeats = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+
+    with tempfile.TemporaryDirectory() as root:
+        sql_file = os.path.join(root, 'eplusout.sql')
+        build_sql(sql_file, n_variables, timesteps_per_hour)
+        rddids = list(range(1, n_variables + 1, max(1, n_variables // n_read)))[:n_read]
+        print(f'{n_variables} variables x {8760 * timesteps_per_hour} rows, reading {len(rddids)}')
+
+        sqlite_ts = SqlTimeseries(sql_file=sql_file, columnar='off', row_index='off')
+        sqlite_ts._maketime()
+        seconds = best_of(lambda: sqlite_ts.getseries_wide(rddids), repeats)
+        print(f'{"sqlite scan":<16} {seconds * 1000:9.1f} ms')
+
+        cache = ShardedCache(os.path.join(root, 'cache'))
+        func_sql.get_default_cache = lambda: cache
+        start = time.perf_counter()
+        with get_connection_pool().connection(sql_file) as conn:
+            func_sql.build_row_index(sql_file, conn, cache)
+        print(f'{"row index build":<16} {(time.perf_counter() - start) * 1000:9.1f} ms')
+
+        indexed_ts = SqlTimeseries(sql_file=sql_file, columnar='off', row_index='on')
+        indexed_ts.getseries_wide(rddids)
+        seconds = best_of(lambda: indexed_ts.getseries_wide(rddids), repeats)
+        print(f'{"row index":<16} {seconds * 1000:9.1f} ms')
+
+        start = time.perf_counter()
+        with get_connection_pool().connection(sql_file) as conn:
+            func_sql.build_columnar_store(sql_file, conn, cache)
+        print(f'{"columnar build":<16} {(time.perf_counter() - start) * 1000:9.1f} ms')
+
+        columnar_ts = SqlTimeseries(sql_file=sql_file, columnar='read')
+        columnar_ts.getseries_wide(rddids)
+        seconds = best_of(lambda: columnar_ts.getseries_wide(rddids), repeats)
+        print(f'{"columnar":<16} {seconds * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
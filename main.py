@@ -1,7 +1,10 @@
-
-from src.server import mcp
+from src.server import mcp, _get_current_directory
+from src.warmup import start_warmup
 
 
 if __name__ == "__main__":
+    # Load the model map and recently used models while waiting for the first request
+    start_warmup(_get_current_directory())
+
     # Run with stdio transport for MCP
     mcp.run(transport="stdio")
@@ -13,7 +13,59 @@ from pathlib import Path
 
 
 BASE_DIRECTORY = Path(__file__).parent.parent.absolute()
-CACHE_DIRECTORY = os.path.join(BASE_DIRECTORY, 'mcp_cache')
-CACHE_PICKLE = os.path.join(CACHE_DIRECTORY, 'modelmap.pickle')
+CACHE_DIRECTORY = os.environ.get('EPLUS_MCP_CACHE_DIRECTORY', os.path.join(BASE_DIRECTORY, 'mcp_cache'))
+CACHE_SHARD_DIRECTORY = os.path.join(CACHE_DIRECTORY, 'shards')
+
+# serialization of cache shards: 'auto' (lz4 if pyarrow has it, else zstd, else uncompressed pickle),
+# 'zstd', 'lz4', 'gzip' or 'pickle'
+CACHE_CODEC = os.environ.get('EPLUS_CACHE_CODEC', 'auto')
+
+# seconds a server process waits for another process that is building the same model map cache
+CACHE_LOCK_TIMEOUT = float(os.environ.get('EPLUS_CACHE_LOCK_TIMEOUT', 300))
+
+# how parsed-artifact cache keys fingerprint file contents: 'full' hashes every byte (once per file
+# version), 'sampled' hashes the size plus the first and last block and is much faster on large SQL files
+CACHE_FINGERPRINT_MODE = os.environ.get('EPLUS_CACHE_FINGERPRINT', 'full')
 
 EPLUS_RUNS_DIRECTORY = Path(os.path.join(BASE_DIRECTORY, 'eplus_files')).absolute()
+
+# seconds a resident (in-process) model map is trusted before its files are re-stat'ed
+MODEL_MAP_REVALIDATE_SECONDS = float(os.environ.get('EPLUS_MODEL_MAP_REVALIDATE_SECONDS', 2.0))
+
+# models whose ModelFileData (and parsed data) a model map keeps in memory; least recently used
+# models beyond this are dropped and rebuilt from their catalog entry on next use (0 = no limit)
+MODEL_MAP_MAX_HYDRATED = int(os.environ.get('EPLUS_MODEL_MAP_MAX_HYDRATED', 256))
+
+# 'off' re-stats on request; 'auto', 'inotify' or 'poll' keep resident maps current from a watcher thread
+CATALOG_WATCH_MODE = os.environ.get('EPLUS_CATALOG_WATCH', 'off')
+
+# warm-up at server startup, in a background thread: 'off', 'map' (load the model map only) or 'recent'
+# (also open SQL files and parse HTML tables of the most recently used models in the monitor log)
+WARMUP_MODE = os.environ.get('EPLUS_WARMUP', 'recent')
+
+# number of recently used models the warm-up prepares
+WARMUP_RECENT_MODELS = int(os.environ.get('EPLUS_WARMUP_RECENT_MODELS', 8))
+
+# columnar (Arrow) copies of SQL ReportData for faster series reads: 'off' reads SQLite only, 'read' uses
+# copies that are up to date, 'on' also converts a SQL file on its first series read
+SQL_COLUMNAR_MODE = os.environ.get('EPLUS_SQL_COLUMNAR', 'off')
+
+# approximate memory ceiling of one chunk of SqlTimeseries.iter_series(), in bytes
+SERIES_CHUNK_BYTES = int(os.environ.get('EPLUS_SERIES_CHUNK_BYTES', 32 * 1024 * 1024))
+
+# shared read-only SQLite connections (src/connections.py): cap on open handles across all SQL files,
+# page cache (KiB) and memory-mapped bytes of each connection
+SQL_POOL_MAX_CONNECTIONS = int(os.environ.get('EPLUS_SQL_MAX_CONNECTIONS', 32))
+SQL_CACHE_SIZE_KIB = int(os.environ.get('EPLUS_SQL_CACHE_KIB', 16 * 1024))
+SQL_MMAP_SIZE = int(os.environ.get('EPLUS_SQL_MMAP_BYTES', 256 * 1024 * 1024))
+
+# open SQL files with immutable=1 (no locking or change detection); set to 0 if SQL files may be read
+# while a simulation is still writing them
+SQL_IMMUTABLE = os.environ.get('EPLUS_SQL_IMMUTABLE', '1') not in ('0', 'false', 'off')
+
+# sidecar index of ReportData rowids by variable, so single-variable reads are primary key lookups
+# instead of table scans: 'off', 'read' (use indexes that exist) or 'on' (also build one on a file's first read)
+SQL_ROW_INDEX_MODE = os.environ.get('EPLUS_SQL_ROW_INDEX', 'on')
+
+# threads reading SQL files at once for cross-run extracts (func_sql.align_series())
+SERIES_READ_WORKERS = int(os.environ.get('EPLUS_SERIES_READ_WORKERS', min(8, os.cpu_count() or 1)))
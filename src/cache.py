@@ -0,0 +1,593 @@
+"""
+sharded on-disk cache for model catalogs and parsed artifacts.
+
+Layout under the cache root (<ext> depends on the codec, e.g. '.pickle.zst'):
+
+    index/<directory hash><ext>          one small index per scanned directory:
+                                         {'directory', 'snapshot', 'models': {model_id: model key}}
+    catalog/<directory hash>.arrow       the same directory's catalog entries as an Arrow IPC table,
+                                         memory-mapped on load and queryable without building models
+    models/<model key><ext>              catalog entry of one model (model_id, directory, stem, display_name,
+                                         html/sql/epjson paths)
+    artifacts/<kind>/<key><ext>          one parsed artifact (HTML tables, epJSON tree, SQL dictionary, ...)
+    tables/<kind>/<key>.arrow            one large columnar artifact as an uncompressed Arrow IPC table,
+                                         memory-mapped on read (e.g. the ReportData of one SQL file)
+    fingerprints/<path hash><ext>        memoized content fingerprint of one file, with the stat it was taken at
+    locks/<directory hash>.lock          advisory lock held while a directory's index and catalog are rewritten
+
+Model keys are derived from the catalog entry plus the (size, mtime_ns, inode) fingerprint
+of each of its files, so a model whose files changed gets a new key and only its shard is
+rewritten. Artifacts are keyed by the content fingerprint of the file they were parsed
+from, so a run folder that is moved, copied or touched reuses the artifacts already parsed
+for identical files. Content fingerprints are computed once per file version (stat) and
+memoized, so unchanged files are never re-read.
+
+Every file is written to a temporary file in the same directory and moved into place
+with os.replace(), so readers in other processes see either the old or the new version,
+never a partial one. Several server processes can share one cache directory.
+"""
+
+import os
+import sys
+import time
+import gzip
+import struct
+import pickle
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Any, Callable
+
+import pyarrow as pa
+
+from src import CACHE_SHARD_DIRECTORY, CACHE_CODEC, CACHE_FINGERPRINT_MODE, CACHE_LOCK_TIMEOUT
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+
+# bytes hashed from each end of a file in 'sampled' fingerprint mode
+SAMPLE_BLOCK_SIZE = 1 << 20
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def stat_fingerprint(file_path: str) -> tuple | None:
+    """
+    Return the (size, mtime_ns, inode) fingerprint of a file, or None if it cannot be stat'ed.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def model_shard_key(entry: dict, fingerprints: dict) -> str:
+    """
+    Key for a model's catalog shard.
+
+    Args:
+        entry (dict): The model's catalog entry (model_id, directory, stem, file paths, ...).
+        fingerprints (dict): {file_path: stat fingerprint} for each of the model's files.
+    """
+    return _digest(sorted(entry.items()), sorted(fingerprints.items()))
+
+
+def hash_file(file_path: str, mode: str = 'full') -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        file_path (str): File to hash.
+        mode (str): 'full' hashes every byte; 'sampled' hashes the size plus the first and
+                    last SAMPLE_BLOCK_SIZE bytes (the whole file if it is smaller than that).
+
+    Returns:
+        str: '<mode>:<hex digest>'
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if mode == 'sampled' and size > 2 * SAMPLE_BLOCK_SIZE:
+            h.update(str(size).encode('ascii'))
+            h.update(f.read(SAMPLE_BLOCK_SIZE))
+            f.seek(-SAMPLE_BLOCK_SIZE, os.SEEK_END)
+            h.update(f.read(SAMPLE_BLOCK_SIZE))
+        else:
+            mode = 'full'
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                h.update(chunk)
+    return f'{mode}:{h.hexdigest()}'
+
+
+"""atomic writes and locking"""
+
+
+class _atomic_output:
+    """
+    Context manager yielding a binary file that replaces `path` only if the block succeeds.
+
+    The data goes to a temporary file next to `path`, is flushed, and is moved over `path`
+    with os.replace(), which is atomic on POSIX and Windows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        self.file = os.fdopen(fd, 'wb')
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is None:
+            try:
+                os.replace(self.tmp_path, self.path)
+                return False
+            except PermissionError:
+                # windows: the target is open (e.g. a memory-mapped catalog); keep the old file
+                print(f'cache file in use, not replaced: {self.path}', file=sys.stderr)
+        try:
+            os.remove(self.tmp_path)
+        except FileNotFoundError:
+            pass
+        return False
+
+
+# lock path -> [threading.RLock, depth, open lock file]; makes CacheLock reentrant within a process
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+class CacheLock:
+    """
+    Advisory inter-process lock on a lock file (fcntl.flock on POSIX, msvcrt.locking on Windows).
+
+    The lock is reentrant within a process: threads serialize on an RLock, and the file lock
+    is taken by the outermost acquire only.
+
+    Args:
+        path (str): Lock file path (created if missing, never removed).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with _process_locks_guard:
+            self._state = _process_locks.setdefault(path, [threading.RLock(), 0, None])
+
+    def acquire(self, blocking: bool = True, timeout: float | None = None) -> bool:
+        """
+        Acquire the lock.
+
+        Args:
+            blocking (bool): Wait for the lock; if False, return False at once when it is held.
+            timeout (float | None): Seconds to wait when blocking (None waits forever).
+
+        Returns:
+            bool: True if the lock was acquired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        thread_lock = self._state[0]
+        if not thread_lock.acquire(blocking, -1 if timeout is None or not blocking else timeout):
+            return False
+
+        if self._state[1] == 0:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            lock_file = open(self.path, 'a+b')
+            while not _try_lock_file(lock_file):
+                if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                    lock_file.close()
+                    thread_lock.release()
+                    return False
+                time.sleep(0.05)
+            self._state[2] = lock_file
+
+        self._state[1] += 1
+        return True
+
+    def release(self) -> None:
+        self._state[1] -= 1
+        if self._state[1] == 0:
+            lock_file = self._state[2]
+            self._state[2] = None
+            _unlock_file(lock_file)
+            lock_file.close()
+        self._state[0].release()
+
+    def __enter__(self) -> 'CacheLock':
+        if not self.acquire(timeout=CACHE_LOCK_TIMEOUT):
+            raise TimeoutError(f'timed out waiting for cache lock: {self.path}')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+def _try_lock_file(lock_file) -> bool:
+    try:
+        if sys.platform == 'win32':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(lock_file) -> None:
+    if sys.platform == 'win32':
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+"""shard codecs"""
+
+
+class PickleCodec:
+    """Uncompressed pickle: the fastest to read and write, largest on disk."""
+
+    name = 'pickle'
+    suffix = '.pickle'
+
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class GzipCodec(PickleCodec):
+    """gzip-compressed pickle (the original cache format); stdlib only, but slow."""
+
+    name = 'gzip'
+    suffix = '.pickle.gz'
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def dumps(self, obj: Any) -> bytes:
+        return gzip.compress(super().dumps(obj), compresslevel=self.level)
+
+    def loads(self, data: bytes) -> Any:
+        return super().loads(gzip.decompress(data))
+
+
+class ArrowCodec(PickleCodec):
+    """
+    Pickle compressed with one of pyarrow's bundled codecs ('zstd' or 'lz4').
+
+    The uncompressed size is stored in an 8-byte header so any codec can be decompressed.
+    """
+
+    SIZE_HEADER = struct.Struct('<Q')
+
+    def __init__(self, name: str, compression_level: int | None = None):
+        self.name = name
+        self.suffix = {'zstd': '.pickle.zst', 'lz4': '.pickle.lz4'}.get(name, f'.pickle.{name}')
+        self._codec = pa.Codec(name, compression_level=compression_level)
+
+    def dumps(self, obj: Any) -> bytes:
+        data = super().dumps(obj)
+        return self.SIZE_HEADER.pack(len(data)) + self._codec.compress(data, asbytes=True)
+
+    def loads(self, data: bytes) -> Any:
+        (size,) = self.SIZE_HEADER.unpack_from(data)
+        raw = self._codec.decompress(memoryview(data)[self.SIZE_HEADER.size:], decompressed_size=size, asbytes=True)
+        return super().loads(raw)
+
+
+def get_codec(name: str | None = None) -> PickleCodec:
+    """
+    Resolve a shard codec by name.
+
+    Args:
+        name (str | None): 'auto', 'zstd', 'lz4', 'gzip' or 'pickle'. Defaults to CACHE_CODEC.
+                           'auto' picks lz4, then zstd (level 1), from pyarrow if available,
+                           else uncompressed pickle. lz4 is about as fast as plain pickle on
+                           both small catalog shards and multi-MB artifacts; zstd compresses
+                           artifacts better but costs ~30us per call on small shards.
+    """
+    name = (name or CACHE_CODEC).lower()
+    if name == 'auto':
+        for candidate in ('lz4', 'zstd'):
+            if pa.Codec.is_available(candidate):
+                name = candidate
+                break
+        else:
+            name = 'pickle'
+
+    if name == 'pickle':
+        return PickleCodec()
+    if name == 'gzip':
+        return GzipCodec()
+    if name in ('zstd', 'lz4'):
+        if not pa.Codec.is_available(name):
+            raise ValueError(f'cache codec not available in this pyarrow build: {name}')
+        return ArrowCodec(name, compression_level=1 if name == 'zstd' else None)
+
+    raise ValueError(f'unknown cache codec: {name}')
+
+
+# columns of the Arrow catalog table, one row per model
+CATALOG_SCHEMA = pa.schema([
+    ('model_id', pa.string()),
+    ('display_name', pa.string()),
+    ('directory', pa.string()),
+    ('stem', pa.string()),
+    ('html', pa.string()),
+    ('sql', pa.string()),
+    ('epjson', pa.string()),
+    ('key', pa.string()),
+])
+
+
+class ShardedCache:
+    """
+    Read, write and invalidate individual cache shards under a root directory.
+
+    Shards are pickles serialized with a pluggable codec (see get_codec); shards written
+    with a different codec are simply not found. Missing or unreadable shards read as None,
+    so callers fall back to rebuilding just that piece.
+    """
+
+    def __init__(self, root: str = CACHE_SHARD_DIRECTORY, codec: str | None = None):
+        self.root = root
+        self.codec = get_codec(codec)
+        self._fingerprints = {}  # (file_path, stat fingerprint, mode) -> content fingerprint
+
+    # paths
+
+    def _directory_name(self, directory: str) -> str:
+        return hashlib.sha1(os.path.abspath(directory).encode('utf-8')).hexdigest()
+
+    def _index_path(self, directory: str) -> str:
+        return os.path.join(self.root, 'index', self._directory_name(directory) + self.codec.suffix)
+
+    def _catalog_path(self, directory: str) -> str:
+        return os.path.join(self.root, 'catalog', f'{self._directory_name(directory)}.arrow')
+
+    def _model_path(self, key: str) -> str:
+        return os.path.join(self.root, 'models', key + self.codec.suffix)
+
+    def _artifact_path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, 'artifacts', kind, key + self.codec.suffix)
+
+    def _table_path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, 'tables', kind, f'{key}.arrow')
+
+    def _fingerprint_path(self, file_path: str) -> str:
+        name = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.root, 'fingerprints', name + self.codec.suffix)
+
+    # raw shard io
+
+    def _read(self, path: str) -> Any:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return self.codec.loads(data)
+        except (OSError, EOFError, ValueError, MemoryError, struct.error, pickle.UnpicklingError,
+                AttributeError, ImportError, pa.ArrowException) as e:
+            print(f'discarding unreadable cache shard {path}: {type(e).__name__}', file=sys.stderr)
+            self._remove(path)
+            return None
+
+    def _write(self, path: str, obj: Any) -> None:
+        data = self.codec.dumps(obj)
+        with _atomic_output(path) as f:
+            f.write(data)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _write_arrow(self, path: str, table: pa.Table) -> None:
+        with _atomic_output(path) as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def _read_arrow(self, path: str) -> pa.Table | None:
+        try:
+            with pa.memory_map(path, 'r') as source:
+                return pa.ipc.open_file(source).read_all()
+        except FileNotFoundError:
+            return None
+        except (OSError, pa.ArrowException) as e:
+            print(f'discarding unreadable cache table {path}: {type(e).__name__}', file=sys.stderr)
+            self._remove(path)
+            return None
+
+    # index
+
+    def read_index(self, directory: str) -> dict | None:
+        return self._read(self._index_path(directory))
+
+    def write_index(self, directory: str, index: dict) -> None:
+        self._write(self._index_path(directory), index)
+
+    def lock(self, directory: str) -> 'CacheLock':
+        """Advisory lock serializing rewrites of a directory's index and catalog across processes."""
+        return CacheLock(os.path.join(self.root, 'locks', f'{self._directory_name(directory)}.lock'))
+
+    def remove_index(self, directory: str) -> None:
+        self._remove(self._index_path(directory))
+        self._remove(self._catalog_path(directory))
+
+    # columnar catalog
+
+    def write_catalog(self, directory: str, entries: list[dict], keys: dict) -> None:
+        """
+        Write a directory's catalog entries as an uncompressed Arrow IPC file.
+
+        Args:
+            directory (str): Directory the catalog was built from.
+            entries (list[dict]): Catalog entries (see ModelFileData.get_catalog_entry).
+            keys (dict): {model_id: model shard key}.
+        """
+        columns = {name: [] for name in CATALOG_SCHEMA.names}
+        for entry in entries:
+            for name in CATALOG_SCHEMA.names:
+                columns[name].append(keys.get(entry['model_id']) if name == 'key' else entry.get(name))
+        self._write_arrow(self._catalog_path(directory), pa.Table.from_pydict(columns, schema=CATALOG_SCHEMA))
+
+    def read_catalog(self, directory: str) -> pa.Table | None:
+        """
+        Memory-map a directory's Arrow catalog. Columns are read lazily by the OS.
+
+        Returns:
+            pa.Table | None: One row per model (see CATALOG_SCHEMA), or None if missing or unreadable.
+        """
+        table = self._read_arrow(self._catalog_path(directory))
+        if table is None or not table.schema.equals(CATALOG_SCHEMA):
+            return None
+        return table
+
+    # model catalog shards
+
+    def read_model(self, key: str) -> dict | None:
+        return self._read(self._model_path(key))
+
+    def write_model(self, key: str, entry: dict) -> None:
+        self._write(self._model_path(key), entry)
+
+    def remove_model(self, key: str) -> None:
+        self._remove(self._model_path(key))
+
+    # parsed artifact shards
+
+    def read_artifact(self, kind: str, key: str) -> Any:
+        return self._read(self._artifact_path(kind, key))
+
+    def write_artifact(self, kind: str, key: str, payload: Any) -> None:
+        self._write(self._artifact_path(kind, key), payload)
+
+    def remove_artifact(self, kind: str, key: str) -> None:
+        self._remove(self._artifact_path(kind, key))
+
+    # columnar tables
+
+    def read_table(self, kind: str, key: str) -> pa.Table | None:
+        """
+        Memory-map a columnar artifact. Columns are read lazily by the OS.
+
+        Returns:
+            pa.Table | None: The table (with the schema metadata it was written with), or None if
+                             missing or unreadable.
+        """
+        return self._read_arrow(self._table_path(kind, key))
+
+    def write_table(self, kind: str, key: str, table: pa.Table) -> None:
+        """Write a columnar artifact as an uncompressed Arrow IPC file."""
+        self._write_arrow(self._table_path(kind, key), table)
+
+    def remove_table(self, kind: str, key: str) -> None:
+        self._remove(self._table_path(kind, key))
+
+    # content fingerprints
+
+    def content_fingerprint(self, file_path: str, mode: str | None = None) -> str | None:
+        """
+        Return the content fingerprint of a file, hashing it only if it changed since last time.
+
+        The fingerprint is memoized in memory and on disk against the file's stat fingerprint,
+        so it is recomputed only when the file's size, mtime or inode change.
+
+        Args:
+            file_path (str): File to fingerprint.
+            mode (str | None): 'full' or 'sampled' (see hash_file). Defaults to CACHE_FINGERPRINT_MODE.
+
+        Returns:
+            str | None: The fingerprint, or None if the file cannot be read.
+        """
+        mode = mode or CACHE_FINGERPRINT_MODE
+        file_path = os.path.abspath(file_path)
+        stat = stat_fingerprint(file_path)
+        if stat is None:
+            return None
+
+        memo_key = (file_path, stat, mode)
+        digest = self._fingerprints.get(memo_key)
+        if digest is not None:
+            return digest
+
+        path = self._fingerprint_path(file_path)
+        stored = self._read(path)
+        if stored is not None and stored['stat'] == stat and stored['mode'] == mode:
+            digest = stored['digest']
+        else:
+            try:
+                digest = hash_file(file_path, mode)
+            except OSError:
+                return None
+            # a file rewritten while it was being hashed gets hashed again next time
+            if stat_fingerprint(file_path) != stat:
+                return digest
+            self._write(path, {'stat': stat, 'mode': mode, 'digest': digest})
+
+        self._fingerprints[memo_key] = digest
+        return digest
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._fingerprints.clear()
+
+
+_default_cache = None
+
+
+def get_default_cache() -> ShardedCache:
+    """Return the process-wide cache rooted at CACHE_SHARD_DIRECTORY."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ShardedCache(CACHE_SHARD_DIRECTORY)
+    return _default_cache
+
+
+def cached_artifact(kind: str, file_path: str, loader: Callable[[str], Any], version: int,
+                    cache: ShardedCache | None = None) -> Any:
+    """
+    Return the artifact parsed from file_path, reading its shard if one matches the file's contents.
+
+    On a miss the file is parsed with loader(file_path) and the result stored as a new shard.
+    Shards are keyed by the file's content fingerprint and the loader's version: bump the version
+    whenever the loader's output changes (a new column, a different order), or shards written by
+    the old loader are served from the persistent cache for files that did not change.
+
+    Args:
+        kind (str): Artifact kind, used as the shard subdirectory (e.g. 'html_tables').
+        file_path (str): Source file the artifact is parsed from.
+        loader (callable): Parses the file; called only on a cache miss.
+        version (int): Format version of the loader's output.
+        cache (ShardedCache | None): Cache to use; defaults to get_default_cache().
+    """
+    cache = cache or get_default_cache()
+    key = cache.content_fingerprint(file_path)
+    if key is None:
+        return loader(file_path)
+    key = _digest(key, version)
+
+    payload = cache.read_artifact(kind, key)
+    if payload is None:
+        payload = loader(file_path)
+        cache.write_artifact(kind, key, payload)
+
+    return payload
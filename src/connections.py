@@ -0,0 +1,250 @@
+"""
+shared pool of read-only SQLite connections to EnergyPlus SQL output files.
+
+EnergyPlus writes eplusout.sql once, at the end of a run, and the server only reads it. Files
+are opened through a URI with mode=ro (and immutable=1 unless EPLUS_SQL_IMMUTABLE=0), so SQLite
+skips file locking and change detection, and query_only guards against writes. Each connection
+gets a larger page cache and memory-maps the file, which matters for the large ReportData scans
+of series reads.
+
+Connections are pooled per file version: a connection is checked out for one query (or one
+streaming read) and returned to the pool, so several threads can read the same file at once
+without sharing a connection, and a file that is overwritten by a new run gets new connections.
+The total number of open handles is capped; at the cap, the least recently used idle connection
+is closed. Connections belong to the process-wide pool, never to the SqlTimeseries/SqlTables
+objects, so they are never pickled with the model map.
+"""
+
+import os
+import sqlite3
+import threading
+import urllib.parse
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from src import SQL_POOL_MAX_CONNECTIONS, SQL_CACHE_SIZE_KIB, SQL_MMAP_SIZE, SQL_IMMUTABLE
+from src.cache import stat_fingerprint
+
+
+def sqlite_uri(sql_file: str, immutable: bool = True) -> str:
+    """
+    Return the read-only SQLite URI of a file.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        immutable (bool): Add immutable=1, for files no other process writes while they are open.
+    """
+    path = urllib.parse.quote(os.path.abspath(sql_file).replace(os.sep, '/'), safe='/:')
+    if not path.startswith('/'):
+        # windows drive letters: file:///C:/...
+        path = '/' + path
+    return f"file:{path}?mode=ro{'&immutable=1' if immutable else ''}"
+
+
+def open_readonly(sql_file: str, immutable: bool = True, cache_size_kib: int = SQL_CACHE_SIZE_KIB,
+                  mmap_size: int = SQL_MMAP_SIZE) -> sqlite3.Connection:
+    """
+    Open a read-only connection to a SQL file, tuned for large sequential reads.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        immutable (bool): Open with immutable=1 (see sqlite_uri()).
+        cache_size_kib (int): Page cache size of the connection, in KiB.
+        mmap_size (int): Bytes of the file SQLite may memory-map (0 disables memory mapping).
+
+    Returns:
+        sqlite3.Connection: The connection, usable from any thread (one thread at a time).
+    """
+    if not os.path.isfile(sql_file):
+        # mode=ro would fail with a less helpful 'unable to open database file'
+        raise FileNotFoundError(sql_file)
+    conn = sqlite3.connect(sqlite_uri(sql_file, immutable), uri=True, check_same_thread=False)
+    conn.execute(f'PRAGMA cache_size = -{int(cache_size_kib)}')
+    conn.execute(f'PRAGMA mmap_size = {int(mmap_size)}')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA query_only = 1')
+    return conn
+
+
+class SqlConnectionPool:
+    """
+    Thread-safe pool of read-only connections, keyed by file path and stat fingerprint.
+
+    Args:
+        max_connections (int): Cap on open connections across all files. When it is reached,
+                               the least recently used idle connection is closed; if every
+                               connection is checked out, callers wait for one to be returned.
+        immutable (bool): Open files with immutable=1.
+    """
+
+    def __init__(self, max_connections: int = SQL_POOL_MAX_CONNECTIONS, immutable: bool = SQL_IMMUTABLE):
+        self.max_connections = max(1, max_connections)
+        self.immutable = immutable
+        # (path, fingerprint) -> idle connections, least recently used key first
+        self._idle: OrderedDict[tuple, list[sqlite3.Connection]] = OrderedDict()
+        self._in_use: dict[int, tuple] = {}
+        self._open = 0
+        self._condition = threading.Condition()
+
+    def _key(self, sql_file: str) -> tuple:
+        path = os.path.abspath(sql_file)
+        fingerprint = stat_fingerprint(path)
+        if fingerprint is None:
+            raise FileNotFoundError(sql_file)
+        return path, fingerprint
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        # caller holds the condition
+        self._open -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _drop_stale(self, path: str, key: tuple) -> None:
+        # idle connections to older versions of the file
+        for stale in [k for k in self._idle if k[0] == path and k != key]:
+            for conn in self._idle.pop(stale):
+                self._close(conn)
+
+    def _evict_idle(self) -> bool:
+        for key, conns in self._idle.items():
+            self._close(conns.pop(0))
+            if not conns:
+                del self._idle[key]
+            return True
+        return False
+
+    def acquire(self, sql_file: str, timeout: float | None = None) -> sqlite3.Connection:
+        """
+        Check out a connection to a file. Return it with release().
+
+        Args:
+            sql_file (str): Path to the SQL file.
+            timeout (float | None): Seconds to wait while all connections are checked out.
+
+        Returns:
+            sqlite3.Connection: A read-only connection to the file's current version.
+        """
+        key = self._key(sql_file)
+        with self._condition:
+            self._drop_stale(key[0], key)
+            while True:
+                conns = self._idle.get(key)
+                if conns:
+                    conn = conns.pop()
+                    if not conns:
+                        del self._idle[key]
+                    self._in_use[id(conn)] = key
+                    return conn
+                if self._open < self.max_connections or self._evict_idle():
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError(f'no SQLite connection available for {sql_file} '
+                                       f'({self.max_connections} in use)')
+            # reserve the slot before opening outside the lock
+            self._open += 1
+
+        try:
+            conn = open_readonly(key[0], immutable=self.immutable)
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._in_use[id(conn)] = key
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Return a connection checked out with acquire(). It is closed if its file has changed since.
+        """
+        with self._condition:
+            key = self._in_use.pop(id(conn), None)
+            if key is None:
+                return
+            if key[1] is None or stat_fingerprint(key[0]) != key[1]:
+                self._close(conn)
+            else:
+                self._idle.setdefault(key, []).append(conn)
+                self._idle.move_to_end(key)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, sql_file: str) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager that checks out a connection to a file for the duration of the block.
+
+        Example:
+            with get_connection_pool().connection(sql_file) as conn:
+                rows = conn.execute('SELECT ...').fetchall()
+        """
+        conn = self.acquire(sql_file)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def prewarm(self, sql_file: str) -> None:
+        """
+        Open a connection to a file and leave it idle in the pool, so the next read does not pay for it.
+        """
+        with self._condition:
+            if any(key[0] == os.path.abspath(sql_file) for key in self._idle):
+                return
+        with self.connection(sql_file):
+            pass
+
+    def idle_count(self, sql_file: str | None = None) -> int:
+        """
+        Number of idle connections, to one file or to all files.
+        """
+        with self._condition:
+            if sql_file is None:
+                return sum(len(conns) for conns in self._idle.values())
+            path = os.path.abspath(sql_file)
+            return sum(len(conns) for key, conns in self._idle.items() if key[0] == path)
+
+    @property
+    def open_count(self) -> int:
+        """Number of open connections, idle or checked out."""
+        with self._condition:
+            return self._open
+
+    def close_file(self, sql_file: str) -> None:
+        """
+        Close the idle connections to a file, e.g. before it is deleted or overwritten.
+        Checked-out connections are closed when they are returned.
+        """
+        path = os.path.abspath(sql_file)
+        with self._condition:
+            self._drop_stale(path, (path, None))
+            for conn_id, key in list(self._in_use.items()):
+                if key[0] == path:
+                    # makes release() treat it as stale
+                    self._in_use[conn_id] = (path, None)
+            self._condition.notify_all()
+
+    def close_all(self) -> None:
+        """Close every idle connection."""
+        with self._condition:
+            for conns in self._idle.values():
+                for conn in conns:
+                    self._close(conn)
+            self._idle.clear()
+            self._condition.notify_all()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> SqlConnectionPool:
+    """Return the process-wide connection pool."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SqlConnectionPool()
+        return _default_pool
@@ -1,17 +1,27 @@
 
 from pydantic import BaseModel
 from typing import List, Literal
-import pickle
-import gzip
 from pathlib import Path
 import pandas as pd
+import pyarrow.compute as pc
 import logging
 import os
+import sys
+import time
+import threading
+from collections import OrderedDict
 import glob as gb
 from src.tools.func_html import get_all_table_data, get_html_report_name_data
 from src.tools.func_epjson import read_epjson
 from src.tools.func_sql import SqlTimeseries, SqlTables
-from src import CACHE_PICKLE, CACHE_DIRECTORY
+from src.watcher import CatalogWatcher
+from src.scanner import scan_directory, classify_artifact, is_catalog_file, CATALOG_KINDS
+from src.cache import ShardedCache, model_shard_key, cached_artifact
+from src import CACHE_SHARD_DIRECTORY, CACHE_LOCK_TIMEOUT, MODEL_MAP_REVALIDATE_SECONDS, MODEL_MAP_MAX_HYDRATED, CATALOG_WATCH_MODE
+
+# format versions of the parsed-artifact shards (see cached_artifact()); bump when a loader's output changes
+HTML_TABLES_VERSION = 1
+EPJSON_VERSION = 1
 
 
 """pydantic base model classes"""
@@ -46,8 +56,8 @@ class HtmlFileData(BaseModel):
 
     def get_data(self) -> list:
         if self.data is None:
-            print(f'storing html data: {self.file_path}')
-            self.data = get_all_table_data(self.file_path)
+            print(f'storing html data: {self.file_path}', file=sys.stderr)
+            self.data = cached_artifact('html_tables', self.file_path, get_all_table_data, HTML_TABLES_VERSION)
         return self.data
 
 
@@ -120,7 +130,7 @@ class SqlFileData(BaseModel):
     def get_tables(self):
 
         if self.sql_tables is None:
-            self.sql_tables = SqlTimeseries(sql_file=self.file_path)
+            self.sql_tables = SqlTables(sql_file=self.file_path)
 
         return self.sql_tables
 
@@ -141,7 +151,7 @@ class EpJsonFileData(BaseModel):
 
     def get_data(self) -> dict:
         if self.data is None:
-            self.data = read_epjson(self.file_path)
+            self.data = cached_artifact('epjson', self.file_path, read_epjson, EPJSON_VERSION)
         return self.data
 
 
@@ -175,20 +185,23 @@ class ModelFileData(BaseModel):
 
     def get_basic_attributes(self):
         """Get basic model attributes for display"""
-        files = {}
-        if self.epjson_data:
-            files['epjson'] = self.epjson_data.file_path
-        if self.sql_data:
-            files['sql'] = self.sql_data.file_path
-        if self.html_data:
-            files['html'] = self.html_data.file_path
+        return basic_attributes_from_entry(self.get_catalog_entry())
+
+    def get_catalog_entry(self) -> dict:
+        """
+        Lightweight, picklable description of the model (no parsed data), as stored in cache shards.
 
+        Returns:
+            dict: {'model_id', 'directory', 'stem', 'display_name', 'html', 'sql', 'epjson'}
+        """
         return {
             'model_id': self.model_id,
             'directory': self.directory,
             'stem': self.stem,
             'display_name': self.display_name,
-            'files': files
+            'html': self.html_data.file_path if self.html_data else None,
+            'sql': self.sql_data.file_path if self.sql_data else None,
+            'epjson': self.epjson_data.file_path if self.epjson_data else None
         }
 
     def get_associated_files_by_type(self, ext: str, file_type: Literal['plain_text', 'csv'] = 'plain_text'):
@@ -222,37 +235,182 @@ class ModelFileData(BaseModel):
         pass
 
 
+class ModelIndex:
+    """
+    Lookup indexes over catalog entries: model_id -> entry, and a trigram index over the
+    lowercased model_id/display_name text for substring search.
+
+    A plain class rather than pydantic private attributes, which are slow to access on
+    the per-model add path. The trigram index is built on the first substring search.
+    """
+
+    def __init__(self):
+        self.by_id = {}  # model_id -> catalog entry, in insertion order
+        self.order = {}  # model_id -> insertion sequence, to return search results in list order
+        self.search_text = {}  # model_id -> lowercased 'model_id\ndisplay_name'
+        self.trigram_index = None  # trigram -> set of model_ids
+        self._next_seq = 0
+
+    def add(self, entry: dict) -> bool:
+        """Index a catalog entry. Returns False (and keeps the first entry) for a duplicate model_id."""
+        model_id = entry['model_id']
+        if model_id in self.by_id:
+            return False
+        self.by_id[model_id] = entry
+        self.order[model_id] = self._next_seq
+        self._next_seq += 1
+
+        text = f"{model_id}\n{entry['display_name'] or ''}".lower()
+        self.search_text[model_id] = text
+        if self.trigram_index is not None:
+            for trigram in _trigrams(text):
+                self.trigram_index.setdefault(trigram, set()).add(model_id)
+        return True
+
+    def remove(self, model_id: str) -> None:
+        if self.by_id.pop(model_id, None) is None:
+            return
+        del self.order[model_id]
+        text = self.search_text.pop(model_id)
+        if self.trigram_index is None:
+            return
+        for trigram in _trigrams(text):
+            ids = self.trigram_index.get(trigram)
+            if ids is not None:
+                ids.discard(model_id)
+                if not ids:
+                    del self.trigram_index[trigram]
+
+    def get(self, model_id: str) -> dict | None:
+        return self.by_id.get(model_id)
+
+    def search(self, pattern_lower: str) -> list[str]:
+        """model_ids whose model_id or display_name contains pattern_lower, in insertion order."""
+        if '\n' in pattern_lower:
+            return []
+
+        pattern_trigrams = _trigrams(pattern_lower)
+        if pattern_trigrams:
+            if self.trigram_index is None:
+                self.trigram_index = {}
+                for model_id, text in self.search_text.items():
+                    for trigram in _trigrams(text):
+                        self.trigram_index.setdefault(trigram, set()).add(model_id)
+            # candidates contain every trigram of the pattern; smallest posting lists first
+            postings = sorted((self.trigram_index.get(x, set()) for x in pattern_trigrams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = self.search_text.keys()
+
+        matches = [
+            model_id for model_id in candidates
+            if pattern_lower in self.search_text[model_id]
+        ]
+        matches.sort(key=self.order.__getitem__)
+
+        return matches
+
+
+# guards the hydrated-model LRUs of all ModelMaps (tools may run on worker threads)
+_hydration_lock = threading.RLock()
+
+
 class ModelMap(BaseModel):
     """
-    Container for a list of ModelFileData objects, with search and add methods.
+    Catalog of EnergyPlus models, with search and add methods.
+
+    The map holds a lightweight catalog entry per model (model_id, directory, stem,
+    display_name and file paths), indexed by model_id and by trigram (see ModelIndex).
+    ModelFileData objects are hydrated from their entry the first time a model is asked
+    for, and kept in an LRU of at most max_hydrated models; evicted models (and the data
+    parsed for them) are dropped and rebuilt on next use, with parsed data coming back
+    from the artifact cache. Models should be added and removed through _add_model(),
+    _add_entry() and _remove_model().
 
     Attributes:
-        models (List[ModelFileData]): List of model objects.
+        models (list[ModelFileData]): Every model, hydrating all of them. Prefer
+            get_all_model_ids(), get_catalog_entries() or get_model_by_id().
 
     Methods:
         search_models: Filter models by pattern matching on model_id or display_name.
-        _add_model: Add a new ModelFileData object to the list.
+        _add_model: Add a new ModelFileData object to the map.
+        _add_entry: Add a model by catalog entry, without hydrating it.
     """
 
-    models: List[ModelFileData] = []
+    max_hydrated: int = MODEL_MAP_MAX_HYDRATED
+    _index: ModelIndex | None = None
+    _hydrated: OrderedDict | None = None  # model_id -> ModelFileData, least recently used first
+
+    def model_post_init(self, __context):
+        """Create the lookup index and the hydrated-model LRU"""
+        self._index = ModelIndex()
+        self._hydrated = OrderedDict()
+
+    @property
+    def models(self) -> list[ModelFileData]:
+        return [self._hydrate(model_id) for model_id in self._index.by_id]
+
+    def _hydrate(self, model_id: str) -> ModelFileData | None:
+        """Return the model's ModelFileData, building it from its catalog entry if needed"""
+        with _hydration_lock:
+            hydrated = self._hydrated
+            model = hydrated.get(model_id)
+            if model is not None:
+                hydrated.move_to_end(model_id)
+                return model
+
+            entry = self._index.get(model_id)
+            if entry is None:
+                return None
+
+            model = model_from_catalog_entry(entry)
+            hydrated[model_id] = model
+            if self.max_hydrated > 0:
+                while len(hydrated) > self.max_hydrated:
+                    hydrated.popitem(last=False)
+            return model
+
+    def get_hydrated_model_ids(self) -> list[str]:
+        """model_ids currently hydrated, least recently used first"""
+        with _hydration_lock:
+            return list(self._hydrated)
+
+    def release_hydrated_models(self) -> None:
+        """Drop every hydrated model (and its parsed data); they are rebuilt on next use"""
+        with _hydration_lock:
+            self._hydrated.clear()
 
     def get_all_model_ids(self):
-        return [
-            x.model_id for x in self.models
-        ]
+        return list(self._index.by_id)
 
-    def get_model_by_id(self, id):
+    def get_catalog_entries(self) -> list[dict]:
+        """Catalog entries of every model (see ModelFileData.get_catalog_entry), without hydrating"""
+        return [dict(x) for x in self._index.by_id.values()]
 
-        dff = [x for x in self.models if x.model_id == id]
+    def get_all_basic_attributes(self) -> list[dict]:
+        """get_basic_attributes() of every model, without hydrating"""
+        return [basic_attributes_from_entry(x) for x in self._index.by_id.values()]
 
-        if len(dff) == 1:
-            return dff[0]
-        elif len(dff) > 1:
-            # logger.warning(f'multiple ids found; returning first: {id}')
-            return dff[0]
-        else:
-            pass
-            # logger.warning(f'no ids found: {id}')
+    def get_sql_files(self, model_ids: list[str] | None = None, pattern: str | None = None) -> dict[str, str]:
+        """
+        SQL file paths of several models, without hydrating them.
+
+        Args:
+            model_ids (list[str] | None): Models to include, in this order.
+            pattern (str | None): Search pattern (see search_models()) selecting models, used when
+                                  model_ids is not given. Every model if neither is given.
+
+        Returns:
+            dict[str, str]: {model_id: sql file path} for the selected models that have a SQL file.
+        """
+        if model_ids is None:
+            model_ids = self._index.search(pattern.lower()) if pattern else list(self._index.by_id)
+        entries = [self._index.get(x) for x in model_ids]
+        return {x['model_id']: x['sql'] for x in entries if x is not None and x.get('sql')}
+
+    def get_model_by_id(self, id):
+
+        return self._hydrate(id)
 
     def search_models(self, pattern: str | None = None):
         """
@@ -272,15 +430,121 @@ class ModelMap(BaseModel):
         if not pattern:
             return self.models
 
-        pattern_lower = pattern.lower()
-        return [
-            m for m in self.models
-            if pattern_lower in m.model_id.lower() or
-               pattern_lower in (m.display_name or '').lower()
-        ]
+        return [self._hydrate(x) for x in self._index.search(pattern.lower())]
+
+    def _add_entry(self, entry: dict) -> bool:
+        entry = {
+            'model_id': entry['model_id'],
+            'directory': entry['directory'],
+            'stem': entry['stem'],
+            'display_name': entry.get('display_name') or entry['stem'],
+            'html': entry.get('html'),
+            'sql': entry.get('sql'),
+            'epjson': entry.get('epjson')
+        }
+        return self._index.add(entry)
 
     def _add_model(self, obj: ModelFileData):
-        self.models.append(obj)
+        if self._add_entry(obj.get_catalog_entry()):
+            with _hydration_lock:
+                self._hydrated[obj.model_id] = obj
+
+    def _remove_model(self, id):
+        self._index.remove(id)
+        with _hydration_lock:
+            self._hydrated.pop(id, None)
+
+    def upsert_file(self, file_path: str, base_path: str) -> str | None:
+        """
+        Add or refresh a single model file without rebuilding the map.
+
+        The file is attached to the model sharing its directory and stem (creating the
+        model if needed). Any parsed data cached for the previous version of the file
+        is dropped.
+
+        Args:
+            file_path (str): Path of the added or modified file.
+            base_path (str): Directory the map was cataloged from (used for model_id).
+
+        Returns:
+            str | None: model_id the file was attached to, or None if it is not a model file.
+        """
+        file_info = get_file_info(file_path)
+        slot = FILE_EXTENSION_SLOTS.get(file_info['extension'].lower())
+        if slot is None:
+            return None
+
+        model_id = get_model_key(file_info['directory'], file_info['stem'], base_path)
+        entry = self._index.get(model_id)
+        if entry is None:
+            self._add_entry({
+                'model_id': model_id,
+                'directory': file_info['directory'],
+                'stem': file_info['stem']
+            })
+            entry = self._index.get(model_id)
+
+        entry[slot] = file_info['file_path']
+
+        with _hydration_lock:
+            model = self._hydrated.get(model_id)
+            if model is not None:
+                file_data_class = {'html': HtmlFileData, 'sql': SqlFileData, 'epjson': EpJsonFileData}[slot]
+                setattr(model, f'{slot}_data', file_data_class(file_path=file_info['file_path']))
+
+        return model_id
+
+    def discard_file(self, file_path: str, base_path: str) -> str | None:
+        """
+        Detach a removed file from its model, dropping the model once it has no files left.
+
+        Args:
+            file_path (str): Path of the removed file.
+            base_path (str): Directory the map was cataloged from (used for model_id).
+
+        Returns:
+            str | None: model_id the file was detached from, or None if it was not tracked.
+        """
+        file_info = get_file_info(file_path)
+        slot = FILE_EXTENSION_SLOTS.get(file_info['extension'].lower())
+        if slot is None:
+            return None
+
+        model_id = get_model_key(file_info['directory'], file_info['stem'], base_path)
+        entry = self._index.get(model_id)
+        if entry is None or entry[slot] != file_info['file_path']:
+            return None
+
+        entry[slot] = None
+        if entry['epjson'] is None and entry['sql'] is None and entry['html'] is None:
+            self._remove_model(model_id)
+            return model_id
+
+        with _hydration_lock:
+            model = self._hydrated.get(model_id)
+            if model is not None:
+                setattr(model, f'{slot}_data', None)
+
+        return model_id
+
+    def discard_directory(self, directory: str) -> list[str]:
+        """
+        Remove every model located in or below a removed directory.
+
+        Args:
+            directory (str): Path of the removed directory.
+
+        Returns:
+            list[str]: model_ids that were removed.
+        """
+        prefix = os.path.join(os.path.abspath(directory), '')
+        removed = [
+            entry['model_id'] for entry in self._index.by_id.values()
+            if os.path.join(os.path.abspath(entry['directory']), '').startswith(prefix)
+        ]
+        for model_id in removed:
+            self._remove_model(model_id)
+        return removed
 
 
     def get_epjson_by_id(self, id):
@@ -294,28 +558,85 @@ class ModelMap(BaseModel):
         return model.html_data.get_data()
 
 
-    def write_to_cache(self, pickle_file: str = CACHE_PICKLE) -> None:
+    def write_to_cache(
+            self,
+            directory: str,
+            cache_dir: str = CACHE_SHARD_DIRECTORY,
+            snapshot: dict | None = None,
+            rewrite: set | None = None) -> int:
         """
-        Save a ModelMap object to disk as a compressed pickle file.
+        Save the ModelMap to the sharded disk cache.
+
+        Each model's catalog entry is its own shard, keyed by the entry plus the stat
+        fingerprints of the model's files. Shards whose key is already in the directory's
+        index are left alone, so only added or changed models are written. All entries are
+        also written to a columnar Arrow catalog that loads without reading every shard. Parsed file
+        data is not part of the catalog; it is cached separately per file (see cached_artifact).
 
-        Uses gzip compression to reduce file size and I/O time.
+        The directory's cache lock is held while writing, so concurrent writers from other
+        processes are serialized, and every file is replaced atomically: readers see the old
+        or the new index, never a partial one. Shards that are no longer referenced are
+        removed only after the new index is in place.
 
         Args:
-            model_map (ModelMap): The ModelMap object to cache.
+            directory (str): Directory the map was cataloged from.
+            cache_dir (str): Root of the sharded cache.
+            snapshot (dict | None): Snapshot of the directory matching this map. Taken if not given.
+            rewrite (set | None): model_ids whose shards must be written even if the index lists them
+                                  (e.g. because the shard file went missing).
 
         Returns:
-            None
+            int: Number of model shards written.
         """
+        cache = ShardedCache(cache_dir)
+        base_path = os.path.abspath(directory)
+        if snapshot is None:
+            snapshot = snapshot_directory(base_path)
+
+        rewrite = rewrite or set()
+
+        with cache.lock(base_path):
+            previous = (cache.read_index(base_path) or {}).get('models', {})
+            models = {}
+            n_written = 0
+
+            entries = self.get_catalog_entries()
+            for entry in entries:
+                fingerprints = {
+                    entry[kind]: snapshot['files'].get(entry[kind]) for kind in CATALOG_KINDS if entry[kind]
+                }
+                key = model_shard_key(entry, fingerprints)
+                if previous.get(entry['model_id']) != key or entry['model_id'] in rewrite:
+                    cache.write_model(key, entry)
+                    n_written += 1
+                models[entry['model_id']] = key
 
-        # Create cache directory if it doesn't exist
-        cache_dir = Path(pickle_file).parent
-        cache_dir.mkdir(parents=True, exist_ok=True)
+            cache.write_catalog(base_path, entries, models)
+            cache.write_index(base_path, {'directory': base_path, 'snapshot': snapshot, 'models': models})
 
-        with gzip.open(pickle_file + '.gz', 'wb') as f:
-            print(f'writing to compressed cache: {pickle_file}.gz')
-            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            stale_keys = set(previous.values()) - set(models.values())
+            for key in stale_keys:
+                cache.remove_model(key)
 
+        print(f'writing model map cache: {n_written} of {len(models)} model shards changed', file=sys.stderr)
 
+        return n_written
+
+
+
+
+def _trigrams(text: str) -> set[str]:
+    """Set of 3-character substrings of text (empty for text shorter than 3 characters)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# lowercase file extension -> ModelFileData slot
+FILE_EXTENSION_SLOTS = {
+    'htm': 'html',
+    'html': 'html',
+    'sql': 'sql',
+    'epjson': 'epjson'
+}
 
 
 def get_files_by_type(directory, ext, recursive=True):
@@ -399,16 +720,43 @@ def get_file_info(fpath) -> dict:
 
 
 
-def catalog_path(path):
+def get_model_key(directory, stem, base_path) -> str:
+    """
+    Build the model_id for a file group: its directory relative to base_path, plus stem.
+
+    Args:
+        directory (str): Directory containing the model files.
+        stem (str): Filename stem shared by the model files.
+        base_path (str): Directory the catalog was built from.
+
+    Returns:
+        str: model_id, e.g. 'run1/eplusout' (or the full directory if it is not under base_path).
+    """
+    return f"{_model_key_directory(directory, base_path)}/{stem}"
+
+
+def _model_key_directory(directory, base_path) -> str:
+    """Directory part of a model_id (see get_model_key)."""
+    try:
+        rel_dir = Path(directory).relative_to(Path(base_path))
+        return str(rel_dir).replace("\\", "/")
+    except ValueError:
+        # If path is not relative, use full directory
+        return str(directory).replace("\\", "/")
+
+
+def catalog_path(path, max_workers=None):
     """
     Scan a directory for HTML, SQL, and epJSON files and group them by directory + stem.
 
     This function is the primary discovery mechanism for the MCP server to inventory
     all EnergyPlus model files in a directory. Files are grouped together when they share
-    the same directory and filename stem (filename without extension).
+    the same directory and filename stem (filename without extension). The tree is walked
+    once with scan_directory().
 
     Args:
         path (str): Directory path to scan for EnergyPlus model files (scanned recursively).
+        max_workers (int | None): Thread pool size for listing subdirectories concurrently.
 
     Returns:
         dict: Dictionary where keys are model_ids (directory/stem) and values contain grouped files:
@@ -441,32 +789,37 @@ def catalog_path(path):
         }
     """
 
-    html_files = get_files_by_type(path, '.htm', recursive=True)
-    html_files += get_files_by_type(path, '.html', recursive=True)
-    sql_files = get_files_by_type(path, '.sql', recursive=True)
-    epjson_files = get_files_by_type(path, '.epJSON', recursive=True)
+    scan = scan_directory(path, max_workers=max_workers, with_stats=False)
+
+    return group_scanned_files(scan['files'], path)
+
+
+def group_scanned_files(files: list[dict], base_path: str) -> dict:
+    """
+    Group scanned catalog files (HTML, SQL, epJSON) into models by directory + stem.
+
+    Args:
+        files (list[dict]): File records from scan_directory(); non-catalog artifacts are ignored.
+        base_path (str): Directory the scan started from (used for model_ids).
+
+    Returns:
+        dict: Same structure as catalog_path().
+    """
 
     # Dictionary to group files by (directory, stem)
     grouped_models = {}
+    key_directories = {}
 
-    # Process all files
-    all_files = html_files + sql_files + epjson_files
-
-    for file_path in all_files:
-        file_info = get_file_info(file_path)
+    for file_info in sorted(files, key=lambda x: x['file_path']):
+        if file_info['compressed'] or file_info['kind'] not in CATALOG_KINDS:
+            continue
 
         directory = file_info['directory']
         stem = file_info['stem']
-        ext = file_info['extension'].lower()
 
-        # Create unique key for this model (using relative path from base)
-        # Use Path to get relative path
-        try:
-            rel_dir = Path(directory).relative_to(Path(path))
-            model_key = f"{rel_dir}/{stem}".replace("\\", "/")
-        except ValueError:
-            # If path is not relative, use full directory
-            model_key = f"{directory}/{stem}".replace("\\", "/")
+        if directory not in key_directories:
+            key_directories[directory] = _model_key_directory(directory, base_path)
+        model_key = f"{key_directories[directory]}/{stem}"
 
         # Initialize model entry if it doesn't exist
         if model_key not in grouped_models:
@@ -478,13 +831,7 @@ def catalog_path(path):
                 'epjson': None
             }
 
-        # Assign file to appropriate type
-        if ext in ['htm', 'html']:
-            grouped_models[model_key]['html'] = file_info['file_path']
-        elif ext == 'sql':
-            grouped_models[model_key]['sql'] = file_info['file_path']
-        elif ext == 'epjson':
-            grouped_models[model_key]['epjson'] = file_info['file_path']
+        grouped_models[model_key][file_info['kind']] = file_info['file_path']
 
     return grouped_models
 
@@ -516,7 +863,8 @@ def get_model_map(grouped_models):
 
     Note:
         Files are already grouped by catalog_path() based on directory and stem.
-        This function simply creates the ModelFileData objects and populates the ModelMap.
+        This function simply adds their catalog entries to the ModelMap; ModelFileData
+        objects are created when a model is first requested.
 
     Example:
         Input from catalog_path() gets transformed into a ModelMap where each model
@@ -526,77 +874,163 @@ def get_model_map(grouped_models):
     catalog = ModelMap()
 
     for model_id, file_info in grouped_models.items():
-        directory = file_info['directory']
-        stem = file_info['stem']
+        catalog._add_entry({'model_id': model_id, **file_info})
+
+    return catalog
 
-        # Create the model object
-        model = ModelFileData(
-            model_id=model_id,
-            directory=directory,
-            stem=stem
-        )
 
+def model_from_catalog_entry(entry: dict) -> ModelFileData:
+    """
+    Create a ModelFileData from a catalog entry (a catalog_path() value plus model_id).
+
+    File data objects are attached for each file present; nothing is parsed.
+    """
+    return ModelFileData(
+        model_id=entry['model_id'],
+        directory=entry['directory'],
+        stem=entry['stem'],
+        display_name=entry.get('display_name'),
         # Attach file data objects if files exist
-        if file_info['html']:
-            model.html_data = HtmlFileData(file_path=file_info['html'])
+        html_data=HtmlFileData(file_path=entry['html']) if entry['html'] else None,
+        sql_data=SqlFileData(file_path=entry['sql']) if entry['sql'] else None,
+        epjson_data=EpJsonFileData(file_path=entry['epjson']) if entry['epjson'] else None
+    )
 
-        if file_info['sql']:
-            model.sql_data = SqlFileData(file_path=file_info['sql'])
 
-        if file_info['epjson']:
-            model.epjson_data = EpJsonFileData(file_path=file_info['epjson'])
+def basic_attributes_from_entry(entry: dict) -> dict:
+    """Basic model attributes for display (see ModelFileData.get_basic_attributes) from a catalog entry."""
+    files = {}
+    for kind in ('epjson', 'sql', 'html'):
+        if entry[kind]:
+            files[kind] = entry[kind]
 
-        # Add model to catalog
-        catalog._add_model(model)
+    return {
+        'model_id': entry['model_id'],
+        'directory': entry['directory'],
+        'stem': entry['stem'],
+        'display_name': entry['display_name'] or entry['stem'],
+        'files': files
+    }
 
-    return catalog
+
+def group_catalog_paths(file_paths, base_path: str) -> dict:
+    """
+    Group absolute catalog file paths (e.g. the files of a snapshot) into models, without touching disk.
+
+    Returns:
+        dict: Same structure as catalog_path().
+    """
+    files = []
+    for file_path in file_paths:
+        artifact = classify_artifact(os.path.basename(file_path))
+        if artifact is None:
+            continue
+        files.append({
+            'file_path': file_path,
+            'directory': os.path.dirname(file_path),
+            'stem': artifact['stem'],
+            'kind': artifact['kind'],
+            'compressed': artifact['compressed']
+        })
+
+    return group_scanned_files(files, base_path)
 
 
 """file operations"""
 
 
-def read_model_map_from_cache(pickle_file: str) -> ModelMap:
+def read_model_map_from_cache(directory: str, cache_dir: str = CACHE_SHARD_DIRECTORY) -> ModelMap:
     """
-    Load the cached ModelMap object from disk.
+    Load the cached ModelMap for a directory from the sharded disk cache.
 
     This function enables the MCP server to quickly restore a previously built ModelMap
     from disk cache, avoiding the need to re-scan and re-parse all model files on
-    every server startup. This significantly improves server performance for large
-    model directories.
+    every server startup. Entries come from the directory's Arrow catalog, falling back
+    to the per-model shards listed in its index; no freshness check is done here
+    (see read_or_initialize_model_map).
 
     Args:
-        pickle_file (str): Path to the pickle cache file containing the serialized ModelMap.
+        directory (str): Directory the map was cataloged from.
+        cache_dir (str): Root of the sharded cache.
 
     Returns:
-        ModelMap: The deserialized ModelMap object loaded from cache.
+        ModelMap: The ModelMap rebuilt from the model shards.
 
     Raises:
-        FileNotFoundError: If the pickle cache file doesn't exist.
-        pickle.UnpicklingError: If the cache file is corrupted or incompatible.
+        FileNotFoundError: If there is no cache index, or a model shard is missing.
+    """
+    cache = ShardedCache(cache_dir)
+    base_path = os.path.abspath(directory)
+
+    index = cache.read_index(base_path)
+    if index is None:
+        raise FileNotFoundError(f"Cache index not found for: {base_path}")
+
+    print(f'reading model map cache: {len(index["models"])} models', file=sys.stderr)
+    catalog_entries = read_catalog_entries(base_path, cache, index)
+    model_map = ModelMap()
+    for model_id, key in index['models'].items():
+        entry = catalog_entries.get(model_id) or cache.read_model(key)
+        if entry is None:
+            raise FileNotFoundError(f"Cache shard not found for model: {model_id}")
+        model_map._add_entry(entry)
 
-    Note:
-        The MCP server should handle cases where the cache file doesn't exist or
-        is corrupted by falling back to rebuilding the ModelMap from the source directory.
-    """
-
-    # Try compressed file first, fall back to uncompressed
-    compressed_file = pickle_file + '.gz'
-    if os.path.exists(compressed_file):
-        with gzip.open(compressed_file, 'rb') as f:
-            print(f'reading compressed cache: {compressed_file}')
-            pc = pickle.load(f)
-    elif os.path.exists(pickle_file):
-        with open(pickle_file, 'rb') as f:
-            print(f'reading uncompressed cache: {pickle_file}')
-            pc = pickle.load(f)
-    else:
-        raise FileNotFoundError(f"Cache file not found: {pickle_file}")
+    return model_map
 
-    return pc
 
 
+def read_catalog_entries(directory: str, cache: ShardedCache, index: dict) -> dict:
+    """
+    Read the catalog entries of a directory's Arrow catalog that match its cache index.
+
+    Rows whose shard key differs from the index (a catalog left over from an interrupted
+    write) are skipped, so callers fall back to the model shard.
 
-def initialize_model_map_from_directory(directory: str) -> ModelMap:
+    Returns:
+        dict: {model_id: catalog entry}
+    """
+    table = cache.read_catalog(directory)
+    if table is None:
+        return {}
+
+    keys = index['models']
+    return {
+        row['model_id']: row for row in table.to_pylist()
+        if keys.get(row['model_id']) == row['key']
+    }
+
+
+def search_cached_catalog(directory: str, pattern: str | None = None, cache_dir: str = CACHE_SHARD_DIRECTORY) -> list[dict]:
+    """
+    Search a directory's cached Arrow catalog without building a ModelMap.
+
+    The memory-mapped model_id and display_name columns are filtered with Arrow compute
+    kernels (case-insensitive substring, like ModelMap.search_models), and only the
+    matching rows are converted to Python.
+
+    Args:
+        directory (str): Directory the catalog was built from.
+        pattern (str | None): Substring to match; None returns every entry.
+        cache_dir (str): Root of the sharded cache.
+
+    Returns:
+        list[dict]: Matching catalog entries (empty if there is no cached catalog).
+    """
+    table = ShardedCache(cache_dir).read_catalog(os.path.abspath(directory))
+    if table is None:
+        return []
+
+    if pattern:
+        mask = pc.or_(
+            pc.match_substring(table['model_id'], pattern, ignore_case=True),
+            pc.fill_null(pc.match_substring(table['display_name'], pattern, ignore_case=True), False)
+        )
+        table = table.filter(mask)
+
+    return table.drop_columns(['key']).to_pylist()
+
+
+def initialize_model_map_from_directory(directory: str, cache_dir: str = CACHE_SHARD_DIRECTORY) -> ModelMap:
     """
     Scan a directory for model files, build a ModelMap, and cache it to disk.
 
@@ -606,12 +1040,13 @@ def initialize_model_map_from_directory(directory: str) -> ModelMap:
 
     Args:
         directory (str): Directory path to scan for EnergyPlus model files.
+        cache_dir (str): Root of the sharded cache to write the ModelMap to.
 
     Returns:
         ModelMap: Newly built ModelMap object containing all discovered models.
 
     Side Effects:
-        - Writes the ModelMap to the default cache location (CACHE_PICKLE)
+        - Writes changed model shards and the directory index under cache_dir
         - Prints progress messages about cache operations
 
     Note:
@@ -620,68 +1055,388 @@ def initialize_model_map_from_directory(directory: str) -> ModelMap:
         discovery, parsing, organization, and caching.
     """
 
-    catalog_info = catalog_path(directory)
-    model_map = get_model_map(catalog_info)
+    return _initialize_model_map(directory, cache_dir)[0]
 
 
-    model_map.write_to_cache()
+def _initialize_model_map(directory: str, cache_dir: str) -> tuple[ModelMap, dict]:
+    """initialize_model_map_from_directory(), also returning the snapshot taken by its scan."""
+    base_path = os.path.abspath(directory)
+    scan = scan_directory(base_path)
+    model_map = get_model_map(group_scanned_files(scan['files'], base_path))
+    snapshot = snapshot_from_scan(scan)
 
-    return model_map
+    model_map.write_to_cache(base_path, cache_dir, snapshot=snapshot)
 
+    return model_map, snapshot
 
 
-def reset_cache(pickle_file):
 
-    if os.path.exists(pickle_file):
+def reset_cache(cache_dir: str = CACHE_SHARD_DIRECTORY):
 
-        os.remove(pickle_file)
+    ShardedCache(cache_dir).clear()
 
 
-def read_or_initialize_model_map(directory: str, pickle_file: str = CACHE_PICKLE) -> ModelMap:
+def read_or_initialize_model_map(directory: str, cache_dir: str = CACHE_SHARD_DIRECTORY) -> ModelMap:
     """
-    Load the ModelMap from cache if available and valid, otherwise rebuild.
+    Load the ModelMap from cache, updating only the models whose files changed.
+
+    The directory's cache index stores a snapshot of the tree. It is brought up to date
+    with update_snapshot() (re-listing only directories whose mtime moved), the current
+    files are grouped into models, and each model is read from the Arrow catalog (or its
+    shard). Models that were added or changed are rebuilt from the snapshot and only their
+    shards are rewritten.
 
-    Validates cache by checking if directory modification time is newer than cache file.
-    This ensures cache is invalidated when files are added/removed/modified.
+    Safe to call from several processes sharing one cache directory: when there is no
+    cache yet, one process builds it while the others wait on the directory's cache lock
+    (up to CACHE_LOCK_TIMEOUT seconds) and then read it. When the cache only needs an
+    update, a process that finds the lock taken returns its up-to-date map without writing.
 
     Args:
         directory (str): Directory to scan if cache is missing or stale.
+        cache_dir (str): Root of the sharded cache.
 
     Returns:
         ModelMap: The loaded or newly built ModelMap object.
     """
+    return _read_or_initialize_model_map(directory, cache_dir)[0]
+
+
+def _read_or_initialize_model_map(directory: str, cache_dir: str) -> tuple[ModelMap, dict]:
+    """read_or_initialize_model_map(), also returning the up-to-date snapshot the map was built from."""
+    cache = ShardedCache(cache_dir)
+    base_path = os.path.abspath(directory)
+
+    index = cache.read_index(base_path)
+    if index is None:
+        # another process may be building this directory's cache: wait for it instead of scanning too
+        lock = cache.lock(base_path)
+        if not lock.acquire(timeout=CACHE_LOCK_TIMEOUT):
+            print('timed out waiting for the model map cache lock; building without the cache', file=sys.stderr)
+            scan = scan_directory(base_path)
+            return get_model_map(group_scanned_files(scan['files'], base_path)), snapshot_from_scan(scan)
+        try:
+            index = cache.read_index(base_path)
+            if index is None:
+                print('initializing model map (cache missing)', file=sys.stderr)
+                return _initialize_model_map(base_path, cache_dir)
+        finally:
+            lock.release()
 
-    cache_valid = False
+    snapshot, changes = update_snapshot(index['snapshot'])
+    grouped_models = group_catalog_paths(snapshot['files'], base_path)
 
-    # Check both compressed and uncompressed cache files
-    compressed_file = pickle_file + '.gz'
-    cache_file_to_check = compressed_file if os.path.exists(compressed_file) else pickle_file
+    catalog_entries = read_catalog_entries(base_path, cache, index)
+    model_map = ModelMap()
+    rewrite = set()
+    n_rebuilt = 0
 
-    if os.path.exists(cache_file_to_check):
-        # Check if cache is newer than directory
-        cache_mtime = os.path.getmtime(cache_file_to_check)
+    for model_id, file_info in grouped_models.items():
+        key = index['models'].get(model_id)
+        entry = catalog_entries.get(model_id) or (cache.read_model(key) if key else None)
+        if entry is None and key:
+            # shard went missing: write it again
+            rewrite.add(model_id)
+        if entry is None or any(entry[kind] != file_info[kind] for kind in CATALOG_KINDS):
+            entry = {'model_id': model_id, **file_info}
+            n_rebuilt += 1
+        model_map._add_entry(entry)
+
+    n_changes = sum(len(x) for x in changes.values())
+    if not (n_changes or n_rebuilt or len(grouped_models) != len(index['models'])):
+        print('reading model map from cache', file=sys.stderr)
+        return model_map, snapshot
+
+    # only one process updates the cache; the others use the map they just built without writing it
+    lock = cache.lock(base_path)
+    if lock.acquire(blocking=False):
         try:
-            # Get latest modification time in directory tree
-            dir_mtime = os.path.getmtime(directory)
-            # Walk directory to find newest file
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    if file.endswith(('.epJSON', '.sql', '.htm', '.html')):
-                        file_path = os.path.join(root, file)
-                        file_mtime = os.path.getmtime(file_path)
-                        dir_mtime = max(dir_mtime, file_mtime)
-
-            # Cache is valid if it's newer than all model files
-            cache_valid = cache_mtime > dir_mtime
-        except (OSError, FileNotFoundError):
-            cache_valid = False
-
-    if cache_valid:
-        print('reading model map from cache')
-        model_map = read_model_map_from_cache(pickle_file)
+            print(f'updating model map cache: {n_changes} file changes', file=sys.stderr)
+            model_map.write_to_cache(base_path, cache_dir, snapshot=snapshot, rewrite=rewrite)
+        finally:
+            lock.release()
     else:
-        print('initializing model map (cache missing or stale)')
-        model_map = initialize_model_map_from_directory(directory)
-        model_map.write_to_cache()
+        print('model map cache is being updated by another process; not writing it', file=sys.stderr)
+
+    return model_map, snapshot
+
+
+"""process-resident model maps"""
+
+
+# directory -> {'model_map': ModelMap, 'snapshot': dict, 'checked_at': float, 'watcher': CatalogWatcher | None}
+_resident_model_maps = {}
+_resident_lock = threading.RLock()
+
+
+def snapshot_directory(directory: str) -> dict:
+    """
+    Record the stat state of a model directory tree.
+
+    Directory mtimes change whenever an entry is added, removed or renamed inside
+    them, and model file (size, mtime, inode) fingerprints change whenever a file is rewritten,
+    so re-stat'ing both is enough to tell whether a catalog is still current
+    without globbing or parsing anything.
+
+    Args:
+        directory (str): Root directory of the model tree.
+
+    Returns:
+        dict: {'directories': {path: mtime_ns}, 'files': {path: (size, mtime_ns, inode)}}
+    """
+    return snapshot_from_scan(scan_directory(directory))
+
+
+def snapshot_from_scan(scan: dict) -> dict:
+    """Build a snapshot_directory() style snapshot from a scan_directory() result."""
+    return {
+        'directories': {os.path.abspath(k): v for k, v in scan['directories'].items()},
+        'files': {
+            x['file_path']: (x['size'], x['mtime_ns'], x['ino']) for x in scan['files']
+            if not x['compressed'] and x['kind'] in CATALOG_KINDS
+        }
+    }
+
+
+def update_snapshot(snapshot: dict) -> tuple[dict, dict]:
+    """
+    Bring a snapshot up to date and report which model files changed.
+
+    Only directories whose mtime moved are re-listed (new subdirectories are walked),
+    and every other tracked file is re-stat'ed, so the cost is proportional to the
+    tree's directories plus tracked files rather than a full rescan.
+
+    Args:
+        snapshot (dict): Snapshot from snapshot_directory().
+
+    Returns:
+        tuple: (new_snapshot, {'added': [...], 'modified': [...], 'removed': [...]})
+    """
+    directories = dict(snapshot['directories'])
+    files = dict(snapshot['files'])
+    changes = {'added': [], 'modified': [], 'removed': []}
+
+    files_by_directory = {}
+    for file_path in files:
+        files_by_directory.setdefault(os.path.dirname(file_path), []).append(file_path)
+
+    relisted = set()
+
+    for directory, mtime_ns in snapshot['directories'].items():
+        try:
+            current_mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            # directory is gone; its subdirectories are handled by their own entries
+            del directories[directory]
+            for file_path in files_by_directory.get(directory, []):
+                del files[file_path]
+                changes['removed'].append(file_path)
+            relisted.add(directory)
+            continue
+
+        if current_mtime_ns == mtime_ns:
+            continue
+
+        directories[directory] = current_mtime_ns
+        relisted.add(directory)
+        listed = set()
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.path not in directories:
+                    subtree = snapshot_directory(entry.path)
+                    directories.update(subtree['directories'])
+                    files.update(subtree['files'])
+                    changes['added'].extend(subtree['files'])
+            elif is_catalog_file(entry.name):
+                path = os.path.abspath(entry.path)
+                listed.add(path)
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                stat_key = (st.st_size, st.st_mtime_ns, st.st_ino)
+                if path not in files:
+                    changes['added'].append(path)
+                elif files[path] != stat_key:
+                    changes['modified'].append(path)
+                files[path] = stat_key
+
+        for file_path in files_by_directory.get(directory, []):
+            if file_path not in listed:
+                del files[file_path]
+                changes['removed'].append(file_path)
+
+    for file_path, stat_key in snapshot['files'].items():
+        if os.path.dirname(file_path) in relisted:
+            continue
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            files.pop(file_path, None)
+            changes['removed'].append(file_path)
+            continue
+        if (st.st_size, st.st_mtime_ns, st.st_ino) != stat_key:
+            files[file_path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+            changes['modified'].append(file_path)
+
+    return {'directories': directories, 'files': files}, changes
+
+
+def apply_catalog_change(model_map: ModelMap, base_path: str, kind: str, path: str) -> None:
+    """
+    Apply one file change ('added', 'modified' or 'removed') to a ModelMap in place.
+
+    A 'removed' path that is not a model file is treated as a removed directory.
+    """
+    if kind in ('added', 'modified'):
+        model_map.upsert_file(path, base_path)
+    elif kind == 'removed':
+        if is_catalog_file(os.path.basename(path)):
+            model_map.discard_file(path, base_path)
+        else:
+            model_map.discard_directory(path)
+
+
+def _refresh_resident_entry(key: str, entry: dict) -> None:
+    """Diff the entry's snapshot against disk and apply the changes to its map."""
+    snapshot, changes = update_snapshot(entry['snapshot'])
+    entry['snapshot'] = snapshot
+    entry['checked_at'] = time.monotonic()
+
+    n_changes = sum(len(x) for x in changes.values())
+    if n_changes:
+        print(f'applying {n_changes} catalog changes to resident model map: {key}', file=sys.stderr)
+        for kind in ('removed', 'added', 'modified'):
+            for path in changes[kind]:
+                apply_catalog_change(entry['model_map'], key, kind, path)
+
+
+def _on_watched_change(key: str, entry: dict, kind: str, path: str) -> None:
+    with _resident_lock:
+        if _resident_model_maps.get(key) is not entry:
+            # the map this watcher was started for has been reloaded or dropped
+            return
+        if kind == 'rescan':
+            _refresh_resident_entry(key, entry)
+        else:
+            apply_catalog_change(entry['model_map'], key, kind, path)
+
+
+def load_resident_model_map(
+        directory: str,
+        rebuild: bool = False,
+        cache_dir: str = CACHE_SHARD_DIRECTORY,
+        watch: str | None = None) -> ModelMap:
+    """
+    (Re)load the resident ModelMap for a directory and keep it in memory.
+
+    Args:
+        directory (str): Directory containing EnergyPlus model files.
+        rebuild (bool): If True, rescan the directory instead of reading the disk cache.
+        cache_dir (str): Root of the sharded disk cache.
+        watch (str | None): Catalog watcher mode ('auto', 'inotify', 'poll' or 'off').
+                            Defaults to CATALOG_WATCH_MODE.
+
+    Returns:
+        ModelMap: The newly loaded resident ModelMap.
+    """
+    key = os.path.abspath(directory)
+    if watch is None:
+        watch = CATALOG_WATCH_MODE
+
+    with _resident_lock:
+        previous = _resident_model_maps.pop(key, None)
+    # stopped outside the lock: its thread may be waiting for the lock in _on_watched_change()
+    if previous and previous['watcher']:
+        previous['watcher'].stop()
+
+    with _resident_lock:
+        # the snapshot comes from the same pass over the tree that built the map
+        if rebuild:
+            model_map, snapshot = _initialize_model_map(key, cache_dir)
+        else:
+            model_map, snapshot = _read_or_initialize_model_map(key, cache_dir)
+
+        entry = {
+            'model_map': model_map,
+            'snapshot': snapshot,
+            'checked_at': time.monotonic(),
+            'watcher': None
+        }
+        _resident_model_maps[key] = entry
+
+        if watch != 'off':
+            # poll mode starts from the map's snapshot, so changes made since the scan are reported
+            entry['watcher'] = CatalogWatcher(
+                key,
+                lambda kind, path: _on_watched_change(key, entry, kind, path),
+                mode=watch,
+                poll_interval=MODEL_MAP_REVALIDATE_SECONDS,
+                snapshot=snapshot
+            ).start()
+            if entry['watcher'].mode == 'inotify':
+                # inotify only sees changes from start() on: apply those made since the scan
+                _refresh_resident_entry(key, entry)
 
     return model_map
+
+
+def get_resident_model_map(
+        directory: str,
+        cache_dir: str = CACHE_SHARD_DIRECTORY,
+        max_age: float | None = None) -> ModelMap:
+    """
+    Return the process-resident ModelMap for a directory, loading it on first use.
+
+    This is the entry point MCP tools should use instead of read_or_initialize_model_map():
+    the map is loaded from disk once per process and kept in memory. If a catalog watcher
+    is running for the directory, its events keep the map current. Otherwise, once the map
+    is older than max_age seconds, the next call re-stats the tracked directories and files
+    and applies only the files that were added, modified or removed. Calls in between are
+    a dictionary lookup.
+
+    Args:
+        directory (str): Directory containing EnergyPlus model files.
+        cache_dir (str): Root of the sharded disk cache used for the initial load.
+        max_age (float | None): Seconds to trust the resident map before re-stat'ing.
+                                Defaults to MODEL_MAP_REVALIDATE_SECONDS.
+
+    Returns:
+        ModelMap: The resident ModelMap for the directory.
+    """
+    if max_age is None:
+        max_age = MODEL_MAP_REVALIDATE_SECONDS
+
+    key = os.path.abspath(directory)
+
+    with _resident_lock:
+        entry = _resident_model_maps.get(key)
+
+        if entry is None:
+            return load_resident_model_map(directory, cache_dir=cache_dir)
+
+        if entry['watcher'] and entry['watcher'].running:
+            return entry['model_map']
+
+        if time.monotonic() - entry['checked_at'] >= max_age:
+            _refresh_resident_entry(key, entry)
+
+        return entry['model_map']
+
+
+def clear_resident_model_maps() -> None:
+    """Drop all process-resident model maps and stop their watchers (maps reload on next use)."""
+    with _resident_lock:
+        entries = list(_resident_model_maps.values())
+        _resident_model_maps.clear()
+    # stopped outside the lock, like in load_resident_model_map()
+    for entry in entries:
+        if entry['watcher']:
+            entry['watcher'].stop()
@@ -81,6 +81,8 @@ def log_mcp_call(
     log_entry = {
         "timestamp": datetime.now().isoformat(),
         "function_name": function_name,
+        # tools pass the model as 'id' or 'model_id'; recorded on its own so the warm-up can find recent models
+        "model_id": kwargs.get('model_id', kwargs.get('id')) if isinstance(kwargs, dict) else None,
         # "duration_seconds": round(duration, 4),
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
@@ -208,6 +210,50 @@ def get_log_stats() -> Dict[str, Any]:
         return {"error": f"Failed to read log file: {e}"}
 
 
+def get_recent_model_ids(limit: int = 8, log_file: Path | None = None, tail_bytes: int = 1 << 20) -> list[str]:
+    """
+    Get the most recently used model ids from the MCP call log.
+
+    Only the last tail_bytes of the log are read, so this stays cheap on long-lived logs.
+
+    Args:
+        limit: Maximum number of model ids to return
+        log_file: Log file to read (default: the log file from setup_logging())
+        tail_bytes: Number of bytes read from the end of the log
+
+    Returns:
+        Distinct model ids, most recently used first
+    """
+    if log_file is None:
+        log_file = setup_logging()
+
+    try:
+        with open(log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            lines = f.read().decode('utf-8', errors='replace').splitlines()
+    except OSError:
+        return []
+
+    if size > tail_bytes:
+        # first line is probably cut in half
+        lines = lines[1:]
+
+    model_ids = []
+    for line in reversed(lines):
+        try:
+            model_id = json.loads(line).get('model_id')
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        if isinstance(model_id, str) and model_id not in model_ids:
+            model_ids.append(model_id)
+            if len(model_ids) >= limit:
+                break
+
+    return model_ids
+
+
 def clear_logs() -> str:
     """
     Clear the MCP call logs.
@@ -0,0 +1,198 @@
+"""
+single-pass directory scanner that classifies EnergyPlus output artifacts.
+
+scan_directory() walks a tree once with os.scandir and classifies every file it
+sees (reports, SQL, epJSON, err/rdd/eio/csv outputs, and their .gz siblings), so
+model discovery does not need a separate recursive glob per file type.
+Subdirectories can optionally be listed from a thread pool, which mostly helps on
+network-mounted run archives where each directory listing is latency bound.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+# filename suffix (lowercase, without the leading dot) -> artifact kind.
+# two-part suffixes are matched first, so 'table.htm' wins over 'htm'.
+ARTIFACT_KINDS = {
+    'table.htm': 'html',
+    'table.html': 'html',
+    'htm': 'html',
+    'html': 'html',
+    'sql': 'sql',
+    'epjson': 'epjson',
+    'idf': 'idf',
+    'err': 'err',
+    'sqlite.err': 'sqlite_err',
+    'rdd': 'rdd',
+    'mdd': 'mdd',
+    'eio': 'eio',
+    'audit': 'audit',
+    'bnd': 'bnd',
+    'mtd': 'mtd',
+    'shd': 'shd',
+    'end': 'end',
+    'dxf': 'dxf',
+    'log': 'log',
+    'chatter.txt': 'chatter',
+    'csv': 'csv',
+    'meter.csv': 'meter_csv',
+    'table.csv': 'table_csv',
+    'ssz.csv': 'ssz_csv',
+    'zsz.csv': 'zsz_csv',
+}
+
+# artifact kinds that make up a model in the catalog (when not compressed)
+CATALOG_KINDS = ('html', 'sql', 'epjson')
+
+
+def classify_artifact(file_name: str) -> dict | None:
+    """
+    Classify an EnergyPlus output file by name.
+
+    Args:
+        file_name (str): Base filename, e.g. 'eplusout.table.htm' or 'run.dd.rdd.gz'.
+
+    Returns:
+        dict | None: {'stem', 'kind', 'compressed'} or None if the file is not a known artifact.
+            The stem follows the catalog convention: only the artifact suffix is removed,
+            so 'model.dd.sql' has stem 'model.dd' and 'model.table.htm' has stem 'model'.
+
+    Example:
+        >>> classify_artifact('ASHRAE901_Hotel.dd.rdd.gz')
+        {'stem': 'ASHRAE901_Hotel.dd', 'kind': 'rdd', 'compressed': True}
+    """
+    name = file_name
+    compressed = name[-3:].lower() == '.gz'
+    if compressed:
+        name = name[:-3]
+
+    # suffixes are at most two dot-separated parts; try the longer one first
+    parts = name.rsplit('.', 2)
+    for n_parts in (2, 1):
+        if len(parts) > n_parts and parts[0]:
+            suffix = '.'.join(parts[-n_parts:])
+            kind = ARTIFACT_KINDS.get(suffix.lower())
+            if kind is not None:
+                return {
+                    'stem': name[:-(len(suffix) + 1)],
+                    'kind': kind,
+                    'compressed': compressed
+                }
+
+    return None
+
+
+def is_catalog_file(file_name: str) -> bool:
+    """True for the uncompressed HTML, SQL and epJSON files that make up cataloged models."""
+    artifact = classify_artifact(file_name)
+    return artifact is not None and not artifact['compressed'] and artifact['kind'] in CATALOG_KINDS
+
+
+def _list_directory(directory: str, with_stats: bool) -> tuple:
+    """
+    List one directory.
+
+    Returns:
+        tuple: (directory, mtime_ns or None if unreadable, file entries, subdirectory paths)
+    """
+    files = []
+    subdirectories = []
+
+    abs_directory = os.path.abspath(directory)
+
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as it:
+            for entry in it:
+                # match glob semantics: hidden files and directories are skipped
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+
+                artifact = classify_artifact(entry.name)
+                if artifact is None:
+                    continue
+
+                record = {
+                    'file_path': os.path.join(abs_directory, entry.name),
+                    'directory': directory,
+                    'file_name': entry.name,
+                    'stem': artifact['stem'],
+                    'extension': os.path.splitext(entry.name)[1].lstrip('.'),
+                    'kind': artifact['kind'],
+                    'compressed': artifact['compressed'],
+                    'size': None,
+                    'mtime_ns': None,
+                    'ino': None
+                }
+
+                # only catalog files are stat'ed; the rest are just classified
+                if with_stats and not artifact['compressed'] and artifact['kind'] in CATALOG_KINDS:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    record['size'] = st.st_size
+                    record['mtime_ns'] = st.st_mtime_ns
+                    record['ino'] = st.st_ino
+
+                files.append(record)
+    except OSError:
+        return directory, None, [], []
+
+    return directory, mtime_ns, files, subdirectories
+
+
+def scan_directory(path: str, max_workers: int | None = None, with_stats: bool = True) -> dict:
+    """
+    Walk a directory tree once and classify every EnergyPlus artifact in it.
+
+    Args:
+        path (str): Root directory to scan (recursively).
+        max_workers (int | None): If greater than 1, list subdirectories concurrently
+                                  on a thread pool of this size.
+        with_stats (bool): Stat catalog files for size/mtime/inode. Not needed for plain discovery.
+
+    Returns:
+        dict: {
+            'directories': {directory: mtime_ns},
+            'files': [
+                {'file_path', 'directory', 'file_name', 'stem', 'extension',
+                 'kind', 'compressed', 'size', 'mtime_ns', 'ino'},
+                ...
+            ]
+        }
+        size, mtime_ns and ino are only filled in for catalog files (see CATALOG_KINDS), and
+        only when with_stats is True.
+    """
+    directories = {}
+    files = []
+
+    def collect(result):
+        directory, mtime_ns, dir_files, subdirectories = result
+        if mtime_ns is not None:
+            directories[directory] = mtime_ns
+            files.extend(dir_files)
+        return subdirectories
+
+    if not max_workers or max_workers <= 1:
+        pending = [path]
+        while pending:
+            pending.extend(collect(_list_directory(pending.pop(), with_stats)))
+        return {'directories': directories, 'files': files}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {pool.submit(_list_directory, path, with_stats)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for subdirectory in collect(future.result()):
+                    running.add(pool.submit(_list_directory, subdirectory, with_stats))
+
+    return {'directories': directories, 'files': files}
@@ -1,5 +1,6 @@
 from pathlib import Path
 import time
+import numpy as np
 import pandas as pd
 import glob as gb
 import logging
@@ -7,9 +8,10 @@ import logging
 from typing import Any
 from mcp.server.fastmcp import FastMCP
 from src.monitor import log_mcp_call
-from src import CACHE_PICKLE, EPLUS_RUNS_DIRECTORY
-from src.model_data import initialize_model_map_from_directory, read_or_initialize_model_map
+from src import EPLUS_RUNS_DIRECTORY
+from src.model_data import get_resident_model_map, load_resident_model_map
 from src.dataloader import execute_pandas_query, execute_multiline_pandas_query
+from src.tools.func_sql import align_series
 
 logger = logging.getLogger(__name__)
 
@@ -80,8 +82,8 @@ def initialize_model_map(directory: str = DEFAULT_DIRECTORY) -> str:
         Status message confirming successful initialization.
     """
 
-    initialize_model_map_from_directory(directory)
     _set_current_directory(directory)
+    load_resident_model_map(directory, rebuild=True)
     result = f"Model map initialized successfully for directory: {directory}"
     log_mcp_call('setup_model_map', result, kwargs={'directory': directory})
 
@@ -110,10 +112,10 @@ def get_available_models(directory: str = DEFAULT_DIRECTORY) -> dict:
         - files: Dictionary of available file paths (epjson, sql, html)
     """
 
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
 
     # Directly return list of attributes instead of converting through DataFrame
-    result = [x.get_basic_attributes() for x in model_map.models]
+    result = model_map.get_all_basic_attributes()
 
     log_mcp_call('get_available_models', result, kwargs={'directory': directory})
 
@@ -134,7 +136,7 @@ def get_html_table_by_tuple(id: str, query_tuple: tuple) -> list[dict]:
         JSON string containing the requested table data with columns and rows.
     """
 
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
     table = model.html_data.get_table_by_tuple(query_tuple, asjson=True)
 
@@ -164,7 +166,7 @@ def get_rdd_file(id: str) -> list[str]:
         Plain text output of RDD file, which shows available output reports.
     """
 
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
     err_file = model.get_associated_files_by_type('rdd')
     return err_file
@@ -183,7 +185,7 @@ def get_error_file(id: str) -> list[str]:
         Plain text output of EPlus error file
     """
 
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
     err_file = model.get_associated_files_by_type('err')
     return err_file
@@ -205,31 +207,177 @@ def get_error_file(id: str) -> list[str]:
 
 
 @mcp.tool()
-def get_sql_available_hourlies(id: str) -> list | dict:
+def get_sql_available_hourlies(
+    id: str,
+    frequency: str = 'Hourly',
+    name: str | None = None,
+    key_value: str | None = None,
+    units: str | None = None,
+    columns: tuple[str, ...] | None = ('ReportDataDictionaryIndex', 'KeyValue', 'Name', 'ReportingFrequency', 'Units'),
+    after: int = 0,
+    limit: int = 1000
+) -> dict:
     """
-    List available hourly timeseries variables in the SQL output for a specific model.
+    List available timeseries variables in the SQL output for a specific model, one page at a time.
 
-    Discovers all hourly timeseries data available in a model's SQL output database,
-    providing variable names and RDD IDs needed to extract specific timeseries data.
+    Discovers the timeseries data of one reporting frequency (hourly by default) available
+    in a model's SQL output database, providing variable names and RDD IDs needed to extract
+    specific timeseries data. Models with detailed reporting can have tens of thousands of
+    variables: narrow the list with name / key_value / units patterns, and page through it
+    with 'after'.
 
     Args:
         id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        frequency: Reporting frequency: 'Hourly' (default), 'timestep' (zone timestep),
+                   'detailed' (HVAC system timestep), 'daily', 'monthly', 'runperiod',
+                   'annual', or 'all' for every frequency.
+        name: Variable name pattern, case-insensitive: exact, 'prefix*' or wildcard ('*Heating*').
+        key_value: Zone, surface or equipment name pattern.
+        units: Units pattern.
+        columns: Fields to return, from ReportDataDictionaryIndex, IsMeter, Type, IndexGroup,
+                 TimestepType, KeyValue, Name, ReportingFrequency, ScheduleName, Units; null for all.
+        after: 0 for the first page, then the previous page's 'next_after'.
+        limit: Variables per page (1 to 10000).
 
     Returns:
-        Available hourly timeseries variables including:
-        - Variable names (e.g., 'Zone Air Temperature', 'HVAC Electric Power')
-        - RDD IDs for use with get_timeseries_report_by_rddid
-        - Units and key values for each variable
+        Dictionary with:
+        - count: number of matching variables
+        - series: up to limit variables, each with its RDD ID (ReportDataDictionaryIndex) for use
+          with get_timeseries_report_by_rddid_list, and the requested columns
+        - next_after: value to pass as 'after' for the next page, or null after the last page
     """
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    if not 1 <= limit <= 10000:
+        raise ValueError(f"limit must be between 1 and 10000, got {limit}")
+
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
-    result = model.sql_data.get_timeseries().availseries()
+    series, next_after, count = model.sql_data.get_timeseries().page_series(
+        frequency=frequency,
+        name=name,
+        key=key_value,
+        units=units,
+        columns=columns,
+        after=after,
+        limit=limit
+    )
+    result = {'count': count, 'series': series, 'next_after': next_after}
 
-    log_mcp_call('get_sql_available_hourlies', result, kwargs={'id': id})
+    log_mcp_call(
+        'get_sql_available_hourlies',
+        result,
+        kwargs={
+            'id': id,
+            'frequency': frequency,
+            'name': name,
+            'key_value': key_value,
+            'units': units,
+            'columns': columns,
+            'after': after,
+            'limit': limit
+        }
+    )
 
     return result
 
 
+@mcp.tool()
+def search_timeseries(
+    model_id: str,
+    name: str | None = None,
+    key_value: str | None = None,
+    units: str | None = None,
+    frequency: str = 'all',
+    limit: int = 100
+) -> dict:
+    """
+    Find timeseries variables by name, key and units patterns, instead of listing all of them.
+
+    Patterns are case-insensitive and may be exact ('Zone Mean Air Temperature'), a prefix
+    ('Zone Air*') or a wildcard ('*Heating*Energy', 'CORE_*', 'ZONE ?').
+
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        name: Variable or meter name pattern.
+        key_value: Zone, surface or equipment name pattern.
+        units: Units pattern (e.g. 'C', 'J', 'W').
+        frequency: Reporting frequency ('Hourly', 'timestep', 'daily', 'monthly', 'runperiod') or 'all'.
+        limit: Maximum number of variables to return.
+
+    Returns:
+        Dictionary with:
+        - count: number of matching variables
+        - series: up to limit ReportDataDictionary records (RDD ID as ReportDataDictionaryIndex,
+          KeyValue, Name, ReportingFrequency, Units, ...)
+    """
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+    matches = model.sql_data.get_timeseries().search_series(name=name, key=key_value, units=units, frequency=frequency)
+    result = {'count': len(matches), 'series': matches[:limit]}
+
+    log_mcp_call(
+        'search_timeseries',
+        result,
+        kwargs={
+            'model_id': model_id,
+            'name': name,
+            'key_value': key_value,
+            'units': units,
+            'frequency': frequency,
+            'limit': limit
+        }
+    )
+    return result
+
+
+@mcp.tool()
+def get_timeseries_by_name(
+    model_id: str,
+    name: str,
+    key_value: str | None = None,
+    frequency: str = 'Hourly',
+    max_series: int = 20
+) -> Any:
+    """
+    Retrieve timeseries data by variable name and key pattern, without looking up RDD IDs first.
+
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        name: Variable or meter name pattern, e.g. 'Zone Mean Air Temperature' or 'Electricity:*'.
+        key_value: Zone, surface or equipment name pattern, e.g. 'CORE_*'. Every key if omitted.
+        frequency: Reporting frequency ('Hourly', 'timestep', 'daily', 'monthly', 'runperiod').
+        max_series: Maximum number of matching variables to extract; narrow the patterns if exceeded.
+
+    Returns:
+        Timestamped values with one column per matching variable, labelled
+        '<KeyValue>-<Name>-<TimestepType>-<Units>'.
+    """
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+    timeseries = model.sql_data.get_timeseries()
+
+    matches = timeseries.search_series(name=name, key=key_value, frequency=frequency)
+    if not matches:
+        raise ValueError(f"No {frequency} series match name '{name}' and key '{key_value or '*'}'")
+    if len(matches) > max_series:
+        raise ValueError(
+            f"{len(matches)} series match; narrow name or key_value, or raise max_series (max_series is {max_series})"
+        )
+
+    dff = timeseries.getseries_wide([x['ReportDataDictionaryIndex'] for x in matches])
+    log_mcp_call(
+        'get_timeseries_by_name',
+        dff,
+        kwargs={
+            'model_id': model_id,
+            'name': name,
+            'key_value': key_value,
+            'frequency': frequency,
+            'max_series': max_series
+        }
+    )
+    return dff
+
+
 
 @mcp.tool()
 def search_epjson_objects(
@@ -261,7 +409,7 @@ def search_epjson_objects(
 
 
     # Get the cached epJSON data or load it
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(model_id)
     epjson_data = model.epjson_data.get_data()
 
@@ -509,10 +657,11 @@ def search_related_objects(model_id: str, search_pattern: str) -> dict:
 @mcp.tool()
 def get_timeseries_report_by_rddid_list(model_id, rddid: list[int]) -> Any:
     """
-    Retrieve hourly timeseries data for a specific variable from an EnergyPlus model.
+    Retrieve timeseries data for specific variables from an EnergyPlus model.
 
-    Extracts complete hourly timeseries data for a specific variable using its
-    RDD (Report Data Dictionary) ID, providing timestamped values for analysis.
+    Extracts complete timeseries data for variables of any reporting frequency (timestep,
+    hourly, daily, monthly, run period) using their RDD (Report Data Dictionary) IDs,
+    providing timestamped values for analysis. Each timestamp is the start of its interval.
 
     Args:
         model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
@@ -530,45 +679,361 @@ def get_timeseries_report_by_rddid_list(model_id, rddid: list[int]) -> Any:
         First use get_sql_available_hourlies to find the RDD ID for 'Zone Air Temperature',
         then use that ID with this tool.
     """
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(model_id)
 
 
-    resultlist = []
     for rdd in rddid:
         # Validate RDD ID
         if not isinstance(rdd, int) or rdd <= 0:
             raise ValueError(f"Invalid RDD ID: {rdd}. Must be a positive integer.")
-        rdf = model.sql_data.get_timeseries().getseries_by_record_id(rdd)
-        resultlist.append(rdf)
 
-    dflist = []
-    for r in resultlist:
-        tr = r[0]
+    dff = model.sql_data.get_timeseries().getseries_wide(rddid)
+    log_mcp_call(
+        'get_timeseries_report_by_rddid',
+        dff,
+        kwargs={
+            'model_id': model_id,
+            'rddid': rddid,
+        }
+    )
+    return dff
 
-        r_lbl = f'{tr['KeyValue']}-{tr['Name']}-{tr['TimestepType']}-{tr['Units']}'
 
-        dfr = pd.DataFrame(r)
-        dfr = dfr.set_index('dt')
+@mcp.tool()
+def get_timeseries_by_rddid(model_id: str, rddid: int, as_records: bool = False) -> dict | list[dict]:
+    """
+    Retrieve one timeseries variable from an EnergyPlus model in a compact form.
 
-        dfr.name = r_lbl
-        dfr = dfr.rename({"Value": r_lbl}, axis=1)
+    The variable's metadata is returned once, with the timestamps and values as two
+    parallel lists, which is much smaller than one record per timestep.
 
-        dflist.append(dfr[r_lbl])
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        rddid: The RDD ID (integer) of the variable (obtain from get_sql_available_hourlies).
+        as_records: Return one record per timestep (dt, KeyValue, Name, Units, ..., Value) instead.
+                    Only use this when the records form is really needed.
+
+    Returns:
+        Dictionary with:
+        - metadata: the variable's ReportDataDictionary record (KeyValue, Name, ReportingFrequency, Units, ...)
+        - dt: start of each interval ('YYYY-MM-DDTHH:MM:SS')
+        - values: the values, in the order of dt
+    """
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+
+    series = model.sql_data.get_timeseries().get_series(rddid)
+    result = series.to_records() if as_records else series.to_dict()
 
-    dff = pd.concat(dflist, axis=1)
     log_mcp_call(
-        'get_timeseries_report_by_rddid',
-        dff,
+        'get_timeseries_by_rddid',
+        result,
         kwargs={
             'model_id': model_id,
             'rddid': rddid,
+            'as_records': as_records
         }
     )
-    return dff
+    return result
+
+
+@mcp.tool()
+def get_timeseries_across_models(
+    variable_name: str,
+    key_value: str | None = None,
+    frequency: str = 'Hourly',
+    model_ids: list[str] | None = None,
+    model_filter: str | None = None,
+    by: str | None = None,
+    how: str = 'sum'
+) -> dict:
+    """
+    Retrieve the same timeseries variable or meter from many models at once, aligned by time.
+
+    Use this to compare runs of a parametric study, e.g. 'Electricity:Facility' for every
+    prototype and climate variant. The variable is found by name (and key) in each model's
+    SQL file, and the files are read in parallel.
+
+    Args:
+        variable_name: Variable or meter name (e.g. 'Electricity:Facility', 'Zone Mean Air Temperature').
+        key_value: Zone, surface or equipment name; may be omitted for meters and other single-key names.
+        frequency: Reporting frequency ('Hourly', 'timestep', 'daily', 'monthly', 'runperiod').
+        model_ids: Models to compare (obtain from get_available_models).
+        model_filter: Search pattern selecting the models instead, as in search_models. Every model
+                      with a SQL file if neither model_ids nor model_filter is given.
+        by: Aggregate each run's values by 'month', 'day', 'hour' or 'all' instead of returning every
+            timestep. Recommended for many models or sub-daily data.
+        how: Aggregation for 'by': 'sum', 'mean', 'min' or 'max'.
+
+    Returns:
+        Dictionary with:
+        - dt: timestamps (start of each interval), or 'group' with the month/day/hour when 'by' is given
+        - values: {model_id: list of values in the order of dt / group, null where a run has no value}
+        - missing: {model_id: reason} for models without this variable or without a readable SQL file
+    """
+    if by not in (None, 'month', 'day', 'hour', 'all'):
+        raise ValueError(f"Unknown grouping '{by}'. Use 'month', 'day', 'hour' or 'all'")
+    if how not in ('sum', 'mean', 'min', 'max'):
+        raise ValueError(f"Unknown aggregation '{how}'. Use 'sum', 'mean', 'min' or 'max'")
+
+    model_map = get_resident_model_map(_get_current_directory())
+    sql_files = model_map.get_sql_files(model_ids=model_ids, pattern=model_filter)
+    missing = {x: 'no SQL file' for x in (model_ids or []) if x not in sql_files}
+
+    df = align_series(sql_files, variable_name, key=key_value, frequency=frequency)
+    missing.update(df.attrs['missing'])
+
+    if by is None:
+        result = {'dt': df.index.strftime('%Y-%m-%d %H:%M:%S').tolist()}
+    else:
+        groups = {
+            'month': df.index.month,
+            'day': df.index.strftime('%m-%d'),
+            'hour': df.index.hour,
+            'all': np.zeros(len(df), dtype=int),
+        }[by]
+        df = df.groupby(groups).agg(how)
+        result = {'group': ['all'] if by == 'all' else df.index.tolist()}
+    result['values'] = {column: df[column].astype(object).where(df[column].notna(), None).tolist()
+                        for column in df.columns}
+    result['missing'] = missing
+
+    log_mcp_call(
+        'get_timeseries_across_models',
+        result,
+        kwargs={
+            'variable_name': variable_name,
+            'key_value': key_value,
+            'frequency': frequency,
+            'model_ids': model_ids,
+            'model_filter': model_filter,
+            'by': by,
+            'how': how
+        }
+    )
+    return result
 
 
 
+@mcp.tool()
+def get_series_summary(
+    model_id: str,
+    name_filter: str | None = None,
+    key_filter: str | None = None,
+    frequency: str = 'all',
+    nonzero_only: bool = False,
+    sort_by: str = 'max',
+    descending: bool = True,
+    limit: int = 50
+) -> list[dict]:
+    """
+    Rank and filter the timeseries variables of a model by precomputed summary statistics.
+
+    Answers questions like "which zones have the highest peak temperature" or "which meters
+    are nonzero" without extracting any series. Statistics are computed once per SQL file
+    and cached.
+
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        name_filter: Case-insensitive substring of the variable name (e.g. 'Zone Air Temperature').
+        key_filter: Case-insensitive substring of the key value (zone, surface, equipment name).
+        frequency: Reporting frequency ('Hourly', 'timestep', 'daily', 'monthly', 'runperiod', ...) or 'all'.
+        nonzero_only: Only return variables with at least one nonzero value.
+        sort_by: Statistic to sort by: 'max', 'min', 'mean', 'sum', 'count' or 'zero_fraction'.
+        descending: Sort from the largest value.
+        limit: Maximum number of variables to return.
+
+    Returns:
+        List of records with the variable's RDD ID (ReportDataDictionaryIndex), KeyValue, Name,
+        ReportingFrequency and Units, and count, sum, mean, min, max, max_dt (time of the peak)
+        and zero_fraction (share of values equal to 0).
+    """
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+
+    result = model.sql_data.get_timeseries().query_summary(
+        name=name_filter,
+        key=key_filter,
+        frequency=frequency,
+        nonzero=nonzero_only,
+        sort_by=sort_by,
+        descending=descending,
+        limit=limit
+    )
+
+    log_mcp_call(
+        'get_series_summary',
+        result,
+        kwargs={
+            'model_id': model_id,
+            'name_filter': name_filter,
+            'key_filter': key_filter,
+            'frequency': frequency,
+            'nonzero_only': nonzero_only,
+            'sort_by': sort_by,
+            'descending': descending,
+            'limit': limit
+        }
+    )
+    return result
+
+
+@mcp.tool()
+def get_timeseries_page(model_id: str, rddid: list[int], after: int = 0, page_rows: int = 5000) -> dict:
+    """
+    Retrieve timeseries data one page at a time, for extracts too large for a single response.
+
+    Call first with after=0, then keep calling with the returned 'next_after' until it is null.
+    Rows are in time order, with the requested variables interleaved.
+
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        rddid: A list of RDD IDs (integers) for the desired variables (obtain from get_sql_available_hourlies).
+        after: Position to continue from: 0 for the first page, then the previous page's 'next_after'.
+        page_rows: Rows per page (1 to 50000).
+
+    Returns:
+        Dictionary with:
+        - labels: {rddid: '<KeyValue>-<Name>-<TimestepType>-<Units>'}
+        - records: list of {dt, rddid, Value}
+        - next_after: value to pass as 'after' for the next page, or null after the last page
+    """
+    if not 1 <= page_rows <= 50000:
+        raise ValueError(f"page_rows must be between 1 and 50000, got {page_rows}")
+
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+    timeseries = model.sql_data.get_timeseries()
+
+    page, next_after = timeseries.read_series_page(rddid, after=after, limit=page_rows)
+    page = page.rename(columns={'ReportDataDictionaryIndex': 'rddid'})
+    page['dt'] = page['dt'].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    result = {
+        'labels': timeseries._series_labels(list(dict.fromkeys(rddid))),
+        'records': page.to_dict('records'),
+        'next_after': next_after,
+    }
+
+    log_mcp_call(
+        'get_timeseries_page',
+        result,
+        kwargs={
+            'model_id': model_id,
+            'rddid': rddid,
+            'after': after,
+            'page_rows': page_rows
+        }
+    )
+    return result
+
+
+@mcp.tool()
+def get_timeseries_aggregate(
+    model_id: str,
+    rddid: list[int],
+    by: str = 'month',
+    stats: tuple[str, ...] = ('sum', 'mean', 'min', 'max'),
+    percentiles: list[float] | None = None
+) -> list[dict]:
+    """
+    Summarize timeseries variables by month, day, hour of day or day type.
+
+    Computes the statistics on the server, so monthly totals, peaks and hourly profiles are
+    answered without transferring the full timeseries. Prefer this over
+    execute_pandas_on_timeseries for sums, means, peaks and percentiles.
+
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        rddid: A list of RDD IDs (integers) for the desired variables (obtain from get_sql_available_hourlies).
+        by: Grouping: 'month' (1-12), 'day' ('MM-DD'), 'hour' (hour of day 0-23, interval start),
+            'weekday' (day type, e.g. 'Monday', 'Holiday', 'SummerDesignDay') or 'all' (whole series).
+        stats: Any of 'count', 'sum', 'mean', 'min', 'max', 'std'. 'min' and 'max' also return the
+               timestamp of the minimum / peak as 'min_dt' / 'max_dt'.
+        percentiles: Optional percentiles (0-100), returned as 'p<value>' (e.g. [50, 95] gives 'p50', 'p95').
+
+    Returns:
+        List of records, one per variable and group:
+        - rddid, label ('<KeyValue>-<Name>-<TimestepType>-<Units>') and group
+        - the requested statistics
+
+    Example:
+        Monthly electricity totals and peak demand timestamps:
+        get_timeseries_aggregate(model_id, [179], by='month', stats=['sum', 'max'])
+    """
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+
+    result = model.sql_data.get_timeseries().aggregate(rddid, by=by, stats=stats, percentiles=percentiles)
+
+    log_mcp_call(
+        'get_timeseries_aggregate',
+        result,
+        kwargs={
+            'model_id': model_id,
+            'rddid': rddid,
+            'by': by,
+            'stats': stats,
+            'percentiles': percentiles
+        }
+    )
+    return result
+
+
+@mcp.tool()
+def get_meter_rollup(
+    model_id: str,
+    by: str = 'annual',
+    fuel: str | None = None,
+    end_use: str | None = None,
+    level: str | None = None
+) -> dict:
+    """
+    Totals, peaks and fuel / end-use splits of every meter of a model, in one call.
+
+    Meter names (e.g. 'Electricity:Facility', 'InteriorLights:Electricity',
+    'General:InteriorLights:Electricity') are parsed into resource, end use and subcategory,
+    and all meters are summarized together on the server, once per SQL file. Prefer this over
+    extracting meters one by one for energy use, end-use breakdowns and peak demand.
+
+    Args:
+        model_id: The model_id of the EnergyPlus model (obtain from get_available_models).
+        by: 'annual' for one record per meter, or 'month' for one record per meter and month.
+        fuel: Only meters of this resource (e.g. 'Electricity', 'NaturalGas', 'DistrictCooling').
+        end_use: Only meters of this end use (e.g. 'InteriorLights', 'Heating', 'Fans').
+        level: Only meters of this level: 'facility' (e.g. Electricity:Facility), 'group'
+               (Building, HVAC, Plant or Zone meters), 'end_use', 'subcategory' or 'custom'.
+
+    Returns:
+        Dictionary with:
+        - meters: records with Name, resource, end_use, subcategory, zone, level, Units and
+          annual / peak / peak_dt / peak_w (peak demand in W for energy meters),
+          or month / sum / max / max_dt when by='month'
+        - fuel_split: {resource: share of site energy}
+        - end_use_split: {resource: {end use: share of that resource}}
+        - environments: the environments summarized: the weather file run periods, or every
+          environment (design days) for a sizing-only run
+    """
+    model_map = get_resident_model_map(_get_current_directory())
+    model = model_map.get_model_by_id(model_id)
+
+    result = model.sql_data.get_timeseries().query_meters(fuel=fuel, end_use=end_use, level=level, by=by)
+
+    log_mcp_call(
+        'get_meter_rollup',
+        result,
+        kwargs={
+            'model_id': model_id,
+            'by': by,
+            'fuel': fuel,
+            'end_use': end_use,
+            'level': level
+        }
+    )
+    return result
+
+
 @mcp.tool()
 def get_usage_instructions() -> str:
     """
@@ -659,7 +1124,7 @@ def search_html_tables_by_keyword(id: str, keywords: list[str], case_sensitive:
          'schedule', 'internal load', 'plug load']
     """
 
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
 
     # Get all table data
@@ -781,28 +1246,12 @@ def execute_pandas_on_timeseries(model_id: str, rddid: list[int], query: str) ->
     """
 
     # Get the timeseries data
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(model_id)
 
 
 
-    resultlist = []
-    for rdd in rddid:
-        rdf = model.sql_data.get_timeseries().getseries_by_record_id(rdd)
-        resultlist.append(rdf)
-
-    dflist = []
-    for r in resultlist:
-        tr = r[0]
-        r_lbl = f'{tr['KeyValue']}-{tr['Name']}-{tr['TimestepType']}-{tr['Units']}'
-        dfr = pd.DataFrame(r)
-        dfr = dfr.set_index('dt')
-        dfr.name = r_lbl
-        dfr = dfr.rename({"Value": r_lbl}, axis=1)
-
-        dflist.append(dfr[r_lbl])
-
-    df = pd.concat(dflist, axis=1)
+    df = model.sql_data.get_timeseries().getseries_wide(rddid)
 
 
     # Convert datetime if present
@@ -853,26 +1302,10 @@ def execute_multiline_pandas_on_timeseries(model_id: str, rddid: list[int], code
     """
 
     # Get the timeseries data
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(model_id)
 
-    resultlist = []
-    for rdd in rddid:
-        rdf = model.sql_data.get_timeseries().getseries_by_record_id(rdd)
-        resultlist.append(rdf)
-
-    dflist = []
-    for r in resultlist:
-        tr = r[0]
-        r_lbl = f'{tr['KeyValue']}-{tr['Name']}-{tr['TimestepType']}-{tr['Units']}'
-        dfr = pd.DataFrame(r)
-        dfr = dfr.set_index('dt')
-        dfr.name = r_lbl
-        dfr = dfr.rename({"Value": r_lbl}, axis=1)
-
-        dflist.append(dfr[r_lbl])
-
-    df = pd.concat(dflist, axis=1)
+    df = model.sql_data.get_timeseries().getseries_wide(rddid)
 
 
     # Execute the code
@@ -919,7 +1352,7 @@ def execute_pandas_on_html_table(id: str, query_tuple: tuple, query: str) -> str
     """
 
     # Get the HTML table data
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
     table_data = model.html_data.get_table_by_tuple(query_tuple, asjson=False)
 
@@ -986,7 +1419,7 @@ def execute_multiline_pandas_on_html_table(id: str, query_tuple: tuple, code: st
     """
 
     # Get the HTML table data
-    model_map = read_or_initialize_model_map(_get_current_directory(), CACHE_PICKLE)
+    model_map = get_resident_model_map(_get_current_directory())
     model = model_map.get_model_by_id(id)
     table_data = model.html_data.get_table_by_tuple(query_tuple, asjson=False)
 
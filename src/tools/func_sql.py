@@ -6,11 +6,25 @@ import glob as gb
 import os
 import sys
 import sqlite3
+import json
+import bisect
+import fnmatch
+import hashlib
+import itertools
+import threading
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from pydantic import BaseModel
 
+from src import SQL_COLUMNAR_MODE, SQL_ROW_INDEX_MODE, SERIES_CHUNK_BYTES, SERIES_READ_WORKERS
+from src.cache import ShardedCache, cached_artifact, get_default_cache, stat_fingerprint
+from src.connections import get_connection_pool
+
 STRTYPEIDX = {
     1: 'ReportName',
     2: 'ReportForString',
@@ -21,41 +35,1023 @@ STRTYPEIDX = {
 }
 
 
+# ReportingFrequency values of ReportDataDictionary, by the (lowercase) names accepted for them
+REPORTING_FREQUENCIES = {
+    'detailed': 'HVAC System Timestep',
+    'hvac system timestep': 'HVAC System Timestep',
+    'timestep': 'Zone Timestep',
+    'zone timestep': 'Zone Timestep',
+    'hourly': 'Hourly',
+    'daily': 'Daily',
+    'monthly': 'Monthly',
+    'runperiod': 'Run Period',
+    'run period': 'Run Period',
+    'environment': 'Run Period',
+    'annual': 'Annual',
+}
+
+# ids per "IN (...)" query, below SQLite's default limit on bound parameters
+SQL_MAX_VARIABLES = 900
+
+# approximate memory per row while a chunk is fetched (a Python tuple of int, int, float plus arrays)
+SERIES_ROW_BYTES = 160
+
+# format versions of the parsed-artifact shards (see cached_artifact()); bump when a loader's output changes
+DICTIONARY_VERSION = 2  # 2: ordered by ReportDataDictionaryIndex
+SERIES_SUMMARY_VERSION = 1
+METER_ROLLUP_VERSION = 2  # 2: run periods only, 'environments'
+TABULAR_INDEX_VERSION = 1
+
+# time indexes by (sql file, stat fingerprint), shared across SqlTimeseries instances
+_time_index_cache = OrderedDict()
+_time_index_lock = threading.Lock()
+TIME_INDEX_CACHE_SIZE = 32
+
+
+def normalize_frequency(frequency: str | None) -> str | None:
+    """
+    Return the ReportDataDictionary ReportingFrequency for a frequency name.
+
+    Args:
+        frequency (str | None): 'Hourly', 'timestep', 'detailed', 'daily', 'monthly', 'runperiod',
+                                'annual' (any case), or None / 'all' for every frequency.
+
+    Returns:
+        str | None: The ReportingFrequency value, or None for every frequency.
+    """
+    if frequency is None or frequency.strip().lower() == 'all':
+        return None
+    try:
+        return REPORTING_FREQUENCIES[frequency.strip().lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown reporting frequency {frequency!r}; expected one of "
+            f"{sorted(set(REPORTING_FREQUENCIES.values()))} or 'all'"
+        )
+
+
+def build_time_index(timedf: pd.DataFrame, year: int = 1900) -> np.ndarray:
+    """
+    Turn the Month/Day/Hour/Minute/Interval columns of the SQL Time table into datetimes.
+
+    EnergyPlus reports the end of each interval: hourly rows have Minute 0 and Hour 1-24,
+    sub-hourly rows have Hour 1-24 and Minute 1-60 within that hour. Each row is labelled
+    with the start of its interval, so hourly data runs from 00:00 to 23:00. All rows get
+    the same year (the Year column is 0 for design days and typical-year runs).
+
+    Args:
+        timedf (pd.DataFrame): Rows of the Time table.
+        year (int): Year for every datetime.
+
+    Returns:
+        np.ndarray: datetime64[ns] values, NaT for rows without a month or day (e.g. run period rows).
+    """
+    columns = {}
+    for col in ['Month', 'Day', 'Hour', 'Minute', 'Interval']:
+        columns[col] = pd.to_numeric(timedf[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+    valid = ~(np.isnan(columns['Month']) | np.isnan(columns['Day']))
+    month, day, hour, minute, interval = (np.nan_to_num(columns[col]).astype('int64') for col in columns)
+
+    end_minutes = np.where(minute == 0, hour * 60, (hour - 1) * 60 + minute)
+    start_minutes = end_minutes - interval
+
+    months = np.datetime64(f'{year:04d}-01', 'M') + (month - 1).clip(min=0)
+    days = months.astype('datetime64[D]') + (day - 1).clip(min=0)
+    dt = days.astype('datetime64[m]') + start_minutes.astype('timedelta64[m]')
+
+    dt = dt.astype('datetime64[ns]')
+    dt[~valid] = np.datetime64('NaT', 'ns')
+    return dt
+
+
+def _load_time_index(sql_file: str, read_time_table) -> tuple[pd.DataFrame, np.ndarray]:
+    key = (os.path.abspath(sql_file), stat_fingerprint(sql_file))
+    with _time_index_lock:
+        cached = _time_index_cache.get(key)
+        if cached is not None:
+            _time_index_cache.move_to_end(key)
+            return cached
+
+    timedf = read_time_table()
+    timedf['dt'] = build_time_index(timedf)
+
+    # datetimes by TimeIndex, so a series' times are one array lookup instead of a merge
+    time_index = timedf['TimeIndex'].to_numpy(dtype='int64')
+    lookup = np.full(int(time_index.max()) + 1 if len(time_index) else 0, np.datetime64('NaT', 'ns'), dtype='datetime64[ns]')
+    lookup[time_index] = timedf['dt'].to_numpy()
+
+    with _time_index_lock:
+        _time_index_cache[key] = (timedf, lookup)
+        while len(_time_index_cache) > TIME_INDEX_CACHE_SIZE:
+            _time_index_cache.popitem(last=False)
+    return timedf, lookup
+
+
+def get_time_index(sql_file: str, read_time_table) -> pd.DataFrame:
+    """
+    Return the time index DataFrame for a SQL file, building it on first use.
+
+    Cached per file and stat fingerprint, so all series of a file share one time index and
+    a rewritten file gets a new one.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        read_time_table (callable): Returns the Time table rows to index when not cached.
+
+    Returns:
+        pd.DataFrame: The Time table rows with an added 'dt' column.
+    """
+    return _load_time_index(sql_file, read_time_table)[0]
+
+
+def get_time_lookup(sql_file: str, read_time_table) -> np.ndarray:
+    """
+    Return the datetimes of a SQL file's Time table as an array indexed by TimeIndex.
+
+    Shares the cache of get_time_index(). TimeIndex values missing from the table are NaT.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        read_time_table (callable): Returns the Time table rows to index when not cached.
+
+    Returns:
+        np.ndarray: datetime64[ns] array, where lookup[TimeIndex] is that row's datetime.
+    """
+    return _load_time_index(sql_file, read_time_table)[1]
+
+
+def lookup_times(lookup: np.ndarray, time_index) -> np.ndarray:
+    """
+    Map TimeIndex values to datetimes with a lookup array from get_time_lookup().
+
+    Args:
+        lookup (np.ndarray): Lookup array from get_time_lookup().
+        time_index (array-like): TimeIndex values.
+
+    Returns:
+        np.ndarray: datetime64[ns] values, NaT for TimeIndex values not in the Time table.
+    """
+    time_index = np.asarray(time_index, dtype='int64')
+    inside = (time_index >= 0) & (time_index < len(lookup))
+    if inside.all():
+        return lookup[time_index]
+    dt = np.full(len(time_index), np.datetime64('NaT', 'ns'), dtype='datetime64[ns]')
+    dt[inside] = lookup[time_index[inside]]
+    return dt
+
+
+AGGREGATE_GROUPS = ('month', 'day', 'hour', 'weekday', 'all')
+AGGREGATE_STATS = ('count', 'sum', 'mean', 'min', 'max', 'std')
+
+
+def aggregate_values(values: np.ndarray, codes: np.ndarray, n_groups: int, stats, percentiles, times: np.ndarray) -> dict:
+    """
+    Grouped statistics of an array in a few vectorized passes.
+
+    Values are sorted once by (group, value), so each group is a sorted contiguous run:
+    min, max and percentiles are read at its ends or interpolated inside it, and the
+    min / max timestamps come from the same positions.
+
+    Args:
+        values (np.ndarray): Values to summarize.
+        codes (np.ndarray): Group of each value, 0 to n_groups - 1; every group has a value.
+        n_groups (int): Number of groups.
+        stats (list[str]): Statistics (see AGGREGATE_STATS).
+        percentiles (list[float]): Percentiles (0-100), interpolated linearly like np.percentile.
+        times (np.ndarray): Timestamp of each value, for 'min_dt' and 'max_dt'.
+
+    Returns:
+        dict: {statistic: array with one value per group}, in the order requested.
+    """
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+    starts = np.searchsorted(sorted_codes, np.arange(n_groups), side='left')
+    stops = np.searchsorted(sorted_codes, np.arange(n_groups), side='right')
+    count = stops - starts
+
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    mean = sums / count
+    result = {}
+    for name in stats:
+        if name == 'count':
+            result['count'] = count
+        elif name == 'sum':
+            result['sum'] = sums
+        elif name == 'mean':
+            result['mean'] = mean
+        elif name == 'min':
+            result['min'] = sorted_values[starts]
+            result['min_dt'] = times[order[starts]]
+        elif name == 'max':
+            # the sort is stable, so a group's equal maxima are in time order: report the first, like idxmax()
+            peak = sorted_values[stops - 1]
+            at_peak = np.flatnonzero(sorted_values == peak[sorted_codes])
+            first_peak = at_peak[np.searchsorted(at_peak, starts)]
+            result['max'] = peak
+            result['max_dt'] = times[order[first_peak]]
+        elif name == 'std':
+            squares = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=n_groups)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result['std'] = np.sqrt(squares / (count - 1))
+    for p in percentiles:
+        position = starts + (count - 1) * p / 100
+        lower = np.floor(position).astype('int64')
+        upper = np.minimum(lower + 1, stops - 1)
+        fraction = position - lower
+        result[f'p{p:g}'] = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+    return result
+
+
+# resources (fuels) of EnergyPlus meter names, by lower-case name
+METER_RESOURCES = {x.lower(): x for x in [
+    'Electricity', 'ElectricityProduced', 'ElectricityPurchased', 'ElectricitySurplusSold', 'ElectricityNet',
+    'NaturalGas', 'Gas', 'Gasoline', 'Diesel', 'Coal', 'FuelOilNo1', 'FuelOilNo2', 'FuelOil#1', 'FuelOil#2',
+    'Propane', 'OtherFuel1', 'OtherFuel2', 'DistrictCooling', 'DistrictHeating', 'DistrictHeatingWater',
+    'DistrictHeatingSteam', 'Steam', 'Water', 'MainsWater', 'RainWater', 'WellWater', 'OnSiteWater',
+    'Condensate', 'EnergyTransfer', 'SolarWater', 'SolarAir', 'CarbonEquivalent',
+]}
+# 'Electricity:Facility' is the whole site; 'Electricity:Building' etc. are groups of it
+METER_GROUPS = {x.lower(): x for x in ['Facility', 'Building', 'HVAC', 'Plant', 'System']}
+# 'InteriorLights:Electricity:Zone:CORE_ZN' etc. are a meter restricted to one zone, space type or space
+METER_ZONE_SCOPES = {x.lower(): x for x in ['Zone', 'SpaceType', 'Space']}
+# resources whose totals are not site energy, left out of fuel splits
+NON_ENERGY_RESOURCES = {'ElectricityProduced', 'ElectricitySurplusSold', 'ElectricityNet', 'EnergyTransfer',
+                        'Water', 'MainsWater', 'RainWater', 'WellWater', 'OnSiteWater', 'Condensate',
+                        'CarbonEquivalent'}
+# reporting frequencies, finest first
+FREQUENCY_ORDER = ['HVAC System Timestep', 'Zone Timestep', 'Hourly', 'Daily', 'Monthly', 'Run Period', 'Annual']
+# EnvironmentPeriods.EnvironmentType of weather file run periods (1 and 2 are design days and design run periods)
+RUN_PERIOD_ENVIRONMENT = 3
+
+
+def parse_meter_name(name: str) -> dict:
+    """
+    Split an EnergyPlus meter name into its place in the resource / end-use hierarchy.
+
+    Recognized forms (case-insensitive):
+    - '<Resource>:Facility', '<Resource>:Building' / HVAC / Plant / System: level 'facility' / 'group'
+    - '<EndUse>:<Resource>', e.g. 'InteriorLights:Electricity': level 'end_use'
+    - '<Subcategory>:<EndUse>:<Resource>', e.g. 'General:InteriorLights:Electricity': level 'subcategory'
+    - any of these followed by ':Zone:<name>' (or ':SpaceType:', ':Space:'), which sets 'zone'
+    Anything else (custom meters) is level 'custom'.
+
+    Args:
+        name (str): Meter name, the ReportDataDictionary Name of a meter.
+
+    Returns:
+        dict: level, resource, group, end_use, subcategory and zone (None where not applicable).
+    """
+    parsed = {'level': 'custom', 'resource': None, 'group': None, 'end_use': None, 'subcategory': None, 'zone': None}
+    tokens = [x.strip() for x in name.split(':')]
+    for i in range(1, len(tokens) - 1):
+        if tokens[i].lower() in METER_ZONE_SCOPES:
+            parsed['zone'] = ':'.join(tokens[i + 1:])
+            tokens = tokens[:i]
+            break
+
+    lower = [x.lower() for x in tokens]
+    if len(tokens) == 1 and parsed['zone'] is not None and lower[0] in METER_RESOURCES:
+        parsed.update(level='group', resource=METER_RESOURCES[lower[0]], group='Zone')
+    elif len(tokens) == 2 and lower[0] in METER_RESOURCES and lower[1] in METER_GROUPS:
+        group = METER_GROUPS[lower[1]]
+        parsed.update(level='facility' if group == 'Facility' else 'group', resource=METER_RESOURCES[lower[0]], group=group)
+    elif len(tokens) == 2 and lower[1] in METER_RESOURCES:
+        parsed.update(level='end_use', resource=METER_RESOURCES[lower[1]], end_use=tokens[0])
+    elif len(tokens) == 3 and lower[2] in METER_RESOURCES:
+        parsed.update(level='subcategory', resource=METER_RESOURCES[lower[2]], end_use=tokens[1], subcategory=tokens[0])
+    return parsed
+
+
+REPORT_DATA_SCHEMA = pa.schema([
+    ('ReportDataDictionaryIndex', pa.int64()),
+    ('TimeIndex', pa.int64()),
+    ('Value', pa.float64()),
+])
+REPORT_DATA_DTYPE = [('rdd', 'int64'), ('time', 'int64'), ('value', 'float64')]
+
+# open columnar stores by (sql file, content fingerprint)
+_columnar_cache = OrderedDict()
+_columnar_lock = threading.Lock()
+COLUMNAR_CACHE_SIZE = 32
+
+
+def _column_array(table: pa.Table, name: str) -> np.ndarray:
+    column = table.column(name)
+    if column.num_chunks == 1:
+        # a view of the memory-mapped file
+        return column.chunk(0).to_numpy(zero_copy_only=False)
+    return column.to_numpy()
+
+
+class ColumnarSeriesStore:
+    """
+    The ReportData of one SQL file as memory-mapped Arrow columns, sorted by ReportDataDictionaryIndex
+    and TimeIndex, so the values of one variable are a contiguous slice found by binary search.
+    Also holds the file's Time table.
+
+    Args:
+        report_data (pa.Table): ReportDataDictionaryIndex, TimeIndex and Value columns (REPORT_DATA_SCHEMA).
+        time_table (pa.Table): The Time table.
+    """
+
+    def __init__(self, report_data: pa.Table, time_table: pa.Table):
+        self.report_data = report_data
+        self.time_table = time_table
+        self._rdd = _column_array(report_data, 'ReportDataDictionaryIndex')
+        self._time = _column_array(report_data, 'TimeIndex')
+        self._value = _column_array(report_data, 'Value')
+
+    def read(self, rddids: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the (ReportDataDictionaryIndex, TimeIndex, Value) arrays of some variables.
+        """
+        rdd, time_index, value = [], [], []
+        for rddid in rddids:
+            start = np.searchsorted(self._rdd, rddid, side='left')
+            stop = np.searchsorted(self._rdd, rddid, side='right')
+            rdd.append(np.full(stop - start, rddid, dtype='int64'))
+            time_index.append(self._time[start:stop])
+            value.append(self._value[start:stop])
+        if not rdd:
+            return np.empty(0, 'int64'), np.empty(0, 'int64'), np.empty(0, 'float64')
+        return np.concatenate(rdd), np.concatenate(time_index), np.concatenate(value)
+
+    def iter_rows(self, chunk_rows: int):
+        """
+        Yield every row as (ReportDataDictionaryIndex, TimeIndex, Value) array slices of up to chunk_rows.
+        """
+        for start in range(0, len(self._value), chunk_rows):
+            stop = start + chunk_rows
+            yield self._rdd[start:stop], self._time[start:stop], self._value[start:stop]
+
+
+def summarize_report_data(chunks, size: int) -> dict:
+    """
+    Per-variable statistics of ReportData in a single pass over its rows.
+
+    Each chunk is sorted once by (variable, descending value): the first row of a variable
+    is its chunk maximum and the last its minimum, which are merged into running arrays
+    indexed by ReportDataDictionaryIndex. Counts, sums and zero counts are bincounts.
+
+    Args:
+        chunks (iterable): (ReportDataDictionaryIndex, TimeIndex, Value) array triples.
+        size (int): One more than the largest ReportDataDictionaryIndex to keep.
+
+    Returns:
+        dict: Arrays indexed by ReportDataDictionaryIndex: count, sum, zeros, min, max and
+              max_time (TimeIndex of the first maximum).
+    """
+    count = np.zeros(size, dtype='int64')
+    sums = np.zeros(size)
+    zeros = np.zeros(size, dtype='int64')
+    mins = np.full(size, np.inf)
+    maxs = np.full(size, -np.inf)
+    max_time = np.zeros(size, dtype='int64')
+
+    for rdd, time_index, value in chunks:
+        keep = (rdd >= 0) & (rdd < size)
+        if not keep.all():
+            rdd, time_index, value = rdd[keep], time_index[keep], value[keep]
+        if not len(rdd):
+            continue
+
+        count += np.bincount(rdd, minlength=size)
+        sums += np.bincount(rdd, weights=value, minlength=size)
+        zeros += np.bincount(rdd, weights=value == 0, minlength=size).astype('int64')
+
+        # stable: equal maxima stay in row (time) order, so the first is kept
+        order = np.lexsort((-value, rdd))
+        sorted_rdd = rdd[order]
+        first = np.flatnonzero(np.r_[True, sorted_rdd[1:] != sorted_rdd[:-1]])
+        last = np.r_[first[1:] - 1, len(order) - 1]
+        ids = sorted_rdd[first]
+
+        chunk_max = value[order[first]]
+        better = chunk_max > maxs[ids]
+        maxs[ids[better]] = chunk_max[better]
+        max_time[ids[better]] = time_index[order[first]][better]
+        mins[ids] = np.minimum(mins[ids], value[order[last]])
+
+    return {'count': count, 'sum': sums, 'zeros': zeros, 'min': mins, 'max': maxs, 'max_time': max_time}
+
+
+def _columnar_key(sql_file: str) -> str:
+    return hashlib.sha1(os.path.abspath(sql_file).encode('utf-8')).hexdigest()
+
+
+def _is_fresh(table: pa.Table | None, fingerprint: str) -> bool:
+    if table is None:
+        return False
+    return (table.schema.metadata or {}).get(b'source_fingerprint') == fingerprint.encode('utf-8')
+
+
+def build_columnar_store(sql_file: str, conn: sqlite3.Connection, cache: ShardedCache | None = None) -> ColumnarSeriesStore:
+    """
+    Convert the ReportData and Time tables of a SQL file to Arrow tables in the cache.
+
+    The tables are stamped with the SQL file's content fingerprint, so a copy that no longer
+    matches the file is ignored by get_columnar_store().
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        conn (sqlite3.Connection): Connection to the SQL file.
+        cache (ShardedCache | None): Cache to write to; defaults to get_default_cache().
+
+    Returns:
+        ColumnarSeriesStore: The new store, memory-mapped from the cache.
+    """
+    cache = cache or get_default_cache()
+    fingerprint = cache.content_fingerprint(sql_file)
+    if fingerprint is None:
+        raise FileNotFoundError(sql_file)
+    metadata = {'source_fingerprint': fingerprint, 'source_file': os.path.abspath(sql_file)}
+    key = _columnar_key(sql_file)
+    print(f'converting ReportData to columnar store: {sql_file}', file=sys.stderr)
+
+    cursor = conn.cursor()
+    cursor.execute(
+        'SELECT "ReportDataDictionaryIndex", "TimeIndex", "Value" FROM "ReportData" '
+        'ORDER BY "ReportDataDictionaryIndex", "TimeIndex"'
+    )
+    parts = []
+    while rows := cursor.fetchmany(1 << 18):
+        parts.append(np.array(rows, dtype=REPORT_DATA_DTYPE))
+    data = np.concatenate(parts) if parts else np.empty(0, dtype=REPORT_DATA_DTYPE)
+
+    report_data = pa.Table.from_arrays(
+        [pa.array(data['rdd']), pa.array(data['time']), pa.array(data['value'])],
+        schema=REPORT_DATA_SCHEMA.with_metadata(metadata)
+    )
+    time_table = pa.Table.from_pandas(pd.read_sql('SELECT * FROM Time', conn), preserve_index=False)
+    time_table = time_table.replace_schema_metadata(metadata)
+
+    cache.write_table('sql_time', key, time_table)
+    cache.write_table('sql_report_data', key, report_data)
+    return ColumnarSeriesStore(cache.read_table('sql_report_data', key), cache.read_table('sql_time', key))
+
+
+def get_columnar_store(sql_file: str, build: bool = False, cache: ShardedCache | None = None) -> ColumnarSeriesStore | None:
+    """
+    Return the columnar store of a SQL file if one matches the file's current contents.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        build (bool): Convert the file if there is no up-to-date store. Skipped (returning None)
+                      while another process is converting the same file.
+        cache (ShardedCache | None): Cache holding the stores; defaults to get_default_cache().
+
+    Returns:
+        ColumnarSeriesStore | None: The store, or None to read from SQLite instead.
+    """
+    cache = cache or get_default_cache()
+    fingerprint = cache.content_fingerprint(sql_file)
+    if fingerprint is None:
+        return None
+
+    memo_key = (os.path.abspath(sql_file), fingerprint)
+    with _columnar_lock:
+        store = _columnar_cache.get(memo_key)
+        if store is not None:
+            _columnar_cache.move_to_end(memo_key)
+            return store
+
+    key = _columnar_key(sql_file)
+    report_data = cache.read_table('sql_report_data', key)
+    time_table = cache.read_table('sql_time', key)
+    if (_is_fresh(report_data, fingerprint) and _is_fresh(time_table, fingerprint)
+            and report_data.schema.remove_metadata().equals(REPORT_DATA_SCHEMA)):
+        store = ColumnarSeriesStore(report_data, time_table)
+    elif build:
+        lock = cache.lock(sql_file)
+        if not lock.acquire(blocking=False):
+            return None
+        try:
+            with get_connection_pool().connection(sql_file) as conn:
+                store = build_columnar_store(sql_file, conn, cache)
+        finally:
+            lock.release()
+    else:
+        return None
+
+    with _columnar_lock:
+        _columnar_cache[memo_key] = store
+        while len(_columnar_cache) > COLUMNAR_CACHE_SIZE:
+            _columnar_cache.popitem(last=False)
+    return store
+
+
+
+ROW_INDEX_SCHEMA = pa.schema([
+    ('ReportDataDictionaryIndex', pa.int64()),
+    ('ReportDataIndex', pa.int64()),
+])
+
+# open row indexes by (sql file, content fingerprint); False for files with their own index
+_row_index_cache = OrderedDict()
+
+
+class ReportDataRowIndex:
+    """
+    Sidecar index of a SQL file's ReportData: the ReportDataIndex (rowid) of every row, sorted by
+    ReportDataDictionaryIndex and then rowid, so the rows of one variable are a contiguous slice
+    found by binary search. EnergyPlus does not index ReportData by variable; with the rowids,
+    a variable is read by primary key lookups instead of a scan of the whole table.
+
+    Args:
+        table (pa.Table): ReportDataDictionaryIndex and ReportDataIndex columns (ROW_INDEX_SCHEMA).
+    """
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self._rdd = _column_array(table, 'ReportDataDictionaryIndex')
+        self._rowid = _column_array(table, 'ReportDataIndex')
+
+    def rowids(self, rddids: list[int]) -> np.ndarray:
+        """
+        Return the rowids of some variables' rows, in time order within each variable.
+        """
+        parts = [self._rowid[np.searchsorted(self._rdd, rddid, side='left'):np.searchsorted(self._rdd, rddid, side='right')]
+                 for rddid in rddids]
+        return np.concatenate(parts) if parts else np.empty(0, dtype='int64')
+
+
+def has_variable_index(conn: sqlite3.Connection) -> bool:
+    """
+    Whether ReportData has an index whose first column is ReportDataDictionaryIndex.
+    """
+    for index in conn.execute('PRAGMA index_list("ReportData")').fetchall():
+        columns = conn.execute(f'PRAGMA index_info("{index[1]}")').fetchall()
+        if columns and columns[0][2] == 'ReportDataDictionaryIndex':
+            return True
+    return False
+
+
+def build_row_index(sql_file: str, conn: sqlite3.Connection, cache: ShardedCache | None = None) -> ReportDataRowIndex:
+    """
+    Build the sidecar row index of a SQL file and store it in the cache. The SQL file is not modified.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        conn (sqlite3.Connection): Connection to the SQL file.
+        cache (ShardedCache | None): Cache to write to; defaults to get_default_cache().
+
+    Returns:
+        ReportDataRowIndex: The new index, memory-mapped from the cache.
+    """
+    cache = cache or get_default_cache()
+    fingerprint = cache.content_fingerprint(sql_file)
+    if fingerprint is None:
+        raise FileNotFoundError(sql_file)
+    metadata = {'source_fingerprint': fingerprint, 'source_file': os.path.abspath(sql_file)}
+    print(f'indexing ReportData rows: {sql_file}', file=sys.stderr)
+
+    first, last, count = conn.execute('SELECT MIN("ReportDataIndex"), MAX("ReportDataIndex"), COUNT(*) FROM "ReportData"').fetchone()
+    dense = count == 0 or last - first + 1 == count
+    # one scan in rowid order; EnergyPlus numbers rows without gaps, so the rowid is the row position
+    columns = '"ReportDataDictionaryIndex"' if dense else '"ReportDataDictionaryIndex", "ReportDataIndex"'
+    cursor = conn.execute(f'SELECT {columns} FROM "ReportData" ORDER BY "ReportDataIndex"')
+    parts = []
+    while rows := cursor.fetchmany(1 << 18):
+        parts.append(np.fromiter(itertools.chain.from_iterable(rows), dtype='int64', count=len(rows) * (1 if dense else 2)))
+    data = np.concatenate(parts) if parts else np.empty(0, dtype='int64')
+    if dense:
+        rdd, rowid = data, np.arange(first or 0, (first or 0) + count, dtype='int64')
+    else:
+        rdd, rowid = data[0::2], data[1::2]
+    # stable, so each variable's rowids stay ascending
+    order = np.argsort(rdd, kind='stable')
+
+    table = pa.Table.from_arrays([pa.array(rdd[order]), pa.array(rowid[order])],
+                                 schema=ROW_INDEX_SCHEMA.with_metadata(metadata))
+    key = _columnar_key(sql_file)
+    cache.write_table('sql_row_index', key, table)
+    return ReportDataRowIndex(cache.read_table('sql_row_index', key))
+
+
+def get_row_index(sql_file: str, build: bool = True, cache: ShardedCache | None = None) -> ReportDataRowIndex | None:
+    """
+    Return the sidecar row index of a SQL file, building it on first use.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        build (bool): Build the index if there is no up-to-date one. Skipped (returning None)
+                      while another process is building it for the same file.
+        cache (ShardedCache | None): Cache holding the indexes; defaults to get_default_cache().
+
+    Returns:
+        ReportDataRowIndex | None: The index, or None if the file has its own index on
+                                   ReportDataDictionaryIndex or none is available.
+    """
+    cache = cache or get_default_cache()
+    fingerprint = cache.content_fingerprint(sql_file)
+    if fingerprint is None:
+        return None
+
+    memo_key = (os.path.abspath(sql_file), fingerprint)
+    with _columnar_lock:
+        row_index = _row_index_cache.get(memo_key)
+        if row_index is not None:
+            _row_index_cache.move_to_end(memo_key)
+            return row_index or None
+
+    key = _columnar_key(sql_file)
+    table = cache.read_table('sql_row_index', key)
+    if _is_fresh(table, fingerprint) and table.schema.remove_metadata().equals(ROW_INDEX_SCHEMA):
+        row_index = ReportDataRowIndex(table)
+    else:
+        with get_connection_pool().connection(sql_file) as conn:
+            if has_variable_index(conn):
+                row_index = False
+            elif not build:
+                return None
+            else:
+                lock = cache.lock(sql_file)
+                if not lock.acquire(blocking=False):
+                    return None
+                try:
+                    row_index = build_row_index(sql_file, conn, cache)
+                finally:
+                    lock.release()
+
+    with _columnar_lock:
+        _row_index_cache[memo_key] = row_index
+        while len(_row_index_cache) > COLUMNAR_CACHE_SIZE:
+            _row_index_cache.popitem(last=False)
+    return row_index or None
+
+
+def read_rows_by_rowid(conn: sqlite3.Connection, rowids: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read ReportData rows by rowid: one primary key lookup per row, SQL_MAX_VARIABLES rows per query.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the SQL file.
+        rowids (np.ndarray): ReportDataIndex values of existing rows.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: ReportDataDictionaryIndex, TimeIndex and Value arrays,
+                                                   in the order of rowids.
+    """
+    rowids = np.asarray(rowids, dtype='int64')
+    # queried in ascending order, so every chunk is one forward pass over the table's b-tree
+    order = np.argsort(rowids, kind='stable')
+    in_order = bool((order == np.arange(len(rowids))).all())
+    sorted_rowids = rowids if in_order else rowids[order]
+
+    rows = []
+    for i in range(0, len(sorted_rowids), SQL_MAX_VARIABLES):
+        chunk = sorted_rowids[i:i + SQL_MAX_VARIABLES].tolist()
+        rows += conn.execute(
+            'SELECT "ReportDataDictionaryIndex", "TimeIndex", "Value" FROM "ReportData" '
+            f'WHERE "ReportDataIndex" IN ({",".join("?" * len(chunk))}) ORDER BY "ReportDataIndex"', chunk).fetchall()
+    data = np.array(rows, dtype=REPORT_DATA_DTYPE)
+    if not in_order:
+        # the rows of repeated rowids are returned once: map each rowid to its row
+        unique_rowids = np.unique(sorted_rowids)
+        data = data[np.searchsorted(unique_rowids, rowids)]
+    return data['rdd'], data['time'], data['value']
+
+
+# ReportDataDictionary columns, in table order
+RDD_COLUMNS = [
+    'ReportDataDictionaryIndex',
+    'IsMeter',
+    'Type',
+    'IndexGroup',
+    'TimestepType',
+    'KeyValue',
+    'Name',
+    'ReportingFrequency',
+    'ScheduleName',
+    'Units'
+]
+
+
+class SeriesData(BaseModel):
+    """
+    One timeseries as arrays: float64 values, their TimeIndex, and the variable's dictionary record once.
+
+    The datetimes are not stored per series: dt looks the TimeIndex up in the file's time lookup
+    (see get_time_lookup()), which every series of the file shares. Values and TimeIndex are
+    views of the columnar store when it is used.
+
+    Attributes:
+        metadata (dict): The variable's ReportDataDictionary record (RDD_COLUMNS).
+        time_index (np.ndarray): TimeIndex of each value (int64).
+        values (np.ndarray): Values (float64), in time order.
+        lookup (np.ndarray): The file's datetime64 lookup array, indexed by TimeIndex.
+    """
+    metadata: dict
+    time_index: np.ndarray
+    values: np.ndarray
+    lookup: np.ndarray
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def rddid(self) -> int:
+        return self.metadata['ReportDataDictionaryIndex']
+
+    @property
+    def label(self) -> str:
+        """'<KeyValue>-<Name>-<TimestepType>-<Units>', the column label of getseries_wide()."""
+        m = self.metadata
+        return f"{m['KeyValue']}-{m['Name']}-{m['TimestepType']}-{m['Units']}"
+
+    @property
+    def dt(self) -> np.ndarray:
+        """datetime64[ns] start of each value's interval."""
+        return lookup_times(self.lookup, self.time_index)
+
+    def to_series(self) -> pd.Series:
+        """Return the values as a pandas Series with a datetime index, named by label."""
+        return pd.Series(self.values, index=pd.DatetimeIndex(self.dt, name='dt'), name=self.label)
+
+    def to_dict(self) -> dict:
+        """
+        Return a compact JSON-serializable form: the metadata once, and parallel dt and values lists.
+        """
+        return {
+            'metadata': dict(self.metadata),
+            'dt': np.datetime_as_string(self.dt, unit='s').tolist(),
+            'values': self.values.tolist(),
+        }
+
+    def to_records(self) -> list[dict]:
+        """
+        Return one dict per value with the metadata repeated, the form of getseries_by_record_id().
+        """
+        df = pd.DataFrame({'dt': self.dt})
+        for col in ['KeyValue', 'Name', 'TimestepType', 'IndexGroup', 'ScheduleName', 'Units',
+                    'IsMeter', 'ReportingFrequency', 'Type']:
+            df[col] = self.metadata[col]
+        df['Value'] = self.values
+        return df.to_dict('records')
+
+
+# open series indexes by (sql file, stat fingerprint)
+_series_index_cache = OrderedDict()
+_series_index_lock = threading.Lock()
+SERIES_INDEX_FIELDS = ('Name', 'KeyValue', 'Units', 'ReportingFrequency')
+WILDCARD_CHARS = '*?['
+
+
+class SeriesIndex:
+    """
+    In-memory search index over the ReportDataDictionary of one SQL file.
+
+    For each of Name, KeyValue, Units and ReportingFrequency, the lower-cased distinct values
+    are kept in a dict (value -> record positions) and a sorted list, so a pattern is matched
+    without a pass over every record:
+    - exact ('Zone Mean Air Temperature'): one dict lookup
+    - prefix ('Zone Air*'): a binary search for the range of values with the prefix
+    - wildcard ('*Heating*Energy', 'ZONE ?', shell-style as in fnmatch): the values in the range
+      of the pattern's literal prefix (every value if it starts with a wildcard) are tested
+    Matching is case-insensitive, as EnergyPlus names are.
+
+    Args:
+        records (list[dict]): ReportDataDictionary records (see SqlTimeseries.availseries()).
+    """
+
+    def __init__(self, records: list[dict]):
+        self.records = records
+        self._positions = {}
+        self._sorted = {}
+        for field in SERIES_INDEX_FIELDS:
+            positions = {}
+            for i, record in enumerate(records):
+                positions.setdefault(str(record[field] or '').lower(), []).append(i)
+            self._positions[field] = {k: np.array(v, dtype='int64') for k, v in positions.items()}
+            self._sorted[field] = sorted(positions)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _prefix_range(self, field: str, prefix: str) -> list[str]:
+        values = self._sorted[field]
+        start = bisect.bisect_left(values, prefix)
+        stop = bisect.bisect_left(values, prefix + '\U0010ffff')
+        return values[start:stop]
+
+    def _match(self, field: str, pattern: str) -> np.ndarray:
+        pattern = pattern.strip().lower()
+        first_wildcard = min((pattern.find(c) for c in WILDCARD_CHARS if c in pattern), default=-1)
+        if first_wildcard < 0:
+            values = [pattern] if pattern in self._positions[field] else []
+        elif first_wildcard == len(pattern) - 1 and pattern.endswith('*'):
+            values = self._prefix_range(field, pattern[:-1])
+        else:
+            values = [x for x in self._prefix_range(field, pattern[:first_wildcard]) if fnmatch.fnmatchcase(x, pattern)]
+        if not values:
+            return np.empty(0, dtype='int64')
+        return np.concatenate([self._positions[field][x] for x in values])
+
+    def search(self, name: str | None = None, key: str | None = None, units: str | None = None,
+               frequency: str | None = None) -> list[dict]:
+        """
+        Return the records matching every given pattern, in ReportDataDictionaryIndex order.
+
+        Args:
+            name (str | None): Name pattern (exact, 'prefix*' or wildcard).
+            key (str | None): KeyValue pattern.
+            units (str | None): Units pattern.
+            frequency (str | None): Reporting frequency (see normalize_frequency()), or None / 'all'.
+
+        Returns:
+            list[dict]: Matching ReportDataDictionary records.
+        """
+        criteria = [(f, p) for f, p in (('Name', name), ('KeyValue', key), ('Units', units)) if p is not None]
+        frequency = normalize_frequency(frequency)
+        if frequency is not None:
+            criteria.append(('ReportingFrequency', frequency))
+        if not criteria:
+            return list(self.records)
+
+        matches = None
+        for field, pattern in criteria:
+            positions = self._match(field, pattern)
+            matches = positions if matches is None else np.intersect1d(matches, positions)
+            if not len(matches):
+                return []
+        return [self.records[i] for i in np.sort(matches)]
+
+
+def get_series_index(sql_file: str, read_records) -> SeriesIndex:
+    """
+    Return the series index of a SQL file, building it on first use.
+
+    Cached per file and stat fingerprint, like the time index.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        read_records (callable): Returns the file's ReportDataDictionary records when not cached.
+
+    Returns:
+        SeriesIndex: The index.
+    """
+    key = (os.path.abspath(sql_file), stat_fingerprint(sql_file))
+    with _series_index_lock:
+        index = _series_index_cache.get(key)
+        if index is not None:
+            _series_index_cache.move_to_end(key)
+            return index
+
+    index = SeriesIndex(read_records())
+    with _series_index_lock:
+        _series_index_cache[key] = index
+        while len(_series_index_cache) > TIME_INDEX_CACHE_SIZE:
+            _series_index_cache.popitem(last=False)
+    return index
+
+
+# open tabular indexes by (sql file, stat fingerprint)
+_tabular_index_cache = OrderedDict()
+_tabular_index_lock = threading.Lock()
+TABULAR_KEY_COLUMNS = ['ReportName', 'ReportForString', 'TableName']
+
+
+class TabularIndex:
+    """
+    Strings and table locations of the TabularData of one SQL file.
+
+    The Strings table is held as an array indexed by StringIndex, so the names of any set of
+    TabularData rows are one np.take() per column. The TabularData rowids are grouped by table
+    (ReportName, ReportForString, TableName), each table a range [start, stop) of them, so
+    listing tables reads no TabularData and extracting a table reads only its rows by primary
+    key (one BETWEEN range when they are consecutive, as EnergyPlus writes them).
+
+    Args:
+        strings (np.ndarray): Value of each StringIndex (object array, None for unused indexes).
+        keys (np.ndarray): (tables, 3) ReportNameIndex, ReportForStringIndex and TableNameIndex
+                           of each table, in the order the tables are stored.
+        starts (np.ndarray): Start of each table in rowids.
+        stops (np.ndarray): End of each table in rowids.
+        rowids (np.ndarray): TabularDataIndex of every row, grouped by table, ascending within a table.
+    """
+
+    def __init__(self, strings: np.ndarray, keys: np.ndarray, starts: np.ndarray, stops: np.ndarray, rowids: np.ndarray):
+        self.strings = strings
+        self.keys = keys
+        self.starts = starts
+        self.stops = stops
+        self.rowids = rowids
+        names = np.take(strings, keys) if len(keys) else np.empty((0, 3), dtype=object)
+        self.tables = pd.DataFrame(names, columns=TABULAR_KEY_COLUMNS)
+        self._positions = {tuple(x): i for i, x in enumerate(names.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def take(self, string_index) -> np.ndarray:
+        """
+        Return the strings of an array of StringIndex values.
+        """
+        return np.take(self.strings, np.asarray(string_index, dtype='int64'))
+
+    def table_rowids(self, report_name: str, report_for: str, table_name: str) -> np.ndarray:
+        """
+        Return the TabularDataIndex of a table's rows.
+
+        Raises:
+            ValueError: If the file has no such table.
+        """
+        position = self._positions.get((report_name, report_for, table_name))
+        if position is None:
+            raise ValueError(f"Table not found: {report_name}/{report_for}/{table_name}")
+        return self.rowids[self.starts[position]:self.stops[position]]
+
+
+def build_tabular_index(conn: sqlite3.Connection) -> dict:
+    """
+    Read the Strings table and the table columns of TabularData into the arrays of a TabularIndex.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the SQL file.
+
+    Returns:
+        dict: TabularIndex arguments.
+    """
+    rows = conn.execute('SELECT "StringIndex", "Value" FROM "Strings"').fetchall()
+    string_index = np.fromiter((x[0] for x in rows), dtype='int64', count=len(rows))
+    strings = np.full(int(string_index.max()) + 1 if len(rows) else 0, None, dtype=object)
+    strings[string_index] = [x[1] for x in rows]
+
+    rows = conn.execute('SELECT "TabularDataIndex", "ReportNameIndex", "ReportForStringIndex", "TableNameIndex" '
+                        'FROM "TabularData"').fetchall()
+    data = np.fromiter(itertools.chain.from_iterable(rows), dtype='int64', count=len(rows) * 4).reshape(-1, 4)
+    keys, first, codes = np.unique(data[:, 1:], axis=0, return_index=True, return_inverse=True)
+    # tables in the order they are stored, rows in rowid order within each table
+    table_order = np.argsort(first)
+    keys = keys[table_order]
+    codes = np.argsort(table_order)[codes.reshape(-1)]
+    order = np.lexsort((data[:, 0], codes))
+    sorted_codes = codes[order]
+    return {
+        'strings': strings,
+        'keys': keys,
+        'starts': np.searchsorted(sorted_codes, np.arange(len(keys)), side='left'),
+        'stops': np.searchsorted(sorted_codes, np.arange(len(keys)), side='right'),
+        'rowids': data[order, 0],
+    }
+
+
+def get_tabular_index(sql_file: str, read_index) -> TabularIndex:
+    """
+    Return the tabular index of a SQL file, building it on first use.
+
+    Cached per file and stat fingerprint, like the series index.
+
+    Args:
+        sql_file (str): Path to the SQL file.
+        read_index (callable): Returns the TabularIndex arguments (see build_tabular_index()) when not cached.
+
+    Returns:
+        TabularIndex: The index.
+    """
+    key = (os.path.abspath(sql_file), stat_fingerprint(sql_file))
+    with _tabular_index_lock:
+        index = _tabular_index_cache.get(key)
+        if index is not None:
+            _tabular_index_cache.move_to_end(key)
+            return index
+
+    index = TabularIndex(**read_index())
+    with _tabular_index_lock:
+        _tabular_index_cache[key] = index
+        while len(_tabular_index_cache) > TIME_INDEX_CACHE_SIZE:
+            _tabular_index_cache.popitem(last=False)
+    return index
+
+
 class SqlTables(BaseModel):
     """
     Provides methods to extract and manipulate tabular data from EnergyPlus SQL output files.
     Use this class to list available tables, filter tables, and extract specific tables as DataFrames.
     """
     sql_file: str
-    _string_cache: dict | None = None  # Cache for Strings table lookups
-    _conn: sqlite3.Connection | None = None  # Persistent connection
 
     class Config:
         arbitrary_types_allowed = True
 
-    def _get_connection(self):
-        """Get or create persistent connection"""
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.sql_file)
-        return self._conn
-
-    def __del__(self):
-        """Close connection on cleanup"""
-        if self._conn is not None:
-            self._conn.close()
-
-    def _get_string_cache(self):
-        """Get or build string lookup cache"""
-        if self._string_cache is None:
-            strings = self._exec_pandas_query("SELECT StringIndex, StringTypeIndex, Value FROM Strings")
-            # Create nested dict: {StringTypeIndex: {Value: StringIndex}}
-            self._string_cache = {}
-            for _, row in strings.iterrows():
-                type_idx = row['StringTypeIndex']
-                if type_idx not in self._string_cache:
-                    self._string_cache[type_idx] = {}
-                self._string_cache[type_idx][row['Value']] = row['StringIndex']
-        return self._string_cache
+    def _tabular_index(self) -> TabularIndex:
+        """
+        The file's strings and table locations (see TabularIndex), shared by every SqlTables for the file.
+        """
+        def read_index():
+            def build(sql_file):
+                with get_connection_pool().connection(sql_file) as conn:
+                    return build_tabular_index(conn)
+
+            # the index only depends on the file contents, so it is cached by content fingerprint
+            return cached_artifact('sql_tabular_index', self.sql_file, build, TABULAR_INDEX_VERSION)
+
+        return get_tabular_index(self.sql_file, read_index)
 
     def _df_cols_to_dict(self, df, keycol, valcol):
         """
@@ -69,34 +1065,17 @@ class SqlTables(BaseModel):
         """
         return pd.Series(df[valcol].values, index=df[keycol].values).to_dict()
 
-    def _idx_to_str(self, tabledf, stringdict, lookup_col):
+    def _exec_query(self, query, params=None):
         """
-        Replace index columns with their string values using a lookup dictionary.
+        Execute a SQL query on the file and return the result.
         Args:
-            tabledf (pd.DataFrame): DataFrame with index columns.
-            stringdict (dict): Mapping from index to string.
-            lookup_col (str): Name of the index column to replace.
+            query (str): SQL query string with optional ? placeholders for parameters.
+            params (tuple): Optional parameters for parameterized queries.
         Returns:
-            pd.DataFrame: DataFrame with string column added.
+            Query result (list of tuples).
         """
-        string_col = lookup_col.replace("Index", "")
-        if string_col == lookup_col:
-            raise ValueError("Lookup Col str has to have 'Index' in it")
-        tabledf[string_col] = tabledf[lookup_col].apply(lambda x: stringdict[x])
-        return tabledf
-
-    def _exec_query(self, query):
-        conn = sqlite3.connect(self.sql_file)
-        cursor = conn.cursor()
-
-        cursor.execute()
-
-        rows = cursor.fetchall()
-
-        conn.close()
-
-        return rows
-
+        with get_connection_pool().connection(self.sql_file) as conn:
+            return conn.execute(query, params or ()).fetchall()
 
     def _exec_pandas_query(self, query, params=None):
         """
@@ -107,9 +1086,8 @@ class SqlTables(BaseModel):
         Returns:
             pd.DataFrame: Query result.
         """
-        conn = self._get_connection()
-        df = pd.read_sql(query, conn, params=params)
-        return df
+        with get_connection_pool().connection(self.sql_file) as conn:
+            return pd.read_sql(query, conn, params=params)
 
     def _df_to_tabledict(self, df):
         """
@@ -137,7 +1115,23 @@ class SqlTables(BaseModel):
             pd.DataFrame: Filtered DataFrame.
         """
         avail = self.avail_tabular()
-        df = avail[avail.apply(lambda row: row.astype(str).str.contains(filterquery).any(), axis=1)]
+        mask = np.zeros(len(avail), dtype=bool)
+        for col in avail.columns:
+            mask |= avail[col].astype(str).str.contains(filterquery, regex=False).to_numpy()
+        return avail[mask]
+
+    def _floatdf(self, df):
+        """
+        Convert the value columns of a table to numbers where every non-blank value is numeric.
+        Args:
+            df (pd.DataFrame): Table from get_tabular(), with values as text.
+        Returns:
+            pd.DataFrame: The table, with numeric columns as floats and text stripped of padding.
+        """
+        for col in df.columns[len(TABULAR_KEY_COLUMNS) + 1:]:
+            text = df[col].astype(str).str.strip().where(df[col].notna(), '')
+            numbers = pd.to_numeric(text.where(text != ''), errors='coerce')
+            df[col] = numbers if numbers.notna().sum() == (text != '').sum() else text
         return df
 
     def avail_tabular(self):
@@ -146,16 +1140,7 @@ class SqlTables(BaseModel):
         Returns:
             pd.DataFrame: DataFrame of available tables.
         """
-        tabulardata = self._exec_pandas_query("SELECT * FROM 'TabularData'")
-        strings = self._exec_pandas_query("SELECT * FROM 'Strings'")
-        stringdict = self._df_cols_to_dict(strings, 'StringIndex', 'Value')
-        get_strs = ['ReportNameIndex', 'ReportForStringIndex', 'TableNameIndex']
-        for string in get_strs:
-            tabulardata = self._idx_to_str(tabulardata, stringdict, string)
-            tabulardata.drop(string, axis=1, inplace=True)
-        tables = tabulardata[['ReportName', 'ReportForString', 'TableName']].drop_duplicates()
-        return tables
-
+        return self._tabular_index().tables.copy()
 
     def get_tabular(self, tabledict):
         """
@@ -178,33 +1163,25 @@ class SqlTables(BaseModel):
             report_for = tabledict['ReportForString']
             table_name = tabledict['TableName']
 
+        index = self._tabular_index()
+        rowids = index.table_rowids(report_name, report_for, table_name)
 
-        # Use cached string lookups instead of querying
-        string_cache = self._get_string_cache()
-        reportnameidx = string_cache.get(1, {}).get(report_name)
-        reportforidx = string_cache.get(2, {}).get(report_for)
-        tablenameidx = string_cache.get(3, {}).get(table_name)
-
-        if reportnameidx is None or reportforidx is None or tablenameidx is None:
-            raise ValueError(f"Table not found: {report_name}/{report_for}/{table_name}")
-
-
-
-        tablestr = self._exec_pandas_query(
-            "SELECT * FROM 'TabularData' WHERE TableNameIndex = ? AND ReportForStringIndex = ? AND ReportNameIndex = ?",
-            params=(tablenameidx, reportforidx, reportnameidx))
-        strings = self._exec_pandas_query("SELECT * FROM 'Strings'")
-
-        stringdict = self._df_cols_to_dict(strings, 'StringIndex', 'Value')
-        idxcols = [col for col in tablestr.columns if "Index" in col and "TabularDataIndex" not in col]
-        for col in idxcols:
-            df = self._idx_to_str(tablestr, stringdict, col)
-
-        df = df[[col for col in df.columns if "Index" not in col]]
+        columns = 'SELECT "RowNameIndex", "ColumnNameIndex", "UnitsIndex", "RowId", "ColumnId", "Value" FROM "TabularData" '
+        if rowids[-1] - rowids[0] + 1 == len(rowids):
+            rows = self._exec_query(columns + 'WHERE "TabularDataIndex" BETWEEN ? AND ?',
+                                    params=(int(rowids[0]), int(rowids[-1])))
+        else:
+            rows = []
+            for i in range(0, len(rowids), SQL_MAX_VARIABLES):
+                chunk = rowids[i:i + SQL_MAX_VARIABLES].tolist()
+                rows += self._exec_query(columns + f'WHERE "TabularDataIndex" IN ({",".join("?" * len(chunk))})', params=chunk)
+
+        df = pd.DataFrame(rows, columns=['RowNameIndex', 'ColumnNameIndex', 'UnitsIndex', 'RowId', 'ColumnId', 'Value'])
+        for col in ['RowNameIndex', 'ColumnNameIndex', 'UnitsIndex']:
+            df[col.replace('Index', '')] = index.take(df[col].to_numpy())
         coldict = self._df_cols_to_dict(df, 'ColumnId', 'ColumnName')
         colunitdict = self._df_cols_to_dict(df, 'ColumnId', 'Units')
 
-
         rowdict = self._df_cols_to_dict(df, 'RowId', 'RowName')
         valdf = df[['RowId', 'ColumnId', 'Value']].pivot(columns='ColumnId', index='RowId', values='Value')
         valdf.columns = pd.MultiIndex.from_tuples([(coldict[col], colunitdict[col]) for col in valdf.columns])
@@ -248,22 +1225,64 @@ class SqlTimeseries(BaseModel):
     Use this class to list available series, filter by name, and extract time series as DataFrames.
     """
     sql_file: str
-    _time_cache: pd.DataFrame | None = None  # Cache for time index
-    _conn: sqlite3.Connection | None = None  # Persistent connection
+    columnar: str | None = None  # 'off', 'read' or 'on'; defaults to SQL_COLUMNAR_MODE
+    row_index: str | None = None  # 'off', 'read' or 'on'; defaults to SQL_ROW_INDEX_MODE
 
     class Config:
         arbitrary_types_allowed = True
 
-    def _get_connection(self):
-        """Get or create persistent connection"""
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.sql_file)
-        return self._conn
-
-    def __del__(self):
-        """Close connection on cleanup"""
-        if self._conn is not None:
-            self._conn.close()
+    def _columnar_store(self):
+        """
+        Return the file's columnar store (see get_columnar_store()), or None to read from SQLite.
+        """
+        mode = self.columnar or SQL_COLUMNAR_MODE
+        if mode == 'off':
+            return None
+        try:
+            return get_columnar_store(self.sql_file, build=mode == 'on')
+        except (OSError, sqlite3.Error, pa.ArrowException) as e:
+            print(f'columnar store unavailable, reading SQLite: {self.sql_file}: {e}', file=sys.stderr)
+            return None
+
+    def _row_index(self):
+        """
+        Return the file's sidecar row index (see get_row_index()), or None to filter ReportData by variable.
+        """
+        mode = self.row_index or SQL_ROW_INDEX_MODE
+        if mode == 'off':
+            return None
+        try:
+            return get_row_index(self.sql_file, build=mode == 'on')
+        except (OSError, sqlite3.Error, pa.ArrowException) as e:
+            print(f'row index unavailable, scanning ReportData: {self.sql_file}: {e}', file=sys.stderr)
+            return None
+
+    def _read_values(self, rddids):
+        """
+        Read the values of some variables, from the columnar store when it is up to date, else
+        from SQLite by rowid through the sidecar row index.
+        Args:
+            rddids (list[int]): ReportDataDictionary indexes.
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: ReportDataDictionaryIndex, TimeIndex and Value arrays.
+        """
+        store = self._columnar_store()
+        if store is not None:
+            return store.read(rddids)
+
+        row_index = self._row_index()
+        if row_index is not None:
+            with get_connection_pool().connection(self.sql_file) as conn:
+                return read_rows_by_rowid(conn, row_index.rowids(rddids))
+
+        rows = []
+        for i in range(0, len(rddids), SQL_MAX_VARIABLES):
+            chunk = tuple(rddids[i:i + SQL_MAX_VARIABLES])
+            rows += self._exec_query(
+                'SELECT "ReportDataDictionaryIndex", "TimeIndex", "Value" FROM "ReportData" '
+                f'WHERE "ReportDataDictionaryIndex" IN ({",".join("?" * len(chunk))})', params=chunk)
+        data = np.array(rows, dtype=REPORT_DATA_DTYPE)
+        return data['rdd'], data['time'], data['value']
 
     def _exec_query(self, query, params=None):
         """
@@ -274,14 +1293,8 @@ class SqlTimeseries(BaseModel):
         Returns:
             Query result (list of tuples).
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        res = cursor.fetchall()
-        return res
+        with get_connection_pool().connection(self.sql_file) as conn:
+            return conn.execute(query, params or ()).fetchall()
 
     def _df_query(self, query, params=None):
         """
@@ -292,9 +1305,8 @@ class SqlTimeseries(BaseModel):
         Returns:
             pd.DataFrame: Query result.
         """
-        conn = self._get_connection()
-        df = pd.read_sql(query, conn, params=params)
-        return df
+        with get_connection_pool().connection(self.sql_file) as conn:
+            return pd.read_sql(query, conn, params=params)
 
     def _df_to_tabledict(self, df):
         """
@@ -321,185 +1333,830 @@ class SqlTimeseries(BaseModel):
         Returns:
             pd.DataFrame: Filtered DataFrame.
         """
-        avail = self.availseries()
-        df = avail[avail.apply(lambda row: row.astype(str).str.contains(filterquery).any(), axis=1)]
-        return df
+        avail = pd.DataFrame(self.availseries())
+        if avail.empty:
+            return avail
+        mask = np.zeros(len(avail), dtype=bool)
+        for col in avail.columns:
+            mask |= avail[col].astype(str).str.contains(filterquery, regex=False).to_numpy()
+        return avail[mask]
+
 
+    def _read_time_table(self):
+        store = self._columnar_store()
+        if store is not None:
+            return store.time_table.to_pandas()
+        return self._df_query("SELECT * FROM Time")
 
     def _maketime(self):
         """
-        Build a DataFrame of time indices and corresponding datetime values for hourly data.
-        Cached after first call for performance.
+        Build a DataFrame of time indices and corresponding datetime values, for every
+        reporting frequency (timestep, hourly, daily, monthly and run period rows).
+        Shared by every SqlTimeseries for the same file (see get_time_index()).
         Returns:
             pd.DataFrame: DataFrame with time indices and datetime values.
         """
-        # Return cached version if available
-        if self._time_cache is not None:
-            return self._time_cache
+        return get_time_index(self.sql_file, self._read_time_table)
 
-        timedf = self._df_query("SELECT * FROM Time WHERE Interval = 60")
+    def _time_lookup(self):
+        """
+        Datetimes indexed by TimeIndex (see get_time_lookup()).
+        Returns:
+            np.ndarray: datetime64[ns] lookup array.
+        """
+        return get_time_lookup(self.sql_file, self._read_time_table)
 
-        def zeropad(val):
-            if len(str(val)) == 1:
-                val = '0' + str(val)
-                return val
-            else:
-                return val
 
-        timedf['Hour'] = timedf['Hour'] - 1
-        timedf['Month'] = timedf['Month'].apply(lambda x: zeropad(x))
-        timedf['Day'] = timedf['Day'].apply(lambda x: zeropad(x))
-        timedf['Hour'] = timedf['Hour'].apply(lambda x: zeropad(x))
-        timedf['dt'] = timedf['Month'].astype(str) + "-" + timedf['Day'].astype(str) + "-" + timedf['Hour'].astype(str)
-        dtformat = "%m-%d-%H"
-        timedf['dt'] = pd.to_datetime(timedf['dt'], format=dtformat)
+    # public functions
 
-        # Cache the result
-        self._time_cache = timedf
-        return timedf
 
+    def _read_dictionary(self):
+        """
+        Every ReportDataDictionary record of the file.
+        Returns:
+            list[dict]: Records with the RDD_COLUMNS keys.
+        """
+        def read_dictionary(sql_file):
+            df = self._df_query("SELECT * FROM ReportDataDictionary ORDER BY ReportDataDictionaryIndex")
+            df.columns = RDD_COLUMNS
+            return df.to_dict(orient='records')
 
-    # public functions
+        # the dictionary only depends on the file contents, so it is cached by content fingerprint
+        return cached_artifact('sql_dictionary', self.sql_file, read_dictionary, DICTIONARY_VERSION)
 
+    def series_index(self) -> SeriesIndex:
+        """
+        The search index over the file's series (see SeriesIndex), shared by every SqlTimeseries for the file.
+        """
+        return get_series_index(self.sql_file, self._read_dictionary)
 
-    def availseries(self):
+    def availseries(self, frequency: str | None = 'Hourly'):
         """
-        Return a DataFrame of all available hourly series.
+        Return the available series of a reporting frequency.
+        Args:
+            frequency (str | None): 'Hourly' (default), 'timestep', 'detailed', 'daily', 'monthly',
+                                    'runperiod', 'annual', or None / 'all' for every frequency.
         Returns:
-            pd.DataFrame: DataFrame of available series.
+            list[dict]: ReportDataDictionary records of the available series.
+        """
+        return self.series_index().search(frequency=frequency)
+
+    def search_series(self, name: str | None = None, key: str | None = None, units: str | None = None,
+                      frequency: str | None = None) -> list[dict]:
         """
+        Find series by name, key and units patterns, without listing every series.
 
-        rddcols = [
-            'ReportDataDictionaryIndex',
-            'IsMeter',
-            'Type',
-            'IndexGroup',
-            'TimestepType',
-            'KeyValue',
-            'Name',
-            'ReportingFrequency',
-            'ScheduleName',
-            'Units'
-        ]
+        Each pattern is case-insensitive and may be exact ('Zone Mean Air Temperature'), a prefix
+        ('Zone Air*') or a shell-style wildcard ('*Heating*Energy', 'CORE_?'). See SeriesIndex.
 
-        df = self._df_query("SELECT * FROM ReportDataDictionary WHERE ReportingFrequency = 'Hourly'")
-        df.columns = rddcols
+        Args:
+            name (str | None): Variable or meter name pattern.
+            key (str | None): KeyValue (zone, surface, equipment name) pattern.
+            units (str | None): Units pattern.
+            frequency (str | None): Reporting frequency (see availseries()), or None / 'all' for every frequency.
+
+        Returns:
+            list[dict]: Matching ReportDataDictionary records.
+        """
+        return self.series_index().search(name=name, key=key, units=units, frequency=frequency)
+
+    def page_series(
+        self,
+        frequency: str | None = 'Hourly',
+        name: str | None = None,
+        key: str | None = None,
+        units: str | None = None,
+        columns: list[str] | None = None,
+        after: int = 0,
+        limit: int = 1000
+    ) -> tuple[list[dict], int | None, int]:
+        """
+        Return one page of the available series, filtered and projected, for dictionaries too
+        large to send at once.
 
-        return df.to_dict(orient='records')
+        Pages are in ReportDataDictionaryIndex order and keyed by the last index of the previous
+        page, so a page is the same whichever page came before it.
+
+        Args:
+            frequency (str | None): Reporting frequency (see availseries()), or None / 'all'.
+            name (str | None): Name pattern (see search_series()).
+            key (str | None): KeyValue pattern.
+            units (str | None): Units pattern.
+            columns (list[str] | None): RDD_COLUMNS to return; ReportDataDictionaryIndex is always
+                                        included. Every column if None.
+            after (int): ReportDataDictionaryIndex to continue after; 0 for the first page.
+            limit (int): Maximum number of records.
+
+        Returns:
+            tuple[list[dict], int | None, int]: The records, the 'after' value of the next page (None
+                                                after the last page), and the number of matching series.
+        """
+        if limit <= 0:
+            raise ValueError(f"Page limit must be positive, got {limit}")
+        if columns is not None:
+            unknown = [x for x in columns if x not in RDD_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown columns {unknown}; expected some of {RDD_COLUMNS}")
+            columns = ['ReportDataDictionaryIndex'] + [x for x in columns if x != 'ReportDataDictionaryIndex']
+
+        matches = self.search_series(name=name, key=key, units=units, frequency=frequency)
+        rddids = np.fromiter((x['ReportDataDictionaryIndex'] for x in matches), dtype='int64', count=len(matches))
+        start = int(np.searchsorted(rddids, after, side='right'))
+        page = matches[start:start + limit]
+        if columns is not None:
+            page = [{col: x[col] for col in columns} for x in page]
+        else:
+            page = [dict(x) for x in page]
+        next_after = int(rddids[start + limit - 1]) if start + limit < len(matches) else None
+        return page, next_after, len(matches)
 
     def queryseries(self, filterquery):
         """
-        Filter available series for a string and return the matching DataFrame.
+        Filter available hourly series for a string in any field and return the matching DataFrame.
+        Use search_series() to match names and keys by pattern.
         Args:
-            filterquery (str): String to search for in series names.
+            filterquery (str): String to search for (case-sensitive).
         Returns:
             pd.DataFrame: Filtered DataFrame.
         """
-        df = self.availseries()
-        df = self._filter_tabular(filterquery)
-        return df
+        return self._filter_tabular(filterquery)
 
+    def find_series(self, name: str, key: str | None = None, frequency: str | None = 'Hourly') -> int:
+        """
+        Return the RDD ID of a variable or meter by name and key (both case-insensitive,
+        and may be patterns as in search_series()).
 
+        Args:
+            name (str): Variable or meter name, e.g. 'Zone Mean Air Temperature' or 'Electricity:Facility'.
+            key (str | None): KeyValue (zone, surface, equipment name). May be omitted when the
+                              name has a single key, as meters do.
+            frequency (str | None): Reporting frequency (see availseries()), or None for any.
+
+        Returns:
+            int: The ReportDataDictionaryIndex.
+
+        Raises:
+            ValueError: If no series matches, or several do and key does not pick one.
+        """
+        matches = self.search_series(name=name, key=key, frequency=frequency)
+        if not matches:
+            detail = f" and key '{key}'" if key is not None else ''
+            raise ValueError(f"No series named '{name}'{detail} at frequency {frequency or 'any'}")
+        if len(matches) > 1:
+            options = [f"{x['KeyValue']} ({x['ReportingFrequency']})" for x in matches[:20]]
+            raise ValueError(f"{len(matches)} series named '{name}', pass a key: {options}")
+        return matches[0]['ReportDataDictionaryIndex']
+
+
+
+    def get_series(self, rddid: int) -> SeriesData:
+        """
+        Return one series as a SeriesData: value and TimeIndex arrays plus the variable's dictionary record.
+
+        Args:
+            rddid (int): ReportDataDictionary index.
+
+        Returns:
+            SeriesData: The series. Use to_records() only where one dict per value is really needed.
+        """
+        # Validate RDD ID input
+        if not isinstance(rddid, int) or isinstance(rddid, bool):
+            raise TypeError(f"RDD ID must be an integer, got {type(rddid).__name__}")
+        if rddid <= 0:
+            raise ValueError(f"RDD ID must be positive, got {rddid}")
+
+        records = self._exec_query("SELECT * FROM ReportDataDictionary WHERE ReportDataDictionaryIndex = ?", params=(rddid,))
+        if not records:
+            raise ValueError(f"RDD IDs not found: {[rddid]}")
+
+        _, time_index, value = self._read_values([rddid])
+        return SeriesData(
+            metadata=dict(zip(RDD_COLUMNS, records[0])),
+            time_index=time_index,
+            values=value,
+            lookup=self._time_lookup()
+        )
 
     def getseries_by_record_id(self, rddid: int):
         """
-            Given a dictionary generated from available , return the corresponding time series as a DataFrame with a datetime index.
+            Given a dictionary generated from available , return the corresponding time series as a list of records.
             Args:
                 rddid: ReportDataDictionary Index, int
 
             Returns:
-                list of dictionaries
+                list of dictionaries (dt, the variable's dictionary fields and Value), one per value.
+                get_series() returns the same data as arrays.
 
             """
+        return self.get_series(rddid).to_records()
 
-        # Validate RDD ID input
-        if not isinstance(rddid, int):
-            raise TypeError(f"RDD ID must be an integer, got {type(rddid).__name__}")
-        if rddid <= 0:
-            raise ValueError(f"RDD ID must be positive, got {rddid}")
+    def _series_labels(self, rddids):
+        """
+        Validate RDD ids and return their column labels.
+        Args:
+            rddids (list[int]): ReportDataDictionary indexes.
+        Returns:
+            dict: {rddid: '<KeyValue>-<Name>-<TimestepType>-<Units>'}
+        """
+        for rddid in rddids:
+            if not isinstance(rddid, int) or isinstance(rddid, bool):
+                raise TypeError(f"RDD ID must be an integer, got {type(rddid).__name__}")
+            if rddid <= 0:
+                raise ValueError(f"RDD ID must be positive, got {rddid}")
+
+        labels = {}
+        for i in range(0, len(rddids), SQL_MAX_VARIABLES):
+            chunk = tuple(rddids[i:i + SQL_MAX_VARIABLES])
+            for record in self._exec_query(
+                    f"SELECT * FROM ReportDataDictionary WHERE ReportDataDictionaryIndex IN ({','.join('?' * len(chunk))})", params=chunk):
+                # KeyValue-Name-TimestepType-Units
+                labels[record[0]] = f'{record[5]}-{record[6]}-{record[4]}-{record[9]}'
+
+        missing = [x for x in rddids if x not in labels]
+        if missing:
+            raise ValueError(f"RDD IDs not found: {missing}")
+        return labels
+
+    def getseries_wide(self, rddids: list[int]) -> pd.DataFrame:
+        """
+        Return several series as one wide DataFrame: a datetime index and one column per series.
 
-        labelquery = self._exec_query("SELECT * FROM ReportDataDictionary WHERE ReportDataDictionaryIndex = ?", params=(rddid,))
-        if len(labelquery) == 1:
-            labelquery = labelquery[0]
-        elif len(labelquery) > 1:
-            print(f'warning - multiple found for {labelquery}')
-        else:
-            print(f'none found for {labelquery}')
+        All values are read with one query per SQL_MAX_VARIABLES ids (or sliced from the
+        columnar store, see get_columnar_store()), and placed in the
+        table by TimeIndex with NumPy, so the cost does not grow with a merge per series.
+        Series of different frequencies can be combined; a series has NaN at the times of
+        the others.
 
+        Args:
+            rddids (list[int]): ReportDataDictionary indexes, in column order.
 
-        ReportDataDictionaryIndex, IsMeter, Type, IndexGroup, TimestepType, KeyValue, Name, ReportingFrequency, ScheduleName, Units = labelquery
+        Returns:
+            pd.DataFrame: Values indexed by 'dt', with columns labelled
+                          '<KeyValue>-<Name>-<TimestepType>-<Units>'.
+        """
+        rddids = list(dict.fromkeys(rddids))
+        labels = self._series_labels(rddids)
 
-        listquery = 'SELECT "Value","ReportDataDictionaryIndex","TimeIndex" FROM "ReportData" WHERE "ReportDataDictionaryIndex" = ?'
-        df_query = self._df_query(listquery, params=(rddid,))
+        rdd, data_time, data_value = self._read_values(rddids)
 
-        df_query['Name'] = Name
-        df_query['ScheduleName'] = ScheduleName
-        df_query['TimestepType'] = TimestepType
-        df_query['Type'] = Type
-        df_query['IndexGroup'] = IndexGroup
-        df_query['KeyValue'] = KeyValue
-        df_query['Units'] = Units
-        df_query['IsMeter'] = IsMeter
-        df_query['ReportingFrequency'] = ReportingFrequency
+        # rows by TimeIndex, columns by position in rddids
+        time_index, row = np.unique(data_time, return_inverse=True)
+        order = np.argsort(rddids)
+        col = order[np.searchsorted(np.asarray(rddids)[order], rdd)]
 
+        values = np.full((len(time_index), len(rddids)), np.nan)
+        values[row, col] = data_value
 
-        time = self._maketime()[['TimeIndex', 'dt']]
+        dt = pd.DatetimeIndex(lookup_times(self._time_lookup(), time_index), name='dt')
+        return pd.DataFrame(values, index=dt, columns=[labels[x] for x in rddids])
 
-        dfp = pd.merge(left=df_query, right=time, left_on='TimeIndex', right_on='TimeIndex')
+    def aggregate(self, rddids: list[int], by: str = 'month', stats=('sum', 'mean', 'min', 'max'), percentiles=None) -> list[dict]:
+        """
+        Summarize series by month, day, hour of day or day type without building their records.
 
+        Values are read as arrays (see _read_values()) and reduced with NumPy
+        (see aggregate_values()); rows whose time is unknown are left out of time groups.
 
-        dfp = dfp[[
-            'dt',
-            'KeyValue',
-            'Name',
-            'TimestepType',
-            'IndexGroup',
-            'ScheduleName',
-            'Units',
-            'IsMeter',
-            'ReportingFrequency',
-            'Type',
-            "Value"
-        ]]
+        Args:
+            rddids (list[int]): ReportDataDictionary indexes.
+            by (str): 'month' (1-12), 'day' ('MM-DD'), 'hour' (hour of day 0-23, start of interval),
+                      'weekday' (the Time table's DayType, e.g. 'Monday', 'Holiday',
+                      'SummerDesignDay') or 'all'.
+            stats (list[str]): Any of 'count', 'sum', 'mean', 'min', 'max', 'std'.
+                               'min' and 'max' also return the timestamp of the min / max ('min_dt', 'max_dt').
+            percentiles (list[float] | None): Percentiles (0-100) to add as 'p<value>'.
 
+        Returns:
+            list[dict]: One record per series and group: rddid, label, group and the statistics.
+        """
+        if by not in AGGREGATE_GROUPS:
+            raise ValueError(f"Unknown grouping {by!r}; expected one of {list(AGGREGATE_GROUPS)}")
+        unknown = [x for x in stats if x not in AGGREGATE_STATS]
+        if unknown:
+            raise ValueError(f"Unknown statistics {unknown}; expected any of {list(AGGREGATE_STATS)}")
+        percentiles = list(percentiles or [])
+        if any(not 0 <= p <= 100 for p in percentiles):
+            raise ValueError(f"Percentiles must be between 0 and 100, got {percentiles}")
+
+        rddids = list(dict.fromkeys(rddids))
+        labels = self._series_labels(rddids)
+        rdd, time_index, values = self._read_values(rddids)
+        dt = lookup_times(self._time_lookup(), time_index)
+
+        if by == 'weekday':
+            timedf = self._maketime()
+            day_types = pd.Series(timedf['DayType'].to_numpy(), index=timedf['TimeIndex'].to_numpy())
+            keys = day_types.reindex(time_index).fillna('Unknown').to_numpy(dtype=object)
+            known = np.ones(len(keys), dtype=bool)
+        elif by == 'all':
+            keys = np.full(len(values), 'all', dtype=object)
+            known = np.ones(len(keys), dtype=bool)
+        else:
+            known = ~np.isnat(dt)
+            if by == 'month':
+                keys = dt.astype('datetime64[M]').astype('int64') % 12 + 1
+            elif by == 'day':
+                keys = np.array([x[5:10] for x in np.datetime_as_string(dt, unit='D')], dtype=object) if len(dt) else dt
+            else:
+                keys = (dt - dt.astype('datetime64[D]')).astype('timedelta64[h]').astype('int64')
+
+        records = []
+        for rddid in rddids:
+            mask = (rdd == rddid) & known
+            groups, codes = np.unique(keys[mask], return_inverse=True)
+            result = aggregate_values(values[mask], codes, len(groups), stats, percentiles, dt[mask])
+            for i, group in enumerate(groups):
+                record = {'rddid': rddid, 'label': labels[rddid], 'group': group.item() if hasattr(group, 'item') else group}
+                for name, column in result.items():
+                    value = column[i]
+                    if isinstance(value, np.datetime64):
+                        record[name] = None if np.isnat(value) else pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+                    else:
+                        record[name] = value.item()
+                records.append(record)
+        return records
+
+    def iter_series(self, rddids: list[int], chunk_bytes: int | None = None, as_arrow: bool = False):
+        """
+        Read series in chunks of bounded size, for extracts too large to hold in memory at once.
 
+        From SQLite, rows stream from one query per SQL_MAX_VARIABLES ids with fetchmany(), in
+        the order they are stored (by time, with the variables interleaved). From an up-to-date
+        columnar store, each variable is yielded in turn as slices of the memory-mapped file.
 
-        return dfp.to_dict('records')
+        Args:
+            rddids (list[int]): ReportDataDictionary indexes.
+            chunk_bytes (int | None): Approximate memory ceiling per chunk. Defaults to SERIES_CHUNK_BYTES.
+            as_arrow (bool): Yield pyarrow RecordBatches instead of DataFrames.
 
-    def old_getseries(self, df: pd.DataFrame):
+        Yields:
+            pd.DataFrame | pa.RecordBatch: Chunks with 'dt', 'ReportDataDictionaryIndex' and 'Value' columns.
         """
-        Given a filtered DataFrame, return the corresponding time series as a DataFrame with a datetime index.
+        rddids = list(dict.fromkeys(rddids))
+        self._series_labels(rddids)
+        chunk_rows = max(1, (chunk_bytes or SERIES_CHUNK_BYTES) // SERIES_ROW_BYTES)
+        lookup = self._time_lookup()
+
+        def make_chunk(rdd, time_index, value):
+            dt = lookup_times(lookup, time_index)
+            if as_arrow:
+                return pa.record_batch([pa.array(dt), pa.array(rdd), pa.array(value)],
+                                       names=['dt', 'ReportDataDictionaryIndex', 'Value'])
+            return pd.DataFrame({'dt': dt, 'ReportDataDictionaryIndex': rdd, 'Value': value})
+
+        store = self._columnar_store()
+        if store is not None:
+            for rddid in rddids:
+                rdd, time_index, value = store.read([rddid])
+                for start in range(0, len(value), chunk_rows):
+                    stop = start + chunk_rows
+                    yield make_chunk(rdd[start:stop], time_index[start:stop], value[start:stop])
+            return
+
+        row_index = self._row_index()
+        if row_index is not None:
+            with get_connection_pool().connection(self.sql_file) as conn:
+                for rddid in rddids:
+                    rowids = row_index.rowids([rddid])
+                    for start in range(0, len(rowids), chunk_rows):
+                        yield make_chunk(*read_rows_by_rowid(conn, rowids[start:start + chunk_rows]))
+            return
+
+        # the connection stays checked out until the generator is exhausted or closed
+        with get_connection_pool().connection(self.sql_file) as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(rddids), SQL_MAX_VARIABLES):
+                chunk = tuple(rddids[i:i + SQL_MAX_VARIABLES])
+                cursor.execute(
+                    'SELECT "ReportDataDictionaryIndex", "TimeIndex", "Value" FROM "ReportData" '
+                    f'WHERE "ReportDataDictionaryIndex" IN ({",".join("?" * len(chunk))})', chunk)
+                while rows := cursor.fetchmany(chunk_rows):
+                    data = np.array(rows, dtype=REPORT_DATA_DTYPE)
+                    yield make_chunk(data['rdd'], data['time'], data['value'])
+
+    def read_series_page(self, rddids: list[int], after: int = 0, limit: int = 5000):
+        """
+        Read one page of series rows, for clients that fetch a large extract over several calls.
+
+        Pages follow the ReportData primary key (time order), so a page is one indexed range
+        scan and the next page continues from the last row returned.
+
         Args:
-            df (pd.DataFrame): Filtered DataFrame from queryseries.
+            rddids (list[int]): ReportDataDictionary indexes (at most SQL_MAX_VARIABLES).
+            after (int): ReportDataIndex to continue after; 0 for the first page.
+            limit (int): Maximum number of rows.
+
         Returns:
-            pd.DataFrame: Pivoted DataFrame with datetime index and multi-index columns.
+            tuple[pd.DataFrame, int | None]: The rows ('dt', 'ReportDataDictionaryIndex', 'Value') and
+                                             the 'after' value of the next page, or None after the last page.
+        """
+        rddids = list(dict.fromkeys(rddids))
+        if len(rddids) > SQL_MAX_VARIABLES:
+            raise ValueError(f"At most {SQL_MAX_VARIABLES} RDD IDs per page, got {len(rddids)}")
+        if limit <= 0:
+            raise ValueError(f"Page limit must be positive, got {limit}")
+        self._series_labels(rddids)
+
+        row_index = self._row_index()
+        if row_index is not None:
+            # the page's rowids are known up front; fetch only those
+            rowids = np.sort(row_index.rowids(rddids))
+            start = np.searchsorted(rowids, after, side='right')
+            page_rowids = rowids[start:start + limit]
+            with get_connection_pool().connection(self.sql_file) as conn:
+                rdd, time_index, value = read_rows_by_rowid(conn, page_rowids)
+            page = pd.DataFrame({
+                'dt': lookup_times(self._time_lookup(), time_index),
+                'ReportDataDictionaryIndex': rdd,
+                'Value': value,
+            })
+            next_after = int(page_rowids[-1]) if start + limit < len(rowids) else None
+            return page, next_after
+
+        rows = self._exec_query(
+            'SELECT "ReportDataIndex", "ReportDataDictionaryIndex", "TimeIndex", "Value" FROM "ReportData" '
+            f'WHERE "ReportDataIndex" > ? AND "ReportDataDictionaryIndex" IN ({",".join("?" * len(rddids))}) '
+            'ORDER BY "ReportDataIndex" LIMIT ?', params=(after, *rddids, limit))
+        data = np.array(rows, dtype=[('row', 'int64')] + REPORT_DATA_DTYPE)
+
+        page = pd.DataFrame({
+            'dt': lookup_times(self._time_lookup(), data['time']),
+            'ReportDataDictionaryIndex': data['rdd'],
+            'Value': data['value'],
+        })
+        next_after = int(data['row'][-1]) if len(rows) == limit else None
+        return page, next_after
+
+    def _iter_report_data(self, chunk_rows: int):
+        """
+        Yield every ReportData row as (ReportDataDictionaryIndex, TimeIndex, Value) arrays, in chunks.
+        """
+        store = self._columnar_store()
+        if store is not None:
+            yield from store.iter_rows(chunk_rows)
+            return
+
+        with get_connection_pool().connection(self.sql_file) as conn:
+            cursor = conn.execute('SELECT "ReportDataDictionaryIndex", "TimeIndex", "Value" FROM "ReportData"')
+            while rows := cursor.fetchmany(chunk_rows):
+                data = np.array(rows, dtype=REPORT_DATA_DTYPE)
+                yield data['rdd'], data['time'], data['value']
+
+    def series_summary(self) -> pd.DataFrame:
         """
+        Summary statistics of every variable in the file, of every reporting frequency.
 
+        Computed in one pass over ReportData (see summarize_report_data()) the first time it is
+        needed for a file version, and stored in the parsed-artifact cache.
 
-        rddi = str(tuple(df.ReportDataDictionaryIndex))
+        Returns:
+            pd.DataFrame: One row per ReportDataDictionaryIndex with its dictionary columns and
+                          count, sum, mean, min, max, max_dt (time of the first maximum) and
+                          zero_fraction (share of values that are exactly 0).
+        """
+        def build_summary(sql_file):
+            dictionary = pd.DataFrame(self.availseries(None))
+            if dictionary.empty:
+                return dictionary
+            ids = dictionary['ReportDataDictionaryIndex'].to_numpy(dtype='int64')
+            chunk_rows = max(1, SERIES_CHUNK_BYTES // SERIES_ROW_BYTES)
+            stats = summarize_report_data(self._iter_report_data(chunk_rows), int(ids.max()) + 1)
+
+            count = stats['count'][ids]
+            has_values = count > 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dictionary['count'] = count
+                dictionary['sum'] = stats['sum'][ids]
+                dictionary['mean'] = np.where(has_values, stats['sum'][ids] / count, np.nan)
+                dictionary['min'] = np.where(has_values, stats['min'][ids], np.nan)
+                dictionary['max'] = np.where(has_values, stats['max'][ids], np.nan)
+                dictionary['zero_fraction'] = np.where(has_values, stats['zeros'][ids] / count, np.nan)
+            max_dt = lookup_times(self._time_lookup(), np.where(has_values, stats['max_time'][ids], -1))
+            dictionary['max_dt'] = pd.Series(max_dt).dt.strftime('%Y-%m-%d %H:%M:%S').where(has_values, None)
+            return dictionary
+
+        return cached_artifact('sql_series_summary', self.sql_file, build_summary, SERIES_SUMMARY_VERSION)
+
+    def query_summary(
+            self,
+            name: str | None = None,
+            key: str | None = None,
+            frequency: str | None = None,
+            nonzero: bool = False,
+            sort_by: str = 'max',
+            descending: bool = True,
+            limit: int | None = 50) -> list[dict]:
+        """
+        Filter and rank the series summary, e.g. the zones with the highest peak temperature.
 
-        listquery = 'SELECT "Value","ReportDataDictionaryIndex","TimeIndex" FROM "ReportData" WHERE "ReportDataDictionaryIndex" IN ' + rddi
-        df_query = self._df_query(listquery)
+        Args:
+            name (str | None): Case-insensitive substring of the variable Name.
+            key (str | None): Case-insensitive substring of the KeyValue (zone, surface, meter, ...).
+            frequency (str | None): Reporting frequency (see availseries()); None for every frequency.
+            nonzero (bool): Only variables with at least one value other than 0.
+            sort_by (str): Summary column to sort by (e.g. 'max', 'sum', 'mean', 'zero_fraction').
+            descending (bool): Sort from the largest value.
+            limit (int | None): Maximum number of records; None for all.
 
+        Returns:
+            list[dict]: Summary records (see series_summary()).
+        """
+        summary = self.series_summary()
+        if summary.empty:
+            return []
+        if sort_by not in summary.columns:
+            raise ValueError(f"Cannot sort by {sort_by!r}; expected one of {list(summary.columns)}")
+
+        mask = np.ones(len(summary), dtype=bool)
+        if name:
+            mask &= summary['Name'].fillna('').str.contains(name, case=False, regex=False).to_numpy()
+        if key:
+            mask &= summary['KeyValue'].fillna('').str.contains(key, case=False, regex=False).to_numpy()
+        frequency = normalize_frequency(frequency)
+        if frequency is not None:
+            mask &= (summary['ReportingFrequency'] == frequency).to_numpy()
+        if nonzero:
+            mask &= (summary['zero_fraction'] < 1).to_numpy()
+
+        result = summary[mask].sort_values(sort_by, ascending=not descending, na_position='last', kind='stable')
+        if limit is not None:
+            result = result.head(limit)
+        return result.astype(object).where(result.notna(), None).to_dict('records')
+
+    def meter_rollup(self) -> dict[str, pd.DataFrame]:
+        """
+        Annual and monthly totals and peaks of every meter in the file, with each meter placed in
+        the resource / end-use hierarchy (see parse_meter_name()).
 
-        time = self._maketime()[['TimeIndex', 'dt']]
+        A meter reported at several frequencies is read once, at its finest frequency. All meters
+        are read in one call (see _read_values()) and reduced in a few vectorized passes; the result
+        is stored in the parsed-artifact cache, so it is computed once per file version.
 
-        dfp = pd.merge(left=df_query, right=df, on='ReportDataDictionaryIndex')
+        Only the weather file run periods are summarized, so sizing periods (design days) are not
+        added to the run's totals. A file without a run period, such as a sizing-only run, is
+        summarized over all of its environments instead; 'environments' tells which were used.
 
-        dfp = pd.pivot_table(dfp, columns=['IndexGroup', 'TimestepType', 'KeyValue', 'Name', 'Units'], index='TimeIndex', values='Value')
+        Returns:
+            dict: 'meters': one row per meter with its dictionary columns, the parse_meter_name()
+                  fields, count, annual (sum of its values), peak (largest value), peak_dt and
+                  peak_w (largest J value divided by its interval length in seconds, NaN for
+                  other units and for daily or coarser meters);
+                  'monthly': one row per meter and month with rddid, Name, month, sum, max and max_dt,
+                  for meters reported monthly or finer;
+                  'environments': the EnvironmentPeriods rows, with 'included' set for those summarized.
+        """
+        def build_rollup(sql_file):
+            rank = {x: i for i, x in enumerate(FREQUENCY_ORDER)}
+            finest = {}
+            for record in self.availseries(None):
+                if record['IsMeter'] != 1:
+                    continue
+                current = finest.get(record['Name'])
+                if current is None or rank.get(record['ReportingFrequency'], len(rank)) < rank.get(current['ReportingFrequency'], len(rank)):
+                    finest[record['Name']] = record
+
+            meters = pd.DataFrame(list(finest.values()), columns=RDD_COLUMNS)
+            meters = meters.sort_values('ReportDataDictionaryIndex', ignore_index=True)
+            parsed = pd.DataFrame([parse_meter_name(x) for x in meters['Name']],
+                                  columns=['level', 'resource', 'group', 'end_use', 'subcategory', 'zone'])
+            meters = pd.concat([meters, parsed], axis=1)
+
+            ids = meters['ReportDataDictionaryIndex'].to_numpy(dtype='int64')
+            rdd, time_index, values = self._read_values(ids.tolist())
+            position = np.searchsorted(ids, rdd)
+            timedf = self._maketime()
+            interval = pd.Series(pd.to_numeric(timedf['Interval'], errors='coerce').to_numpy(dtype='float64'),
+                                 index=timedf['TimeIndex'].to_numpy()).reindex(time_index).to_numpy()
+            environment = pd.Series(pd.to_numeric(timedf['EnvironmentPeriodIndex'], errors='coerce').to_numpy(dtype='float64'),
+                                    index=timedf['TimeIndex'].to_numpy()).reindex(time_index).to_numpy()
+
+            environments = self._read_environments()
+            run_periods = environments.loc[environments['EnvironmentType'] == RUN_PERIOD_ENVIRONMENT, 'EnvironmentPeriodIndex']
+            in_run_period = np.isin(environment, run_periods.to_numpy(dtype='float64'))
+            if in_run_period.any():
+                rdd, time_index, values = rdd[in_run_period], time_index[in_run_period], values[in_run_period]
+                position, interval = position[in_run_period], interval[in_run_period]
+                environments['included'] = environments['EnvironmentType'] == RUN_PERIOD_ENVIRONMENT
+            else:
+                environments['included'] = True
+            dt = lookup_times(self._time_lookup(), time_index)
+
+            count = np.bincount(position, minlength=len(ids))
+            has_values = count > 0
+            meters['count'] = count
+            meters['annual'] = np.where(has_values, np.bincount(position, weights=values, minlength=len(ids)), np.nan)
+            meters['peak'] = np.nan
+            meters['peak_dt'] = None
+            meters['peak_w'] = np.nan
+            if has_values.any():
+                groups, codes = np.unique(position, return_inverse=True)
+                result = aggregate_values(values, codes, len(groups), ['max'], [], dt)
+                meters.loc[groups, 'peak'] = result['max']
+                meters.loc[groups, 'peak_dt'] = pd.Series(result['max_dt']).dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+
+                # demand of energy meters reported at less than a day: J per interval -> W
+                rate = (meters['Units'].to_numpy()[position] == 'J') & (interval > 0) & (interval < 24 * 60)
+                if rate.any():
+                    groups, codes = np.unique(position[rate], return_inverse=True)
+                    demand = values[rate] / (interval[rate] * 60)
+                    meters.loc[groups, 'peak_w'] = aggregate_values(demand, codes, len(groups), ['max'], [], dt[rate])['max']
+
+            meters['peak_dt'] = meters['peak_dt'].where(meters['peak_dt'].notna(), None)
+
+            frequencies = meters['ReportingFrequency'].map(rank).fillna(len(rank)).to_numpy()
+            monthly = ~np.isnat(dt) & (frequencies[position] <= rank['Monthly'])
+            if monthly.any():
+                month = dt[monthly].astype('datetime64[M]').astype('int64') % 12
+                groups, codes = np.unique(position[monthly] * 12 + month, return_inverse=True)
+                result = aggregate_values(values[monthly], codes, len(groups), ['sum', 'max'], [], dt[monthly])
+                rows = groups // 12
+                months = pd.DataFrame({
+                    'rddid': ids[rows],
+                    'Name': meters['Name'].to_numpy()[rows],
+                    'month': groups % 12 + 1,
+                    'sum': result['sum'],
+                    'max': result['max'],
+                    'max_dt': pd.Series(result['max_dt']).dt.strftime('%Y-%m-%d %H:%M:%S'),
+                })
+            else:
+                months = pd.DataFrame(columns=['rddid', 'Name', 'month', 'sum', 'max', 'max_dt'])
+            return {'meters': meters, 'monthly': months, 'environments': environments}
 
-        timedict = time.set_index('TimeIndex').to_dict()['dt']
+        return cached_artifact('sql_meter_rollup', self.sql_file, build_rollup, METER_ROLLUP_VERSION)
 
-        dfp = dfp.reset_index()
+    def _read_environments(self) -> pd.DataFrame:
+        """
+        The EnvironmentPeriods table (design days and run periods of the simulation).
+        Returns:
+            pd.DataFrame: EnvironmentPeriodIndex, EnvironmentName and EnvironmentType; empty if the file has none.
+        """
+        try:
+            df = self._df_query('SELECT "EnvironmentPeriodIndex", "EnvironmentName", "EnvironmentType" '
+                                'FROM "EnvironmentPeriods" ORDER BY "EnvironmentPeriodIndex"')
+        except (pd.errors.DatabaseError, sqlite3.Error):
+            df = pd.DataFrame(columns=['EnvironmentPeriodIndex', 'EnvironmentName', 'EnvironmentType'])
+        return df
 
-        dfp['dt'] = dfp.apply(lambda x: timedict[int(x['TimeIndex'].values[0])], axis=1)
+    def query_meters(self, fuel: str | None = None, end_use: str | None = None, level: str | None = None,
+                     by: str = 'annual') -> dict:
+        """
+        Meter totals and peaks with the site's fuel and end-use splits, from meter_rollup().
 
-        dfp = dfp.set_index('dt', drop=True)
+        Args:
+            fuel (str | None): Resource of the meters, e.g. 'Electricity', 'NaturalGas' (case-insensitive).
+            end_use (str | None): End use of the meters, e.g. 'InteriorLights', 'Heating' (case-insensitive).
+            level (str | None): 'facility', 'group', 'end_use', 'subcategory' or 'custom'.
+            by (str): 'annual' for one record per meter, or 'month' for one record per meter and month.
 
-        dfp = dfp.drop("TimeIndex", axis=1)
+        Returns:
+            dict: 'meters': the matching meter records;
+                  'fuel_split': {resource: share of site energy}, from the J facility meters
+                  (leaving out NON_ENERGY_RESOURCES);
+                  'end_use_split': {resource: {end use: share of that resource}}, from the
+                  whole-building end-use meters;
+                  'environments': names of the environments summarized (see meter_rollup()).
+        """
+        if by not in ('annual', 'month'):
+            raise ValueError(f"Unknown grouping {by!r}; expected 'annual' or 'month'")
+        rollup = self.meter_rollup()
+        meters = rollup['meters']
+        environments = rollup['environments']
+        environments = environments.loc[environments['included'].astype(bool), 'EnvironmentName'].tolist()
+        if meters.empty:
+            return {'meters': [], 'fuel_split': {}, 'end_use_split': {}, 'environments': environments}
+
+        energy = (meters['Units'] == 'J') & ~meters['resource'].isin(NON_ENERGY_RESOURCES) & meters['annual'].notna()
+        site = meters[energy & (meters['level'] == 'facility')]
+        total = site['annual'].sum()
+        fuel_split = {x: y / total for x, y in zip(site['resource'], site['annual'])} if total > 0 else {}
+
+        end_use_split = {}
+        end_uses = meters[energy & (meters['level'] == 'end_use') & meters['zone'].isna()]
+        for resource, group in end_uses.groupby('resource', sort=False):
+            resource_total = group['annual'].sum()
+            if resource_total > 0:
+                end_use_split[resource] = {x: y / resource_total for x, y in zip(group['end_use'], group['annual'])}
+
+        mask = np.ones(len(meters), dtype=bool)
+        if fuel:
+            mask &= (meters['resource'].fillna('').str.lower() == fuel.lower()).to_numpy()
+        if end_use:
+            mask &= (meters['end_use'].fillna('').str.lower() == end_use.lower()).to_numpy()
+        if level:
+            mask &= (meters['level'] == level).to_numpy()
+        result = meters[mask]
+        if by == 'month':
+            fields = ['rddid', 'resource', 'end_use', 'level', 'Units', 'ReportingFrequency']
+            labels = result.rename(columns={'ReportDataDictionaryIndex': 'rddid'})[fields]
+            result = rollup['monthly'].merge(labels, on='rddid')
+        else:
+            result = result.drop(columns=['IsMeter', 'Type', 'IndexGroup', 'TimestepType', 'ScheduleName'])
+        if fuel:
+            end_use_split = {x: y for x, y in end_use_split.items() if x.lower() == fuel.lower()}
+        return {
+            'meters': result.astype(object).where(result.notna(), None).to_dict('records'),
+            'fuel_split': fuel_split,
+            'end_use_split': end_use_split,
+            'environments': environments,
+        }
 
-        idx = pd.MultiIndex.from_tuples(list(dfp.columns))
+    def old_getseries(self, df: pd.DataFrame):
+        """
+        Given a filtered DataFrame, return the corresponding time series as a DataFrame with a datetime index.
+        Args:
+            df (pd.DataFrame | list[dict]): Filtered series from queryseries / availseries.
+        Returns:
+            pd.DataFrame: Pivoted DataFrame with datetime index and multi-index columns.
+        """
+        df = pd.DataFrame(df)
+
+        rdd, time_index, value = self._read_values([int(x) for x in df['ReportDataDictionaryIndex']])
+        df_query = pd.DataFrame({'Value': value, 'ReportDataDictionaryIndex': rdd, 'TimeIndex': time_index})
+
+        dfp = pd.merge(left=df_query, right=df, on='ReportDataDictionaryIndex')
+
+        # pivot_table drops a variable whose label has a null part (e.g. no Units)
+        label_columns = ['IndexGroup', 'TimestepType', 'KeyValue', 'Name', 'Units']
+        dfp[label_columns] = dfp[label_columns].fillna('')
+        dfp = pd.pivot_table(dfp, columns=label_columns, index='TimeIndex', values='Value')
 
-        dfp.columns = idx
+        dfp.index = pd.DatetimeIndex(lookup_times(self._time_lookup(), dfp.index.to_numpy()), name='dt')
+
+        dfp.columns = pd.MultiIndex.from_tuples(list(dfp.columns))
 
         return dfp
+
+
+def align_series(
+    sql_files: dict[str, str],
+    name: str,
+    key: str | None = None,
+    frequency: str | None = 'Hourly',
+    max_workers: int | None = None,
+    as_arrow: bool = False
+) -> pd.DataFrame | pa.Table:
+    """
+    Read the same variable from many SQL files (e.g. the runs of a parametric study) into one
+    table with a shared time index and one column per run.
+
+    Files are read in a thread pool: SQLite and NumPy release the GIL while reading, and each
+    thread checks out its own connection from the pool (see src/connections.py). The variable
+    is resolved by name and key in each file (see SqlTimeseries.find_series()), since its RDD
+    ID can differ between runs. Runs with identical timestamps are stacked directly; otherwise
+    the index is the union of the runs' timestamps, with NaN where a run has no value. A
+    timestamp repeated within a run (e.g. a sizing period and the run period on the same day)
+    is aligned by its occurrence.
+
+    Args:
+        sql_files (dict[str, str]): {column name (e.g. model_id): SQL file path}.
+        name (str): Variable or meter name.
+        key (str | None): KeyValue; may be omitted for names with a single key.
+        frequency (str | None): Reporting frequency (see SqlTimeseries.availseries()).
+        max_workers (int | None): Threads; defaults to SERIES_READ_WORKERS.
+        as_arrow (bool): Return a pyarrow Table with a 'dt' column instead of a DataFrame.
+
+    Returns:
+        pd.DataFrame | pa.Table: Columns in the order of sql_files, indexed by 'dt'. Runs that
+            could not be read (missing variable, unreadable file) are left out and listed with
+            the reason in attrs['missing'] (DataFrame) or the 'missing' schema metadata (Table).
+    """
+    def read_run(sql_file):
+        # one variable per file: building a row index would cost more than the scan it saves
+        timeseries = SqlTimeseries(sql_file=sql_file, row_index='read')
+        series = timeseries.get_series(timeseries.find_series(name, key, frequency))
+        return series.dt, series.values
+
+    runs, missing = {}, {}
+    workers = max(1, min(max_workers or SERIES_READ_WORKERS, len(sql_files) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {column: pool.submit(read_run, sql_file) for column, sql_file in sql_files.items()}
+        for column, future in futures.items():
+            try:
+                runs[column] = future.result()
+            except (ValueError, OSError, sqlite3.Error) as e:
+                missing[column] = str(e)
+
+    if missing:
+        print(f'{len(missing)} of {len(sql_files)} runs have no {name} series', file=sys.stderr)
+
+    columns = list(runs)
+    dts = [runs[c][0] for c in columns]
+    if dts and all(np.array_equal(dts[0], dt) for dt in dts[1:]):
+        df = pd.DataFrame(np.column_stack([runs[c][1] for c in columns]), columns=columns,
+                          index=pd.DatetimeIndex(dts[0], name='dt'))
+    elif dts:
+        parts = []
+        for column in columns:
+            dt, values = runs[column]
+            occurrence = pd.Series(dt).groupby(dt).cumcount().to_numpy()
+            parts.append(pd.Series(values, index=pd.MultiIndex.from_arrays([dt, occurrence]), name=column))
+        df = pd.concat(parts, axis=1).sort_index()
+        df.index = pd.DatetimeIndex(df.index.get_level_values(0), name='dt')
+    else:
+        df = pd.DataFrame(index=pd.DatetimeIndex([], name='dt'))
+
+    if as_arrow:
+        table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+        return table.replace_schema_metadata({'missing': json.dumps(missing)})
+    df.attrs['missing'] = missing
+    return df
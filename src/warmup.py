@@ -0,0 +1,120 @@
+'''
+background warm-up of the resident model map and the data of recently used models.
+
+Without a warm-up, the first tool call after the server starts pays for the directory walk,
+reading the model map cache, opening SQLite files and parsing HTML reports. start_warmup()
+does that work in a daemon thread while the server waits for its first request, so the
+first call costs about the same as any later one.
+
+Only the model map load is serialized with tool calls: a call that arrives while the warm-up
+is loading the map waits on the resident map lock and then uses the loaded map. The per-model
+loads are not locked. A call that needs a model the warm-up is still reading parses its
+dictionary, time index and HTML tables again, and only the sidecar row index is built once:
+while the warm-up holds the file's cache lock for the build, the call scans ReportData instead.
+
+Progress and errors go to stderr: with the stdio transport, stdout is the JSON-RPC channel.
+'''
+
+import sys
+import time
+import threading
+
+from src import WARMUP_MODE, WARMUP_RECENT_MODELS
+from src.connections import get_connection_pool
+from src.model_data import ModelFileData, get_resident_model_map
+from src.monitor import get_recent_model_ids
+
+
+def warm_model(model: ModelFileData) -> None:
+    """
+    Open and pre-parse the files of one model.
+
+    Opens a pooled SQL connection, reads the hourly series dictionary, time index and row index, and
+    parses the HTML report tables (read from the parsed-artifact cache when available).
+    epJSON files are left alone: they are only parsed by the epJSON tools, and can be large.
+
+    Args:
+        model (ModelFileData): A hydrated model from the resident ModelMap.
+    """
+    if model.sql_data is not None:
+        timeseries = model.sql_data.get_timeseries()
+        # the dictionary and time index may come from caches; open a connection regardless
+        get_connection_pool().prewarm(model.sql_data.file_path)
+        timeseries.availseries()
+        timeseries._maketime()
+        # builds the sidecar row index on a file's first warm-up
+        timeseries._row_index()
+
+    if model.html_data is not None:
+        model.html_data.get_data()
+
+
+def warm_up(directory: str, mode: str | None = None, n_models: int | None = None) -> dict:
+    """
+    Load the resident ModelMap for a directory and warm the most recently used models.
+
+    Args:
+        directory (str): Directory containing EnergyPlus model files.
+        mode (str | None): 'off', 'map' or 'recent'. Defaults to WARMUP_MODE.
+        n_models (int | None): Number of recent models to warm. Defaults to WARMUP_RECENT_MODELS.
+
+    Returns:
+        dict: Summary with the warmed model ids, the ids that failed, and the elapsed seconds.
+    """
+    if mode is None:
+        mode = WARMUP_MODE
+    if n_models is None:
+        n_models = WARMUP_RECENT_MODELS
+
+    start = time.perf_counter()
+    summary = {'directory': directory, 'models': [], 'failed': [], 'seconds': 0.0}
+    if mode == 'off':
+        return summary
+
+    model_map = get_resident_model_map(directory)
+
+    if mode == 'recent' and n_models > 0:
+        for model_id in get_recent_model_ids(limit=n_models):
+            model = model_map.get_model_by_id(model_id)
+            if model is None:
+                # used with a different directory, or removed since
+                continue
+            try:
+                warm_model(model)
+                summary['models'].append(model_id)
+            except Exception as e:
+                # a broken file should fail the tool call that needs it, not the warm-up
+                print(f'warm-up failed for {model_id}: {e}', file=sys.stderr)
+                summary['failed'].append(model_id)
+
+    summary['seconds'] = time.perf_counter() - start
+    print(f"warm-up done: model map and {len(summary['models'])} models in {summary['seconds']:.2f} s", file=sys.stderr)
+    return summary
+
+
+def start_warmup(directory: str, mode: str | None = None, n_models: int | None = None) -> threading.Thread | None:
+    """
+    Run warm_up() in a background daemon thread.
+
+    Args:
+        directory (str): Directory containing EnergyPlus model files.
+        mode (str | None): 'off', 'map' or 'recent'. Defaults to WARMUP_MODE.
+        n_models (int | None): Number of recent models to warm. Defaults to WARMUP_RECENT_MODELS.
+
+    Returns:
+        threading.Thread | None: The started thread, or None if the warm-up is off.
+    """
+    if mode is None:
+        mode = WARMUP_MODE
+    if mode == 'off':
+        return None
+
+    def run():
+        try:
+            warm_up(directory, mode=mode, n_models=n_models)
+        except Exception as e:
+            print(f'warm-up failed: {e}', file=sys.stderr)
+
+    thread = threading.Thread(target=run, name='eplus-warmup', daemon=True)
+    thread.start()
+    return thread
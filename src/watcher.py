@@ -0,0 +1,221 @@
+"""
+filesystem watchers that report model file changes under a directory tree.
+
+CatalogWatcher calls on_change(kind, path) from a background thread, where kind is
+'added', 'modified', 'removed' or 'rescan' (the watcher lost track of events and the
+whole tree should be re-checked). Linux uses inotify through libc; everywhere else,
+or if inotify is unavailable, the tree is polled with update_snapshot().
+"""
+
+import os
+import sys
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Literal
+
+from src.scanner import is_catalog_file
+
+
+WATCH_MODES = Literal['auto', 'inotify', 'poll']
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+    IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc():
+    """Return libc with the inotify functions, or None if they are not available."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+def inotify_available() -> bool:
+    return _load_libc() is not None
+
+
+class CatalogWatcher:
+    """
+    Watch a directory tree for changes to EnergyPlus model files.
+
+    Args:
+        directory (str): Root of the tree to watch.
+        on_change (callable): Called as on_change(kind, path) for each change.
+        mode (str): 'inotify', 'poll', or 'auto' (inotify where available, else poll).
+        poll_interval (float): Seconds between polls in poll mode.
+        snapshot (dict | None): Snapshot (see model_data.snapshot_directory()) poll mode starts
+                                from, e.g. the one the catalog was built from, so changes made
+                                before start() are reported too. Taken at start() if not given.
+
+    Only files that a scan would catalog (see scanner.is_catalog_file()) are reported.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            on_change: Callable[[str, str], None],
+            mode: WATCH_MODES = 'auto',
+            poll_interval: float = 2.0,
+            snapshot: dict | None = None):
+
+        self.directory = os.path.abspath(directory)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+
+        self._libc = _load_libc() if mode in ('auto', 'inotify') else None
+        if mode == 'inotify' and self._libc is None:
+            raise OSError('inotify is not available on this platform')
+        self.mode = 'inotify' if self._libc is not None else 'poll'
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = None
+        self._watches = {}  # wd -> directory path
+        self._snapshot = snapshot
+
+    def start(self) -> 'CatalogWatcher':
+        if self._thread is not None:
+            return self
+        if self.mode == 'inotify':
+            self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._fd < 0:
+                raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+            self._add_tree(self.directory)
+            target = self._run_inotify
+        else:
+            if self._snapshot is None:
+                # imported here: model_data imports this module
+                from src.model_data import snapshot_directory
+                self._snapshot = snapshot_directory(self.directory)
+            target = self._run_poll
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, name=f'catalog-watcher:{self.directory}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._watches.clear()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _is_model_file(self, path: str) -> bool:
+        # the scanner's classifier, so watched changes match what a rescan would catalog
+        return is_catalog_file(os.path.basename(path))
+
+    def _emit(self, kind: str, path: str) -> None:
+        try:
+            self.on_change(kind, path)
+        except Exception as e:
+            print(f'catalog watcher callback failed for {kind} {path}: {type(e).__name__}: {e}', file=sys.stderr)
+
+    # inotify
+
+    def _add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                print(f'inotify watch limit reached, changes under {path} will not be seen', file=sys.stderr)
+            return
+        self._watches[wd] = path
+
+    def _add_tree(self, root: str, report: bool = False) -> None:
+        """Watch root and all subdirectories; optionally report the model files found."""
+        for dirpath, dirnames, filenames in os.walk(root):
+            # like the scanner, skip hidden directories and files
+            dirnames[:] = [x for x in dirnames if not x.startswith('.')]
+            self._add_watch(dirpath)
+            if report:
+                for filename in filenames:
+                    if not filename.startswith('.') and self._is_model_file(filename):
+                        self._emit('added', os.path.join(dirpath, filename))
+
+    def _run_inotify(self) -> None:
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._fd], [], [], 0.5)
+            if not ready:
+                continue
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            self._handle_events(buffer)
+
+    def _handle_events(self, buffer: bytes) -> None:
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._emit('rescan', self.directory)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            parent = self._watches.get(wd)
+            if parent is None or not name or name.startswith(b'.'):
+                # hidden entries are not cataloged (see scanner._list_directory())
+                continue
+            path = os.path.join(parent, os.fsdecode(name))
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path, report=True)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._emit('removed', path)
+            elif self._is_model_file(path):
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    self._emit('modified', path)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._emit('removed', path)
+
+    # polling
+
+    def _run_poll(self) -> None:
+        from src.model_data import update_snapshot
+
+        while not self._stop.wait(self.poll_interval):
+            self._snapshot, changes = update_snapshot(self._snapshot)
+            for kind in ('removed', 'added', 'modified'):
+                for path in changes[kind]:
+                    self._emit(kind, path)
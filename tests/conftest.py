@@ -1,6 +1,16 @@
+import os
+import atexit
+import shutil
+import tempfile
 import pytest
 from pathlib import Path
-from src.model_data import catalog_path, get_model_map, ModelMap, ModelFileData
+
+# keep parsed-artifact shards written by tests out of the real mcp_cache
+_TEST_CACHE_DIRECTORY = tempfile.mkdtemp(prefix="eplus_mcp_cache_")
+os.environ["EPLUS_MCP_CACHE_DIRECTORY"] = _TEST_CACHE_DIRECTORY
+atexit.register(shutil.rmtree, _TEST_CACHE_DIRECTORY, ignore_errors=True)
+
+from src.model_data import catalog_path, get_model_map, ModelMap, ModelFileData, clear_resident_model_maps
 
 EXAMPLE_DIR = str(Path(__file__).parent.parent / "example-files")
 
@@ -28,3 +38,28 @@ def buffalo_model(model_map) -> ModelFileData:
 def atlanta_dd_model(model_map) -> ModelFileData:
     """Design-day Atlanta model (SQL + HTML only, no epJSON)."""
     return model_map.get_model_by_id("./ASHRAE901_HotelLarge_STD2013_Atlanta.dd")
+
+
+def touch(path, text="{}"):
+    """Write a small file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def runs_dir(tmp_path, request):
+    """
+    A model directory with runs/<run>/eplusout.epJSON for each run in the test module's RUNS
+    (default: run1). Resident model maps loaded from it are dropped afterwards.
+    """
+    for run in getattr(request.module, "RUNS", ("run1",)):
+        touch(str(tmp_path / "runs" / run / "eplusout.epJSON"))
+    yield str(tmp_path / "runs")
+    clear_resident_model_maps()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """An empty sharded cache directory."""
+    return str(tmp_path / "cache")
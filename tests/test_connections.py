@@ -0,0 +1,94 @@
+"""Tests for the pool of read-only SQLite connections."""
+
+import os
+import pickle
+import sqlite3
+import threading
+import pytest
+from src.connections import SqlConnectionPool, open_readonly, sqlite_uri
+from src.tools.func_sql import SqlTimeseries
+
+
+def make_sql(path, value=1):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def sql_files(tmp_path):
+    return [make_sql(tmp_path / f"run {i}.sql", value=i) for i in range(3)]
+
+
+def test_uri_is_read_only(sql_files):
+    assert sqlite_uri(sql_files[0]).endswith("?mode=ro&immutable=1")
+    assert "run%201.sql" in sqlite_uri(sql_files[1], immutable=False)
+
+    conn = open_readonly(sql_files[0])
+    assert conn.execute("SELECT x FROM t").fetchall() == [(0,)]
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO t VALUES (5)")
+    conn.close()
+
+    with pytest.raises(FileNotFoundError):
+        open_readonly(os.path.join(os.path.dirname(sql_files[0]), "missing.sql"))
+
+
+def test_connections_are_reused(sql_files):
+    pool = SqlConnectionPool(max_connections=4)
+    with pool.connection(sql_files[0]) as first:
+        pass
+    with pool.connection(sql_files[0]) as second:
+        assert second is first
+        # a second concurrent reader of the same file gets its own connection
+        with pool.connection(sql_files[0]) as other:
+            assert other is not first
+    assert pool.idle_count(sql_files[0]) == 2
+    assert pool.open_count == 2
+    pool.close_all()
+    assert pool.open_count == 0
+
+
+def test_open_connections_are_capped(sql_files):
+    pool = SqlConnectionPool(max_connections=2)
+    for sql_file in sql_files:
+        with pool.connection(sql_file):
+            pass
+    # the least recently used file's connection was closed to open the third
+    assert pool.open_count == 2
+    assert pool.idle_count(sql_files[0]) == 0
+    assert pool.idle_count(sql_files[2]) == 1
+
+    # with every connection checked out, a third reader waits for one to be returned
+    a, b = pool.acquire(sql_files[1]), pool.acquire(sql_files[2])
+    with pytest.raises(TimeoutError):
+        pool.acquire(sql_files[0], timeout=0.05)
+    threading.Timer(0.05, pool.release, (a,)).start()
+    conn = pool.acquire(sql_files[0], timeout=5)
+    assert conn.execute("SELECT x FROM t").fetchall() == [(0,)]
+    pool.release(conn)
+    pool.release(b)
+    assert pool.open_count == 2
+
+
+def test_changed_file_gets_new_connection(tmp_path):
+    sql_file = make_sql(tmp_path / "eplusout.sql", value=1)
+    pool = SqlConnectionPool()
+    with pool.connection(sql_file) as conn:
+        old = conn
+
+    os.remove(sql_file)
+    make_sql(tmp_path / "eplusout.sql", value=2)
+    with pool.connection(sql_file) as conn:
+        assert conn is not old
+        assert conn.execute("SELECT x FROM t").fetchall() == [(2,)]
+    assert pool.idle_count(sql_file) == 1
+
+
+def test_timeseries_pickles_without_connection(sql_files):
+    timeseries = SqlTimeseries(sql_file=sql_files[1], columnar="off")
+    assert timeseries._exec_query("SELECT x FROM t") == [(1,)]
+    restored = pickle.loads(pickle.dumps(timeseries))
+    assert restored._exec_query("SELECT x FROM t WHERE x = ?", params=(1,)) == [(1,)]
@@ -0,0 +1,197 @@
+"""Tests for the sharded on-disk model map cache."""
+
+import os
+import pytest
+from src.cache import ShardedCache, cached_artifact
+from src.model_data import (
+    initialize_model_map_from_directory,
+    read_or_initialize_model_map,
+    read_model_map_from_cache,
+    search_cached_catalog,
+)
+from tests.conftest import touch
+
+
+# runs in the runs_dir fixture (see conftest.py)
+RUNS = ("run1", "run2", "run3")
+
+
+def _shard_keys(cache_dir, runs_dir):
+    return ShardedCache(cache_dir).read_index(runs_dir)["models"]
+
+
+def test_initialize_writes_one_shard_per_model(runs_dir, cache_dir):
+    model_map = initialize_model_map_from_directory(runs_dir, cache_dir)
+    keys = _shard_keys(cache_dir, runs_dir)
+    assert sorted(keys) == sorted(model_map.get_all_model_ids())
+    assert len(os.listdir(os.path.join(cache_dir, "models"))) == 3
+
+
+def test_read_model_map_from_cache(runs_dir, cache_dir):
+    initialize_model_map_from_directory(runs_dir, cache_dir)
+    model_map = read_model_map_from_cache(runs_dir, cache_dir)
+    assert sorted(model_map.get_all_model_ids()) == ["run1/eplusout", "run2/eplusout", "run3/eplusout"]
+
+
+def test_read_model_map_from_cache_missing(runs_dir, cache_dir):
+    with pytest.raises(FileNotFoundError):
+        read_model_map_from_cache(runs_dir, cache_dir)
+
+
+def test_only_changed_model_shard_is_rewritten(runs_dir, cache_dir):
+    initialize_model_map_from_directory(runs_dir, cache_dir)
+    before = _shard_keys(cache_dir, runs_dir)
+
+    touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"), text='{"Zone": {}}')
+    touch(os.path.join(runs_dir, "run4", "eplusout.sql"), text="")
+    os.remove(os.path.join(runs_dir, "run3", "eplusout.epJSON"))
+    model_map = read_or_initialize_model_map(runs_dir, cache_dir)
+
+    after = _shard_keys(cache_dir, runs_dir)
+    assert sorted(model_map.get_all_model_ids()) == ["run1/eplusout", "run2/eplusout", "run4/eplusout"]
+    assert after["run1/eplusout"] == before["run1/eplusout"]
+    assert after["run2/eplusout"] != before["run2/eplusout"]
+    assert "run3/eplusout" not in after
+    # stale shards are removed along with the index entry
+    assert len(os.listdir(os.path.join(cache_dir, "models"))) == 3
+
+
+def test_missing_shard_is_rebuilt(runs_dir, cache_dir):
+    initialize_model_map_from_directory(runs_dir, cache_dir)
+    key = _shard_keys(cache_dir, runs_dir)["run1/eplusout"]
+    os.remove(ShardedCache(cache_dir)._model_path(key))
+    os.remove(ShardedCache(cache_dir)._catalog_path(runs_dir))
+    model_map = read_or_initialize_model_map(runs_dir, cache_dir)
+    assert model_map.get_model_by_id("run1/eplusout") is not None
+    assert ShardedCache(cache_dir).read_model(key) is not None
+
+
+def test_cached_artifact_invalidated_by_file_change(tmp_path):
+    cache = ShardedCache(str(tmp_path / "cache"))
+    path = str(tmp_path / "model.epJSON")
+    calls = []
+
+    def loader(file_path):
+        calls.append(file_path)
+        with open(file_path) as f:
+            return f.read()
+
+    touch(path, text="{}")
+    assert cached_artifact("epjson", path, loader, 1, cache) == "{}"
+    assert cached_artifact("epjson", path, loader, 1, cache) == "{}"
+    assert len(calls) == 1
+
+    touch(path, text='{"Zone": {}}')
+    assert cached_artifact("epjson", path, loader, 1, cache) == '{"Zone": {}}'
+    assert len(calls) == 2
+
+    # a new loader version does not read the old version's shard
+    assert cached_artifact("epjson", path, lambda file_path: "v2", 2, cache) == "v2"
+    assert cached_artifact("epjson", path, loader, 1, cache) == '{"Zone": {}}'
+    assert len(calls) == 2
+
+
+def test_copied_file_reuses_artifact(tmp_path):
+    cache = ShardedCache(str(tmp_path / "cache"))
+    calls = []
+
+    def loader(file_path):
+        calls.append(file_path)
+        return file_path
+
+    original = str(tmp_path / "run1" / "model.epJSON")
+    copy = str(tmp_path / "run1_copy" / "model.epJSON")
+    touch(original, text='{"Zone": {}}')
+    touch(copy, text='{"Zone": {}}')
+
+    assert cached_artifact("epjson", original, loader, 1, cache) == original
+    assert cached_artifact("epjson", copy, loader, 1, cache) == original
+    assert calls == [original]
+
+
+def test_content_fingerprint_is_memoized_on_disk(tmp_path):
+    cache_root = str(tmp_path / "cache")
+    path = str(tmp_path / "model.sql")
+    touch(path, text="x" * 100)
+    first = ShardedCache(cache_root).content_fingerprint(path)
+    assert first.startswith("full:")
+    assert os.listdir(os.path.join(cache_root, "fingerprints"))
+    # a fresh cache object (new process) reads the memoized value
+    assert ShardedCache(cache_root).content_fingerprint(path) == first
+    touch(path, text="y" * 100)
+    assert ShardedCache(cache_root).content_fingerprint(path) != first
+
+
+def test_sampled_fingerprint_ignores_middle_of_large_files(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.cache.SAMPLE_BLOCK_SIZE", 4)
+    a = str(tmp_path / "a.sql")
+    b = str(tmp_path / "b.sql")
+    touch(a, text="head" + "1" * 10 + "tail")
+    touch(b, text="head" + "2" * 10 + "tail")
+    cache = ShardedCache(str(tmp_path / "cache"))
+    assert cache.content_fingerprint(a, mode="sampled") == cache.content_fingerprint(b, mode="sampled")
+    assert cache.content_fingerprint(a, mode="full") != cache.content_fingerprint(b, mode="full")
+
+
+@pytest.mark.parametrize("codec", ["pickle", "gzip", "zstd", "lz4"])
+def test_codecs_round_trip(tmp_path, codec):
+    cache = ShardedCache(str(tmp_path / "cache"), codec=codec)
+    payload = {"tables": [{"report_for": "Entire Facility", "table_data": [["a", 1.5]] * 50}]}
+    cache.write_artifact("html_tables", "k", payload)
+    assert cache.read_artifact("html_tables", "k") == payload
+
+
+def test_corrupt_shard_reads_as_missing(tmp_path):
+    cache = ShardedCache(str(tmp_path / "cache"), codec="zstd")
+    cache.write_model("k", {"model_id": "run1/eplusout"})
+    with open(cache._model_path("k"), "wb") as f:
+        f.write(b"not a shard")
+    assert cache.read_model("k") is None
+    assert not os.path.exists(cache._model_path("k"))
+
+
+def test_search_cached_catalog(runs_dir, cache_dir):
+    initialize_model_map_from_directory(runs_dir, cache_dir)
+    results = search_cached_catalog(runs_dir, "RUN2", cache_dir)
+    assert [x["model_id"] for x in results] == ["run2/eplusout"]
+    assert results[0]["epjson"] == os.path.join(runs_dir, "run2", "eplusout.epJSON")
+    assert len(search_cached_catalog(runs_dir, None, cache_dir)) == 3
+
+
+def test_writes_leave_no_temp_files(runs_dir, cache_dir):
+    initialize_model_map_from_directory(runs_dir, cache_dir)
+    for dirpath, _, names in os.walk(cache_dir):
+        assert not [x for x in names if x.startswith(".tmp-")], dirpath
+
+
+def test_cache_lock_is_reentrant_and_exclusive(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    lock = ShardedCache(str(tmp_path / "cache")).lock(str(tmp_path / "runs"))
+    with lock:
+        assert lock.acquire(blocking=False)
+        lock.release()
+
+    # another holder (separate open file, as another process would have) blocks us out
+    with open(lock.path, "a+b") as other:
+        fcntl.flock(other, fcntl.LOCK_EX)
+        assert not lock.acquire(blocking=False)
+        assert not lock.acquire(timeout=0.1)
+        fcntl.flock(other, fcntl.LOCK_UN)
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+def test_update_skips_write_while_locked(runs_dir, cache_dir):
+    fcntl = pytest.importorskip("fcntl")
+    initialize_model_map_from_directory(runs_dir, cache_dir)
+    before = _shard_keys(cache_dir, runs_dir)
+    touch(os.path.join(runs_dir, "run4", "eplusout.sql"), text="")
+
+    lock = ShardedCache(cache_dir).lock(runs_dir)
+    with open(lock.path, "a+b") as other:
+        fcntl.flock(other, fcntl.LOCK_EX)
+        model_map = read_or_initialize_model_map(runs_dir, cache_dir)
+        fcntl.flock(other, fcntl.LOCK_UN)
+
+    assert "run4/eplusout" in model_map.get_all_model_ids()
+    assert _shard_keys(cache_dir, runs_dir) == before
@@ -1,6 +1,7 @@
 """Tests for model discovery via catalog_path() and ModelMap."""
 
-from src.model_data import catalog_path, get_model_map
+from src.model_data import catalog_path, get_model_map, ModelMap, ModelFileData
+from src.scanner import classify_artifact, scan_directory
 from tests.conftest import EXAMPLE_DIR
 
 
@@ -48,6 +49,48 @@ def test_search_models_none_returns_all(model_map):
     assert len(results) == 4
 
 
+def test_search_models_short_and_case_insensitive(model_map):
+    assert len(model_map.search_models("bUfFaLo")) == 2
+    assert len(model_map.search_models("dd")) == 2
+    assert model_map.search_models("nomatch") == []
+
+
+def test_search_index_follows_add_and_remove():
+    model_map = ModelMap()
+    for stem in ("alpha_run", "beta_run", "alpha_copy"):
+        model_map._add_model(ModelFileData(model_id=f"runs/{stem}", directory="runs", stem=stem))
+    assert [m.stem for m in model_map.search_models("alpha")] == ["alpha_run", "alpha_copy"]
+    model_map._remove_model("runs/alpha_run")
+    assert [m.stem for m in model_map.search_models("alpha")] == ["alpha_copy"]
+    assert model_map.get_model_by_id("runs/alpha_run") is None
+    assert ModelMap().search_models("alpha") == []
+
+
+def test_models_hydrate_on_first_use():
+    model_map = get_model_map(catalog_path(EXAMPLE_DIR))
+    assert model_map.get_hydrated_model_ids() == []
+    assert len(model_map.get_all_basic_attributes()) == 4
+    model = model_map.get_model_by_id("./ASHRAE901_HotelLarge_STD2013_Atlanta.dd")
+    assert model_map.get_hydrated_model_ids() == ["./ASHRAE901_HotelLarge_STD2013_Atlanta.dd"]
+    assert model_map.get_model_by_id("./ASHRAE901_HotelLarge_STD2013_Atlanta.dd") is model
+
+
+def test_hydrated_models_are_evicted_lru():
+    model_map = get_model_map(catalog_path(EXAMPLE_DIR))
+    model_map.max_hydrated = 2
+    ids = model_map.get_all_model_ids()
+    first = model_map.get_model_by_id(ids[0])
+    model_map.get_model_by_id(ids[1])
+    model_map.get_model_by_id(ids[0])
+    model_map.get_model_by_id(ids[2])
+    assert model_map.get_hydrated_model_ids() == [ids[0], ids[2]]
+    model_map.get_model_by_id(ids[3])
+    assert ids[0] not in model_map.get_hydrated_model_ids()
+    rehydrated = model_map.get_model_by_id(ids[0])
+    assert rehydrated is not first
+    assert rehydrated.get_basic_attributes() == first.get_basic_attributes()
+
+
 def test_get_basic_attributes(atlanta_model):
     attrs = atlanta_model.get_basic_attributes()
     assert attrs["model_id"] == "./ASHRAE901_HotelLarge_STD2013_Atlanta"
@@ -62,3 +105,36 @@ def test_get_all_model_ids(model_map):
     assert len(ids) == 4
     assert "./ASHRAE901_HotelLarge_STD2013_Atlanta" in ids
     assert "./ASHRAE901_HotelLarge_STD2013_Buffalo" in ids
+
+
+def test_get_sql_files_without_hydrating(model_map):
+    model_map.release_hydrated_models()
+    sql_files = model_map.get_sql_files(pattern="dd")
+    assert sorted(sql_files) == ["./ASHRAE901_HotelLarge_STD2013_Atlanta.dd", "./ASHRAE901_HotelLarge_STD2013_Buffalo.dd"]
+    assert all(x.endswith(".dd.sql") for x in sql_files.values())
+    assert model_map.get_hydrated_model_ids() == []
+    assert list(model_map.get_sql_files(model_ids=["nonexistent/model", "./ASHRAE901_HotelLarge_STD2013_Buffalo.dd"])) == [
+        "./ASHRAE901_HotelLarge_STD2013_Buffalo.dd"]
+
+
+def test_classify_artifact_table_htm():
+    assert classify_artifact("eplusout.dd.table.htm") == {"stem": "eplusout.dd", "kind": "html", "compressed": False}
+
+
+def test_classify_artifact_gz_sibling():
+    assert classify_artifact("eplusout.meter.csv.gz") == {"stem": "eplusout", "kind": "meter_csv", "compressed": True}
+
+
+def test_classify_artifact_unknown():
+    assert classify_artifact("notes.txt") is None
+
+
+def test_scan_classifies_gz_artifacts():
+    scan = scan_directory(EXAMPLE_DIR)
+    rdd = [x for x in scan["files"] if x["kind"] == "rdd"]
+    assert len(rdd) == 4
+    assert all(x["compressed"] for x in rdd)
+
+
+def test_threaded_catalog_matches_serial():
+    assert catalog_path(EXAMPLE_DIR, max_workers=4) == catalog_path(EXAMPLE_DIR)
@@ -0,0 +1,173 @@
+"""Tests for the process-resident model map registry."""
+
+import os
+import time
+import pytest
+from src.model_data import (
+    catalog_path,
+    get_model_map,
+    get_resident_model_map,
+    load_resident_model_map,
+    snapshot_directory,
+    update_snapshot,
+)
+from src.watcher import inotify_available
+from tests.conftest import touch
+
+
+def test_resident_map_is_reused(runs_dir, cache_dir):
+    first = get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    second = get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    assert first is second
+    assert first.get_all_model_ids() == ["run1/eplusout"]
+
+
+def test_resident_map_reloads_when_file_added(runs_dir, cache_dir):
+    get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+    model_map = get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    assert sorted(model_map.get_all_model_ids()) == ["run1/eplusout", "run2/eplusout"]
+
+
+def test_resident_map_not_restated_within_max_age(runs_dir, cache_dir):
+    first = get_resident_model_map(runs_dir, cache_dir, max_age=3600)
+    touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+    assert get_resident_model_map(runs_dir, cache_dir, max_age=3600) is first
+
+
+def test_snapshot_detects_modified_file(runs_dir):
+    snapshot = snapshot_directory(runs_dir)
+    assert update_snapshot(snapshot)[1]["modified"] == []
+    path = os.path.join(runs_dir, "run1", "eplusout.epJSON")
+    touch(path, text='{"Zone": {}}')
+    assert update_snapshot(snapshot)[1]["modified"] == [path]
+
+
+def test_resident_load_scans_once(runs_dir, cache_dir, monkeypatch):
+    import src.model_data as model_data
+    scans = []
+    scan_directory = model_data.scan_directory
+    monkeypatch.setattr(model_data, "scan_directory", lambda path: scans.append(path) or scan_directory(path))
+
+    load_resident_model_map(runs_dir, cache_dir=cache_dir, watch="off")
+    assert len(scans) == 1
+    # warm start: the cached snapshot is updated in place, without a scan
+    model_map = load_resident_model_map(runs_dir, cache_dir=cache_dir, watch="off")
+    assert len(scans) == 1
+    assert model_map.get_all_model_ids() == ["run1/eplusout"]
+
+
+def test_incremental_update_keeps_untouched_models(runs_dir, cache_dir):
+    model_map = get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    run1 = model_map.get_model_by_id("run1/eplusout")
+    touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+    assert get_resident_model_map(runs_dir, cache_dir, max_age=0) is model_map
+    assert model_map.get_model_by_id("run1/eplusout") is run1
+
+
+def test_incremental_update_removes_deleted_models(runs_dir, cache_dir):
+    touch(os.path.join(runs_dir, "run2", "eplusout.sql"))
+    model_map = get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    assert model_map.get_model_by_id("run2/eplusout") is not None
+    os.remove(os.path.join(runs_dir, "run2", "eplusout.sql"))
+    get_resident_model_map(runs_dir, cache_dir, max_age=0)
+    assert model_map.get_model_by_id("run2/eplusout") is None
+
+
+def test_update_snapshot_reports_changes(runs_dir):
+    snapshot = snapshot_directory(runs_dir)
+    touch(os.path.join(runs_dir, "run2", "eplusout.sql"))
+    os.remove(os.path.join(runs_dir, "run1", "eplusout.epJSON"))
+    snapshot, changes = update_snapshot(snapshot)
+    assert changes["added"] == [os.path.join(runs_dir, "run2", "eplusout.sql")]
+    assert changes["removed"] == [os.path.join(runs_dir, "run1", "eplusout.epJSON")]
+    assert changes["modified"] == []
+    assert update_snapshot(snapshot)[1] == {"added": [], "modified": [], "removed": []}
+
+
+def test_upsert_resets_parsed_data(runs_dir):
+    model_map = get_model_map(catalog_path(runs_dir))
+    path = os.path.join(runs_dir, "run1", "eplusout.epJSON")
+    model_map.get_model_by_id("run1/eplusout").epjson_data.get_data()
+    touch(path, text='{"Zone": {}}')
+    model_map.upsert_file(path, runs_dir)
+    assert model_map.get_model_by_id("run1/eplusout").epjson_data.get_data() == {"Zone": {}}
+
+
+@pytest.mark.parametrize("mode", ["poll", "inotify"])
+def test_watcher_applies_changes(runs_dir, cache_dir, mode):
+    if mode == "inotify" and not inotify_available():
+        pytest.skip("inotify not available")
+    model_map = load_resident_model_map(runs_dir, cache_dir=cache_dir, watch=mode)
+    touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+    deadline = time.monotonic() + 10
+    while model_map.get_model_by_id("run2/eplusout") is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert model_map.get_model_by_id("run2/eplusout") is not None
+
+
+def test_inotify_reports_lowercase_extensions(runs_dir, cache_dir):
+    if not inotify_available():
+        pytest.skip("inotify not available")
+    model_map = load_resident_model_map(runs_dir, cache_dir=cache_dir, watch="inotify")
+    touch(os.path.join(runs_dir, "run2", "run.epjson"))
+    deadline = time.monotonic() + 10
+    while model_map.get_model_by_id("run2/run") is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert model_map.get_model_by_id("run2/run") is not None
+
+
+@pytest.mark.parametrize("mode", ["poll", "inotify"])
+def test_watcher_sees_changes_made_while_loading(runs_dir, cache_dir, mode, monkeypatch):
+    import src.model_data as model_data
+    if mode == "inotify" and not inotify_available():
+        pytest.skip("inotify not available")
+    read_or_initialize = model_data._read_or_initialize_model_map
+
+    def add_file_after_scan(directory, cache_dir):
+        result = read_or_initialize(directory, cache_dir)
+        touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+        return result
+
+    monkeypatch.setattr(model_data, "_read_or_initialize_model_map", add_file_after_scan)
+    monkeypatch.setattr(model_data, "MODEL_MAP_REVALIDATE_SECONDS", 0.05)
+    model_map = load_resident_model_map(runs_dir, cache_dir=cache_dir, watch=mode)
+    deadline = time.monotonic() + 10
+    while model_map.get_model_by_id("run2/eplusout") is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert model_map.get_model_by_id("run2/eplusout") is not None
+
+
+def test_inotify_skips_hidden_entries(runs_dir, cache_dir):
+    if not inotify_available():
+        pytest.skip("inotify not available")
+    model_map = load_resident_model_map(runs_dir, cache_dir=cache_dir, watch="inotify")
+    touch(os.path.join(runs_dir, ".staging", "eplusout.epJSON"))
+    touch(os.path.join(runs_dir, "run1", ".eplusout.sql"))
+    touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+    deadline = time.monotonic() + 10
+    while model_map.get_model_by_id("run2/eplusout") is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    # the same models a scan finds
+    assert sorted(model_map.get_all_model_ids()) == sorted(catalog_path(runs_dir))
+
+
+def test_reload_does_not_wait_for_blocked_watcher(runs_dir, cache_dir):
+    import threading
+    import src.model_data as model_data
+    if not inotify_available():
+        pytest.skip("inotify not available")
+    load_resident_model_map(runs_dir, cache_dir=cache_dir, watch="inotify")
+    reloaded = threading.Event()
+    with model_data._resident_lock:
+        # the watcher thread blocks on the lock with an event pending
+        touch(os.path.join(runs_dir, "run2", "eplusout.epJSON"))
+        time.sleep(0.3)
+        start = time.monotonic()
+        reload = threading.Thread(target=lambda: (
+            load_resident_model_map(runs_dir, cache_dir=cache_dir, watch="inotify"), reloaded.set()))
+        reload.start()
+    reload.join(timeout=10)
+    assert reloaded.is_set()
+    assert time.monotonic() - start < 4
+    assert get_resident_model_map(runs_dir, cache_dir).get_model_by_id("run2/eplusout") is not None
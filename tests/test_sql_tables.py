@@ -0,0 +1,86 @@
+"""Tests for SQL tabular report extraction."""
+
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from src.tools.func_sql import SqlTables
+
+
+@pytest.fixture
+def interleaved_tables_sql(tmp_path):
+    """A minimal eplusout.sql with two tables whose rows are interleaved."""
+    sql_file = str(tmp_path / "eplusout.sql")
+    with sqlite3.connect(sql_file) as conn:
+        conn.execute("CREATE TABLE Strings (StringIndex INTEGER PRIMARY KEY, StringTypeIndex INTEGER, Value TEXT)")
+        conn.execute(
+            "CREATE TABLE TabularData (TabularDataIndex INTEGER PRIMARY KEY, ReportNameIndex INTEGER, "
+            "ReportForStringIndex INTEGER, TableNameIndex INTEGER, RowNameIndex INTEGER, ColumnNameIndex INTEGER, "
+            "UnitsIndex INTEGER, SimulationIndex INTEGER, RowId INTEGER, ColumnId INTEGER, Value TEXT)"
+        )
+        strings = [(1, 1, "Report"), (2, 2, "Entire Facility"), (3, 3, "Sizes"), (4, 3, "Names"),
+                   (5, 4, "Fan"), (6, 4, "Pump"), (7, 5, "Flow"), (8, 6, "m3/s"), (9, 6, "")]
+        conn.executemany("INSERT INTO Strings VALUES (?, ?, ?)", strings)
+        rows = [
+            (1, 3, 5, 7, 8, 0, 0, "   1.50"),
+            (2, 4, 5, 7, 9, 0, 0, "FAN-1"),
+            (3, 3, 6, 7, 8, 1, 0, "   0.25"),
+            (4, 4, 6, 7, 9, 1, 0, "PUMP-1"),
+        ]
+        conn.executemany(
+            "INSERT INTO TabularData VALUES (?, 1, 2, ?, ?, ?, ?, 1, ?, ?, ?)", rows
+        )
+    conn.close()
+    return sql_file
+
+
+def test_avail_tabular_lists_every_table(atlanta_dd_model):
+    tables = atlanta_dd_model.sql_data.get_tables()
+    assert isinstance(tables, SqlTables)
+    avail = tables.avail_tabular()
+    expected = tables._exec_query(
+        "SELECT COUNT(*) FROM (SELECT DISTINCT ReportNameIndex, ReportForStringIndex, TableNameIndex FROM TabularData)"
+    )[0][0]
+    assert list(avail.columns) == ["ReportName", "ReportForString", "TableName"]
+    assert len(avail) == expected
+    assert avail.iloc[0].tolist() == ["AnnualBuildingUtilityPerformanceSummary", "Entire Facility", "Site and Source Energy"]
+
+
+def test_get_tabular_matches_sql(atlanta_dd_model):
+    tables = atlanta_dd_model.sql_data.get_tables()
+    table = tables.get_tabular({
+        "ReportName": "AnnualBuildingUtilityPerformanceSummary",
+        "ReportForString": "Entire Facility",
+        "TableName": "Site and Source Energy",
+    })
+    rows = tables._exec_query(
+        "SELECT r.Value, c.Value, t.Value FROM TabularData t "
+        "JOIN Strings r ON r.StringIndex = t.RowNameIndex JOIN Strings c ON c.StringIndex = t.ColumnNameIndex "
+        "JOIN Strings n ON n.StringIndex = t.TableNameIndex "
+        "WHERE n.Value = 'Site and Source Energy'"
+    )
+    assert len(table) * (len(table.columns) - 4) == len(rows)
+    values = table.set_index("FieldName")
+    for row_name, column_name, value in rows:
+        column = [x for x in values.columns if x[0] == column_name][0]
+        assert values.loc[row_name, column] == pytest.approx(float(value))
+
+
+def test_get_tabular_interleaved_rows_and_text(interleaved_tables_sql):
+    tables = SqlTables(sql_file=interleaved_tables_sql)
+    avail = tables.avail_tabular()
+    assert avail["TableName"].tolist() == ["Sizes", "Names"]
+
+    sizes = tables.get_tabular(avail.iloc[[0]])
+    assert sizes["FieldName"].tolist() == ["Fan", "Pump"]
+    assert sizes[("Flow", "m3/s")].dtype == np.float64
+    assert sizes[("Flow", "m3/s")].tolist() == [1.5, 0.25]
+
+    names = tables.get_tabular(tables._df_to_tabledict(avail)[1])
+    assert names[("Flow", "")].tolist() == ["FAN-1", "PUMP-1"]
+
+    assert [len(x) for x in tables.search_tabular("Names")] == [2]
+    with pytest.raises(ValueError, match="Table not found"):
+        tables.get_tabular({"ReportName": "Report", "ReportForString": "Entire Facility", "TableName": "Missing"})
+    with pytest.raises(ValueError):
+        tables.get_tabular(pd.concat([avail, avail]))
@@ -1,7 +1,54 @@
 """Tests for SQL timeseries data extraction."""
 
+import sqlite3
 import pandas as pd
+import pytest
 from src.dataloader import execute_pandas_query
+from src.tools.func_sql import SqlTimeseries, parse_meter_name
+
+
+@pytest.fixture
+def multi_frequency_sql(tmp_path):
+    """A minimal eplusout.sql with one variable per reporting frequency."""
+    sql_file = str(tmp_path / "eplusout.sql")
+    with sqlite3.connect(sql_file) as conn:
+        conn.execute(
+            "CREATE TABLE Time (TimeIndex INTEGER PRIMARY KEY, Year INTEGER, Month INTEGER, Day INTEGER, "
+            "Hour INTEGER, Minute INTEGER, Dst INTEGER, Interval INTEGER, IntervalType INTEGER, "
+            "SimulationDays INTEGER, DayType TEXT, EnvironmentPeriodIndex INTEGER, WarmupFlag INTEGER)"
+        )
+        conn.execute(
+            "CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER PRIMARY KEY, IsMeter INTEGER, "
+            "Type TEXT, IndexGroup TEXT, TimestepType TEXT, KeyValue TEXT, Name TEXT, ReportingFrequency TEXT, "
+            "ScheduleName TEXT, Units TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE ReportData (ReportDataIndex INTEGER PRIMARY KEY, TimeIndex INTEGER, "
+            "ReportDataDictionaryIndex INTEGER, Value REAL)"
+        )
+        times = [
+            (1, 1, 1, 15, 15), (1, 1, 1, 30, 15), (1, 1, 1, 45, 15), (1, 1, 1, 60, 15),  # zone timestep
+            (1, 1, 1, 0, 60),  # hourly
+            (1, 1, 24, 0, 1440),  # daily
+            (1, 31, 24, 0, 44640),  # monthly
+            (12, 31, 24, 0, 525600),  # run period
+        ]
+        conn.executemany(
+            "INSERT INTO Time (TimeIndex, Year, Month, Day, Hour, Minute, Interval) VALUES (?, 0, ?, ?, ?, ?, ?)",
+            [(i + 1, *t) for i, t in enumerate(times)]
+        )
+        frequencies = [(1, "Zone Timestep", [1, 2, 3, 4]), (2, "Hourly", [5]), (3, "Daily", [6]),
+                       (4, "Monthly", [7]), (5, "Run Period", [8])]
+        for rdd, frequency, time_indexes in frequencies:
+            conn.execute(
+                "INSERT INTO ReportDataDictionary VALUES (?, 0, 'Avg', 'Zone', 'Zone', 'ZONE 1', "
+                "'Zone Mean Air Temperature', ?, '', 'C')", (rdd, frequency)
+            )
+            conn.executemany(
+                "INSERT INTO ReportData (TimeIndex, ReportDataDictionaryIndex, Value) VALUES (?, ?, ?)",
+                [(ti, rdd, float(ti)) for ti in time_indexes]
+            )
+    return sql_file
 
 
 def test_availseries_count(atlanta_model):
@@ -60,3 +107,496 @@ def test_pandas_on_timeseries(atlanta_model):
     df = pd.DataFrame(series)
     result = execute_pandas_query(df, "df['Value'].mean()")
     assert "Value" not in result or float(result) > 0
+
+
+def test_time_index_matches_string_parsing(atlanta_dd_model):
+    timedf = atlanta_dd_model.sql_data.get_timeseries()._maketime()
+    expected = pd.to_datetime(
+        timedf["Month"].astype(str) + "-" + timedf["Day"].astype(str) + "-" + (timedf["Hour"] - 1).astype(str),
+        format="%m-%d-%H"
+    )
+    assert (timedf["dt"] == expected).all()
+
+
+def test_time_index_is_shared_per_file(atlanta_dd_model):
+    from src.tools.func_sql import SqlTimeseries
+    first = atlanta_dd_model.sql_data.get_timeseries()._maketime()
+    assert SqlTimeseries(sql_file=atlanta_dd_model.sql_data.file_path)._maketime() is first
+
+
+def test_build_time_index_sub_hourly_and_run_period():
+    from src.tools.func_sql import build_time_index
+    timedf = pd.DataFrame({
+        "Month": [1, 1, 1, 12, None],
+        "Day": [1, 1, 1, 31, None],
+        "Hour": [1, 1, 1, 24, None],
+        "Minute": [15, 60, 0, 0, None],
+        "Interval": [15, 15, 60, 60, 525600],
+    })
+    dt = pd.Series(build_time_index(timedf))
+    assert list(dt[:4].astype(str)) == [
+        "1900-01-01 00:00:00", "1900-01-01 00:45:00", "1900-01-01 00:00:00", "1900-12-31 23:00:00"
+    ]
+    assert pd.isna(dt[4])
+
+
+def test_availseries_by_frequency(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    assert [x["ReportDataDictionaryIndex"] for x in ts.availseries()] == [2]
+    assert [x["ReportDataDictionaryIndex"] for x in ts.availseries("timestep")] == [1]
+    assert [x["ReportDataDictionaryIndex"] for x in ts.availseries("RunPeriod")] == [5]
+    assert len(ts.availseries("all")) == 5
+    with pytest.raises(ValueError):
+        ts.availseries("fortnightly")
+
+
+@pytest.mark.parametrize("rddid, expected", [
+    (1, ["1900-01-01 00:00:00", "1900-01-01 00:15:00", "1900-01-01 00:30:00", "1900-01-01 00:45:00"]),
+    (2, ["1900-01-01 00:00:00"]),
+    (3, ["1900-01-01 00:00:00"]),
+    (4, ["1900-01-01 00:00:00"]),
+    (5, ["1900-01-01 00:00:00"]),
+])
+def test_getseries_for_every_frequency(multi_frequency_sql, rddid, expected):
+    series = SqlTimeseries(sql_file=multi_frequency_sql).getseries_by_record_id(rddid)
+    assert [str(x["dt"]) for x in series] == expected
+
+
+def test_get_series_is_compact(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="on")
+    series = ts.get_series(1)
+    assert len(series) == 4
+    assert series.values.dtype == "float64"
+    assert series.label == "ZONE 1-Zone Mean Air Temperature-Zone-C"
+    assert series.metadata["ReportingFrequency"] == "Zone Timestep"
+    # one time lookup per file, shared by its series
+    assert ts.get_series(2).lookup is series.lookup
+    assert series.to_dict()["dt"] == ["1900-01-01T00:00:00", "1900-01-01T00:15:00",
+                                      "1900-01-01T00:30:00", "1900-01-01T00:45:00"]
+    assert series.to_records() == ts.getseries_by_record_id(1)
+    assert series.to_series().sum() == 10.0
+    with pytest.raises(ValueError):
+        ts.get_series(99)
+
+
+def test_series_index_patterns():
+    from src.tools.func_sql import SeriesIndex
+    records = [
+        {"ReportDataDictionaryIndex": i + 1, "Name": name, "KeyValue": key, "Units": units, "ReportingFrequency": "Hourly"}
+        for i, (name, key, units) in enumerate([
+            ("Zone Mean Air Temperature", "CORE_ZN", "C"),
+            ("Zone Mean Air Temperature", "PERIMETER_ZN_1", "C"),
+            ("Zone Air System Sensible Heating Energy", "CORE_ZN", "J"),
+            ("Electricity:Facility", None, "J"),
+            ("Heating:Electricity", None, "J"),
+        ])
+    ]
+    index = SeriesIndex(records)
+    rddids = lambda **kw: [x["ReportDataDictionaryIndex"] for x in index.search(**kw)]
+    assert rddids(name="zone mean air temperature") == [1, 2]
+    assert rddids(name="Zone Mean Air Temperature", key="core_zn") == [1]
+    assert rddids(name="Zone*") == [1, 2, 3]
+    assert rddids(name="*heating*") == [3, 5]
+    assert rddids(name="Electricity:*", key="") == [4]
+    assert rddids(key="PERIMETER_ZN_?") == [2]
+    assert rddids(key="*_ZN*", units="j") == [3]
+    assert rddids(name="Zone") == []
+    assert rddids(frequency="daily") == []
+    assert len(index.search()) == 5
+
+
+def test_search_series_and_queryseries(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    assert [x["ReportingFrequency"] for x in ts.search_series(name="zone mean*", key="ZONE ?")] == [
+        "Zone Timestep", "Hourly", "Daily", "Monthly", "Run Period"]
+    assert ts.search_series(units="F") == []
+    assert ts.series_index() is SqlTimeseries(sql_file=multi_frequency_sql).series_index()
+
+    found = ts.queryseries("Mean Air")
+    assert list(found["ReportDataDictionaryIndex"]) == [2]
+    assert ts.queryseries("nothing").empty
+
+
+def test_page_series_filters_projects_and_pages(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    records, after, total = [], 0, None
+    while after is not None:
+        page, after, total = ts.page_series(frequency="all", columns=["Name"], after=after, limit=2)
+        assert len(page) <= 2
+        records += page
+    assert total == 5
+    assert [x["ReportDataDictionaryIndex"] for x in records] == [1, 2, 3, 4, 5]
+    assert set(records[0]) == {"ReportDataDictionaryIndex", "Name"}
+
+    page, after, total = ts.page_series(frequency="all", key="zone*", after=3, limit=10)
+    assert [x["ReportDataDictionaryIndex"] for x in page] == [4, 5]
+    assert after is None and total == 5
+    assert set(page[0]) == {"ReportDataDictionaryIndex", "IsMeter", "Type", "IndexGroup", "TimestepType",
+                            "KeyValue", "Name", "ReportingFrequency", "ScheduleName", "Units"}
+    # pages are copies; the cached dictionary is not changed through them
+    page[0]["Name"] = "changed"
+    assert ts.availseries("monthly")[0]["Name"] == "Zone Mean Air Temperature"
+
+    with pytest.raises(ValueError):
+        ts.page_series(columns=["Nmae"])
+    with pytest.raises(ValueError):
+        ts.page_series(limit=0)
+
+
+def test_find_series_by_name_and_key(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    assert ts.find_series("zone mean air temperature") == 2
+    assert ts.find_series("Zone Mean Air Temperature", key="zone 1", frequency="daily") == 3
+    with pytest.raises(ValueError):
+        ts.find_series("Zone Mean Air Temperature", key="ZONE 2")
+    with pytest.raises(ValueError, match="pass a key"):
+        ts.find_series("Zone Mean Air Temperature", frequency=None)
+
+
+def test_align_series_across_runs(multi_frequency_sql, tmp_path):
+    import shutil
+    from src.tools.func_sql import align_series
+    runs = {"base": multi_frequency_sql}
+    runs["hot"] = str(tmp_path / "hot.sql")
+    shutil.copy(multi_frequency_sql, runs["hot"])
+    with sqlite3.connect(runs["hot"]) as conn:
+        conn.execute("UPDATE ReportData SET Value = Value + 10")
+        # the last timestep is missing from this run
+        conn.execute("DELETE FROM ReportData WHERE TimeIndex = 4")
+    conn.close()
+    runs["renamed"] = str(tmp_path / "renamed.sql")
+    shutil.copy(multi_frequency_sql, runs["renamed"])
+    with sqlite3.connect(runs["renamed"]) as conn:
+        conn.execute("UPDATE ReportDataDictionary SET KeyValue = 'ZONE 2'")
+    conn.close()
+    runs["gone"] = str(tmp_path / "gone.sql")
+
+    df = align_series(runs, "Zone Mean Air Temperature", key="Zone 1", frequency="timestep", max_workers=4)
+    assert list(df.columns) == ["base", "hot"]
+    assert set(df.attrs["missing"]) == {"renamed", "gone"}
+    assert df.index.name == "dt"
+    assert df["base"].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert df["hot"].tolist()[:3] == [11.0, 12.0, 13.0]
+    assert pd.isna(df["hot"].iloc[3])
+
+    same = align_series({"a": runs["base"], "b": runs["base"]}, "Zone Mean Air Temperature", frequency="daily")
+    assert same.shape == (1, 2)
+    table = align_series({"a": runs["base"]}, "Zone Mean Air Temperature", as_arrow=True)
+    assert table.column_names == ["dt", "a"]
+
+
+def test_align_series_across_design_day_models(model_map):
+    from src.tools.func_sql import align_series
+    sql_files = model_map.get_sql_files(pattern="dd")
+    variable = SqlTimeseries(sql_file=next(iter(sql_files.values()))).availseries()[0]
+    df = align_series(sql_files, variable["Name"], key=variable["KeyValue"])
+    assert list(df.columns) == list(sql_files)
+    assert df.attrs["missing"] == {}
+    assert len(df) == 48
+
+
+def test_getseries_wide_matches_single_series(atlanta_dd_model):
+    ts = atlanta_dd_model.sql_data.get_timeseries()
+    rddids = [x["ReportDataDictionaryIndex"] for x in ts.availseries()]
+    wide = ts.getseries_wide(rddids)
+    assert wide.shape == (48, len(rddids))
+    assert wide.index.name == "dt"
+    for rddid, column in zip(rddids, wide.columns):
+        single = pd.DataFrame(ts.getseries_by_record_id(rddid))
+        assert list(wide[column]) == list(single["Value"])
+        assert list(wide.index) == list(single["dt"])
+
+
+def test_getseries_wide_mixed_frequencies(multi_frequency_sql):
+    wide = SqlTimeseries(sql_file=multi_frequency_sql).getseries_wide([3, 1])
+    assert list(wide.columns) == [
+        "ZONE 1-Zone Mean Air Temperature-Zone-C", "ZONE 1-Zone Mean Air Temperature-Zone-C"
+    ]
+    assert wide.shape == (5, 2)
+    assert wide.iloc[:, 1].notna().sum() == 4
+    assert wide.iloc[:, 0].dropna().tolist() == [6.0]
+
+
+def test_getseries_wide_rejects_bad_ids(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    with pytest.raises(ValueError):
+        ts.getseries_wide([1, 999])
+    with pytest.raises(ValueError):
+        ts.getseries_wide([0])
+    with pytest.raises(TypeError):
+        ts.getseries_wide(["1"])
+
+
+def test_columnar_store_matches_sqlite(multi_frequency_sql):
+    from src.tools.func_sql import get_columnar_store
+    sqlite_ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="off")
+    read_ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="read")
+    assert read_ts._columnar_store() is None
+
+    columnar_ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="on")
+    assert columnar_ts._columnar_store() is not None
+    assert read_ts._columnar_store() is columnar_ts._columnar_store()
+    pd.testing.assert_frame_equal(columnar_ts.getseries_wide([1, 2, 3]), sqlite_ts.getseries_wide([1, 2, 3]))
+    assert columnar_ts.getseries_by_record_id(4) == sqlite_ts.getseries_by_record_id(4)
+    assert get_columnar_store(multi_frequency_sql).read([99])[0].size == 0
+
+
+def test_columnar_store_ignored_when_sql_changes(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="on")
+    ts.getseries_wide([2])
+    with sqlite3.connect(multi_frequency_sql) as conn:
+        conn.execute("UPDATE ReportData SET Value = 42.0 WHERE ReportDataDictionaryIndex = 2")
+    conn.close()
+
+    assert SqlTimeseries(sql_file=multi_frequency_sql, columnar="read")._columnar_store() is None
+    assert SqlTimeseries(sql_file=multi_frequency_sql, columnar="on").getseries_wide([2]).iloc[0, 0] == 42.0
+
+
+def test_row_index_matches_scan(multi_frequency_sql):
+    from src.tools.func_sql import get_row_index
+    scan_ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="off", row_index="off")
+    indexed_ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="off", row_index="on")
+    assert scan_ts._row_index() is None
+    read_ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="off", row_index="read")
+    assert read_ts._row_index() is None
+    row_index = indexed_ts._row_index()
+    assert read_ts._row_index() is row_index
+    assert row_index is get_row_index(multi_frequency_sql)
+    assert row_index.rowids([1, 3]).tolist() == [1, 2, 3, 4, 6]
+    assert row_index.rowids([99]).size == 0
+
+    from src.tools.func_sql import read_rows_by_rowid
+    with sqlite3.connect(multi_frequency_sql) as conn:
+        rdd, time_index, _ = read_rows_by_rowid(conn, row_index.rowids([3, 1]))
+        assert rdd.tolist() == [3, 1, 1, 1, 1]
+        assert time_index.tolist() == [6, 1, 2, 3, 4]
+        assert read_rows_by_rowid(conn, [6, 1, 6])[0].tolist() == [3, 1, 3]
+    conn.close()
+
+    pd.testing.assert_frame_equal(indexed_ts.getseries_wide([1, 2, 5]), scan_ts.getseries_wide([1, 2, 5]))
+    assert indexed_ts.getseries_by_record_id(1) == scan_ts.getseries_by_record_id(1)
+    for after in [0, 2, 4]:
+        indexed_page, indexed_after = indexed_ts.read_series_page([1, 3], after=after, limit=2)
+        scan_page, _ = scan_ts.read_series_page([1, 3], after=after, limit=2)
+        pd.testing.assert_frame_equal(indexed_page, scan_page)
+    assert indexed_after is None
+
+
+def test_row_index_skipped_for_indexed_files(multi_frequency_sql):
+    from src.tools.func_sql import get_row_index
+    with sqlite3.connect(multi_frequency_sql) as conn:
+        conn.execute("CREATE INDEX rdd ON ReportData (ReportDataDictionaryIndex, TimeIndex)")
+    conn.close()
+    assert get_row_index(multi_frequency_sql) is None
+    assert SqlTimeseries(sql_file=multi_frequency_sql, columnar="off").getseries_wide([2]).iloc[0, 0] == 5.0
+
+
+def test_aggregate_values_matches_pandas():
+    import numpy as np
+    from src.tools.func_sql import aggregate_values
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 20, 500).astype(float)  # integers, so there are tied peaks
+    codes = rng.integers(0, 7, 500)
+    times = np.datetime64("1900-01-01T00:00", "ns") + np.arange(500).astype("timedelta64[h]")
+    result = aggregate_values(values, codes, 7, ["count", "sum", "mean", "min", "max", "std"], [5, 50, 95], times)
+
+    expected = pd.DataFrame({"v": values, "g": codes, "t": times}).groupby("g")
+    stats = expected["v"].agg(["count", "sum", "mean", "min", "max", "std"])
+    for name in stats.columns:
+        assert np.allclose(result[name], stats[name])
+    for p in [5, 50, 95]:
+        assert np.allclose(result[f"p{p}"], expected["v"].quantile(p / 100))
+    first_peak = expected.apply(lambda x: x["t"][x["v"].idxmax()])
+    assert (result["max_dt"] == first_peak.to_numpy()).all()
+
+
+def test_aggregate_by_month_and_hour(atlanta_dd_model):
+    ts = atlanta_dd_model.sql_data.get_timeseries()
+    rddid = ts.availseries()[0]["ReportDataDictionaryIndex"]
+    wide = ts.getseries_wide([rddid])
+    column = wide.iloc[:, 0]
+
+    monthly = ts.aggregate([rddid], by="month", stats=["sum", "max"])
+    assert [x["group"] for x in monthly] == [1, 7]  # winter and summer design days
+    assert [x["sum"] for x in monthly] == list(column.groupby(wide.index.month).sum())
+    # same timestamp format as query_summary() and meter_rollup()
+    assert [x["max_dt"] for x in monthly] == [str(x) for x in column.groupby(wide.index.month).idxmax()]
+
+    hourly = ts.aggregate([rddid], by="hour", stats=["count", "mean"])
+    assert [x["group"] for x in hourly] == list(range(24))
+    assert all(x["count"] == 2 for x in hourly)
+
+    by_day_type = ts.aggregate([rddid], by="weekday", stats=["count"])
+    assert {x["group"] for x in by_day_type} == {"WinterDesignDay", "SummerDesignDay"}
+
+
+def test_aggregate_rejects_bad_arguments(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    with pytest.raises(ValueError):
+        ts.aggregate([1], by="fortnight")
+    with pytest.raises(ValueError):
+        ts.aggregate([1], stats=["median"])
+    with pytest.raises(ValueError):
+        ts.aggregate([1], percentiles=[120])
+    total = ts.aggregate([1], by="all", stats=["sum", "count"])
+    assert total == [{"rddid": 1, "label": "ZONE 1-Zone Mean Air Temperature-Zone-C",
+                      "group": "all", "sum": 10.0, "count": 4}]
+
+
+@pytest.mark.parametrize("columnar", ["off", "on"])
+def test_iter_series_chunks_cover_every_row(multi_frequency_sql, columnar):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar=columnar)
+    # 2 rows per chunk
+    chunks = list(ts.iter_series([1, 2, 3], chunk_bytes=2 * 160))
+    assert all(len(x) <= 2 for x in chunks)
+    rows = pd.concat(chunks).sort_values(["ReportDataDictionaryIndex", "dt"])
+    assert rows["ReportDataDictionaryIndex"].tolist() == [1, 1, 1, 1, 2, 3]
+    assert rows["Value"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+    batches = list(ts.iter_series([1], as_arrow=True))
+    assert sum(x.num_rows for x in batches) == 4
+    assert batches[0].schema.names == ["dt", "ReportDataDictionaryIndex", "Value"]
+
+
+def test_read_series_page_follows_cursor(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    values, after = [], 0
+    while after is not None:
+        page, after = ts.read_series_page([1, 3], after=after, limit=2)
+        values += page["Value"].tolist()
+    assert values == [1.0, 2.0, 3.0, 4.0, 6.0]
+
+
+def test_old_getseries_pivots_by_datetime(atlanta_dd_model):
+    ts = atlanta_dd_model.sql_data.get_timeseries()
+    avail = ts.availseries()[:2]
+    pivot = ts.old_getseries(avail)
+    assert pivot.shape == (48, 2)
+    assert pivot.index.name == "dt"
+    wide = ts.getseries_wide([x["ReportDataDictionaryIndex"] for x in avail])
+    assert sorted(pivot.to_numpy().ravel()) == sorted(wide.to_numpy().ravel())
+
+
+def test_summarize_report_data_in_chunks():
+    import numpy as np
+    from src.tools.func_sql import summarize_report_data
+    rdd = np.array([1, 2, 1, 2, 1, 2])
+    time_index = np.array([1, 1, 2, 2, 3, 3])
+    value = np.array([0.0, 5.0, 3.0, 5.0, 3.0, -1.0])
+    chunks = [(rdd[i:i + 2], time_index[i:i + 2], value[i:i + 2]) for i in range(0, 6, 2)]
+    stats = summarize_report_data(chunks, 3)
+    assert stats["count"].tolist() == [0, 3, 3]
+    assert stats["sum"][1:].tolist() == [6.0, 9.0]
+    assert stats["zeros"][1:].tolist() == [1, 0]
+    assert stats["min"][1:].tolist() == [0.0, -1.0]
+    assert stats["max"][1:].tolist() == [3.0, 5.0]
+    assert stats["max_time"][1:].tolist() == [2, 1]  # first time of a tied maximum
+
+
+def test_series_summary_matches_series(atlanta_dd_model):
+    ts = atlanta_dd_model.sql_data.get_timeseries()
+    summary = ts.series_summary().set_index("ReportDataDictionaryIndex")
+    wide = ts.getseries_wide(summary.index.tolist())
+    assert summary["count"].tolist() == [48] * len(summary)
+    assert (summary["max"].to_numpy() == wide.max().to_numpy()).all()
+    assert summary["max_dt"].tolist() == [str(x) for x in wide.idxmax()]
+
+
+def test_query_summary_filters_and_ranks(multi_frequency_sql):
+    ts = SqlTimeseries(sql_file=multi_frequency_sql)
+    ranked = ts.query_summary(sort_by="max")
+    assert [x["ReportDataDictionaryIndex"] for x in ranked] == [5, 4, 3, 2, 1]
+    assert [x["ReportDataDictionaryIndex"] for x in ts.query_summary(frequency="daily")] == [3]
+    assert ts.query_summary(name="AIR TEMP", key="zone 1", limit=2)[0]["max_dt"] == "1900-01-01 00:00:00"
+    assert ts.query_summary(name="nothing") == []
+    with pytest.raises(ValueError):
+        ts.query_summary(sort_by="median")
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Electricity:Facility", {"level": "facility", "resource": "Electricity", "group": "Facility"}),
+    ("NaturalGas:HVAC", {"level": "group", "resource": "NaturalGas", "group": "HVAC"}),
+    ("Electricity:Zone:CORE_ZN", {"level": "group", "resource": "Electricity", "group": "Zone", "zone": "CORE_ZN"}),
+    ("InteriorLights:Electricity", {"level": "end_use", "resource": "Electricity", "end_use": "InteriorLights"}),
+    ("General:InteriorLights:Electricity",
+     {"level": "subcategory", "resource": "Electricity", "end_use": "InteriorLights", "subcategory": "General"}),
+    ("Heating:DistrictHeatingWater:Zone:CORE_ZN",
+     {"level": "end_use", "resource": "DistrictHeatingWater", "end_use": "Heating", "zone": "CORE_ZN"}),
+    ("Custom Lights Meter", {"level": "custom"}),
+])
+def test_parse_meter_name(name, expected):
+    parsed = parse_meter_name(name)
+    assert {k: v for k, v in parsed.items() if v is not None} == expected
+
+
+def test_meter_rollup_totals_peaks_and_splits(multi_frequency_sql):
+    meters = [
+        (10, "Electricity:Facility", "Zone Timestep", "J", [(1, 900.0), (2, 1800.0), (3, 900.0), (4, 0.0)]),
+        (11, "Electricity:Facility", "Monthly", "J", [(7, 3600.0)]),  # same meter, coarser: not read
+        (12, "NaturalGas:Facility", "Hourly", "J", [(5, 1200.0)]),
+        (13, "InteriorLights:Electricity", "Zone Timestep", "J", [(t, 600.0) for t in range(1, 5)]),
+        (14, "Fans:Electricity", "Zone Timestep", "J", [(t, 300.0) for t in range(1, 5)]),
+        (15, "Water:Facility", "Run Period", "m3", [(8, 5.0)]),
+    ]
+    with sqlite3.connect(multi_frequency_sql) as conn:
+        for rdd, name, frequency, units, rows in meters:
+            conn.execute("INSERT INTO ReportDataDictionary VALUES (?, 1, 'Sum', 'Facility', 'Zone', NULL, ?, ?, '', ?)",
+                         (rdd, name, frequency, units))
+            conn.executemany("INSERT INTO ReportData (TimeIndex, ReportDataDictionaryIndex, Value) VALUES (?, ?, ?)",
+                             [(ti, rdd, value) for ti, value in rows])
+    conn.close()
+
+    ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="off")
+    rollup = ts.meter_rollup()
+    annual = rollup["meters"].set_index("Name")
+    assert annual["ReportDataDictionaryIndex"].tolist() == [10, 12, 13, 14, 15]
+    assert annual.loc["Electricity:Facility", "annual"] == 3600
+    assert annual.loc["Electricity:Facility", "peak"] == 1800
+    assert annual.loc["Electricity:Facility", "peak_dt"] == "1900-01-01 00:15:00"
+    assert annual.loc["Electricity:Facility", "peak_w"] == 2  # 1800 J over 15 minutes
+    assert pd.isna(annual.loc["Water:Facility", "peak_w"])
+    # run period values have no month
+    assert rollup["monthly"]["rddid"].tolist() == [10, 12, 13, 14]
+    assert rollup["monthly"]["sum"].tolist() == [3600, 1200, 2400, 1200]
+
+    result = ts.query_meters()
+    assert result["fuel_split"] == {"Electricity": 0.75, "NaturalGas": 0.25}
+    assert result["end_use_split"] == {"Electricity": {"InteriorLights": 2 / 3, "Fans": 1 / 3}}
+    lights = ts.query_meters(fuel="electricity", level="end_use", by="month")["meters"]
+    assert [(x["Name"], x["month"], x["sum"]) for x in lights] == [
+        ("InteriorLights:Electricity", 1, 2400), ("Fans:Electricity", 1, 1200)]
+    assert ts.query_meters(end_use="fans")["meters"][0]["ReportDataDictionaryIndex"] == 14
+    with pytest.raises(ValueError):
+        ts.query_meters(by="week")
+
+
+def test_meter_rollup_leaves_out_sizing_periods(multi_frequency_sql):
+    # a design day (environment 1) and a run period (environment 2), both with July hours
+    with sqlite3.connect(multi_frequency_sql) as conn:
+        conn.execute("CREATE TABLE EnvironmentPeriods (EnvironmentPeriodIndex INTEGER PRIMARY KEY, "
+                     "SimulationIndex INTEGER, EnvironmentName TEXT, EnvironmentType INTEGER)")
+        conn.executemany("INSERT INTO EnvironmentPeriods VALUES (?, 1, ?, ?)",
+                         [(1, "SUMMER DESIGN DAY", 1), (2, "RUN PERIOD 1", 3)])
+        times = [(20, 7, 21, 15, 1), (21, 7, 21, 16, 1), (22, 1, 1, 1, 2), (23, 7, 1, 15, 2), (24, 7, 1, 16, 2)]
+        conn.executemany("INSERT INTO Time (TimeIndex, Year, Month, Day, Hour, Minute, Interval, EnvironmentPeriodIndex) "
+                         "VALUES (?, 0, ?, ?, ?, 0, 60, ?)", times)
+        conn.execute("INSERT INTO ReportDataDictionary VALUES (10, 1, 'Sum', 'Facility', 'Zone', NULL, "
+                     "'Electricity:Facility', 'Hourly', '', 'J')")
+        conn.executemany("INSERT INTO ReportData (TimeIndex, ReportDataDictionaryIndex, Value) VALUES (?, 10, ?)",
+                         [(20, 1000.0), (21, 5000.0), (22, 300.0), (23, 100.0), (24, 200.0)])
+    conn.close()
+
+    ts = SqlTimeseries(sql_file=multi_frequency_sql, columnar="off")
+    rollup = ts.meter_rollup()
+    meter = rollup["meters"].iloc[0]
+    assert (meter["annual"], meter["peak"], meter["peak_dt"]) == (600, 300, "1900-01-01 00:00:00")
+    assert rollup["monthly"][["month", "sum"]].values.tolist() == [[1, 300], [7, 300]]
+    assert rollup["environments"]["included"].tolist() == [False, True]
+    assert ts.query_meters()["environments"] == ["RUN PERIOD 1"]
+
+
+def test_meter_rollup_of_sizing_only_run(atlanta_dd_model):
+    # no run period: both design days are summarized
+    result = atlanta_dd_model.sql_data.get_timeseries().query_meters(by="month")
+    assert len(result["environments"]) == 2
+    assert [x["month"] for x in result["meters"] if x["Name"] == "Electricity:Facility"] == [1, 7]
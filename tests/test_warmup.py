@@ -0,0 +1,57 @@
+"""Tests for the startup warm-up and the recent-model log it reads."""
+
+import json
+import pytest
+from src import warmup
+from src.connections import get_connection_pool
+from src.model_data import get_resident_model_map, clear_resident_model_maps
+from src.monitor import get_recent_model_ids
+from tests.conftest import EXAMPLE_DIR
+
+DD_MODEL = "./ASHRAE901_HotelLarge_STD2013_Atlanta.dd"
+
+
+@pytest.fixture
+def call_log(tmp_path):
+    log_file = tmp_path / "mcp_calls.log"
+    entries = [
+        {"function_name": "get_available_models", "model_id": None},
+        {"function_name": "get_rdd_file", "model_id": "./a"},
+        {"function_name": "get_rdd_file", "model_id": "./b"},
+        {"function_name": "get_rdd_file", "model_id": "./a"},
+    ]
+    log_file.write_text("\n".join(json.dumps(x) for x in entries) + "\nnot json\n")
+    return log_file
+
+
+def test_recent_model_ids_most_recent_first(call_log):
+    assert get_recent_model_ids(log_file=call_log) == ["./a", "./b"]
+    assert get_recent_model_ids(limit=1, log_file=call_log) == ["./a"]
+
+
+def test_recent_model_ids_reads_only_tail(call_log):
+    # a tail that starts mid-line skips the partial line
+    assert get_recent_model_ids(log_file=call_log, tail_bytes=80) == ["./a"]
+    assert get_recent_model_ids(log_file=call_log.parent / "missing.log") == []
+
+
+def test_warm_up_loads_map_and_recent_models(monkeypatch, capfd):
+    clear_resident_model_maps()
+    monkeypatch.setattr(warmup, "get_recent_model_ids", lambda limit: [DD_MODEL, "./not/a/model"])
+    thread = warmup.start_warmup(EXAMPLE_DIR, mode="recent", n_models=2)
+    thread.join(timeout=120)
+    assert not thread.is_alive()
+
+    model = get_resident_model_map(EXAMPLE_DIR).get_model_by_id(DD_MODEL)
+    assert model.html_data.data is not None
+    assert get_connection_pool().idle_count(model.sql_data.file_path) >= 1
+    # stdout is the stdio transport's channel
+    out, err = capfd.readouterr()
+    assert out == ""
+    assert "warm-up done" in err
+    clear_resident_model_maps()
+
+
+def test_warm_up_off():
+    assert warmup.start_warmup(EXAMPLE_DIR, mode="off") is None
+    assert warmup.warm_up(EXAMPLE_DIR, mode="off")["models"] == []